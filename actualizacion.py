@@ -0,0 +1,319 @@
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from email.utils import parsedate_to_datetime
+
+import httpx
+import pandas as pd
+
+import tiempos
+from fred_client import (DIRECTORIO_CACHE, FRED_API_KEY, FRED_BASE_URL, escribir_atomico, fusionar,
+                         guardar_almacen, leer_almacen, parsear_observaciones)
+
+# 🔹 Entradas macro que se refrescan a la vez: series de FRED (descarga incremental desde la última
+#   fecha almacenada) y el histórico del VIX publicado por CBOE (petición condicional con ETag)
+VIX_URL = os.environ.get("VIX_URL", "https://cdn.cboe.com/api/global/us_indices/daily_prices/VIX_History.csv")
+FUENTES = {
+    "DEXUSEU": {"tipo": "fred", "timeout": 5},  # tipo de cambio del KPI en vivo
+    "FEDFUNDS": {"tipo": "fred", "timeout": 10},
+    "CPIAUCSL": {"tipo": "fred", "timeout": 10},  # IPC (Inflacion_USA)
+    "VIX": {"tipo": "csv", "url": VIX_URL, "timeout": 15},
+}
+REINTENTOS = 3  # intentos por fuente dentro de su timeout
+ESPERA_BASE = 0.25  # s; se duplica en cada reintento, con jitter
+RATIO_FRED = 2.0  # peticiones por segundo (la API de FRED admite 120 por minuto)
+RAFAGA_FRED = 10
+CONEXIONES = 10  # conexiones del pool compartido por todas las fuentes
+VALIDADORES = "validadores.json"  # ETag / Last-Modified de cada fuente
+
+
+class Limitador:
+    """Cubo de fichas: como mucho ``tasa`` peticiones por segundo con ráfagas de ``capacidad``.
+
+    Se comparte entre hilos y bucles de eventos; cada petición reserva su turno y espera lo que falte.
+    """
+
+    def __init__(self, tasa, capacidad):
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self.fichas = float(capacidad)
+        self.ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reservar(self):
+        with self._lock:
+            ahora = time.monotonic()
+            self.fichas = min(self.capacidad, self.fichas + (ahora - self.ultimo) * self.tasa) - 1
+            self.ultimo = ahora
+            return 0.0 if self.fichas >= 0 else -self.fichas / self.tasa
+
+    async def esperar(self):
+        espera = self.reservar()
+        if espera:
+            await asyncio.sleep(espera)
+
+
+class Reintentable(Exception):
+    def __init__(self, mensaje, espera=None):
+        super().__init__(mensaje)
+        self.espera = espera
+
+
+def _retry_after(respuesta):
+    valor = respuesta.headers.get("Retry-After")
+    if not valor:
+        return None
+    try:
+        return float(valor)
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(valor).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+def _origen_memoria(origen):
+    return "caché" if origen in ("red", "no_modificado") else origen
+
+
+class Actualizador:
+    """Refresco concurrente de las entradas macro con un pool HTTP compartido.
+
+    Cada fuente tiene su propio timeout (que incluye los reintentos con backoff), de modo que el
+    refresco completo tarda lo que la fuente más lenta y no la suma de todas. Los resultados se
+    guardan en memoria ``ttl`` segundos; si una fuente falla se sirve su último dato almacenado
+    ("stale") y se vuelve a intentar pasados ``reintento`` segundos.
+
+    Las descargas se ejecutan en un bucle de eventos propio (hilo en segundo plano) con un único
+    ``httpx.AsyncClient``: las conexiones abiertas se reutilizan de un refresco al siguiente.
+    """
+
+    def __init__(self, fuentes=None, api_key=FRED_API_KEY, base_url=FRED_BASE_URL, directorio=DIRECTORIO_CACHE,
+                 ttl=3600, reintento=60, reintentos=REINTENTOS, espera_base=ESPERA_BASE):
+        self.fuentes = fuentes or FUENTES
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.directorio = directorio
+        self.ttl = ttl
+        self.reintento = reintento
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.limitadores = {"fred": Limitador(RATIO_FRED, RAFAGA_FRED)}
+        self._memoria = {}  # nombre -> (caducidad, resultado)
+        self._en_curso = {}  # nombre -> Future del refresco en marcha, compartido por hilos y bucles de eventos
+        self._lock = threading.Lock()
+        self._lock_validadores = threading.Lock()
+        self._bucle = None  # bucle de eventos propio; el cliente HTTP queda ligado a él
+        self._cliente = None
+
+    # 🔹 Bucle y cliente HTTP compartidos por todos los refrescos (se crean con el primero)
+    def _bucle_propio(self):
+        with self._lock:
+            if self._bucle is None:
+                self._bucle = asyncio.new_event_loop()
+                threading.Thread(target=self._bucle.run_forever, name="actualizacion", daemon=True).start()
+            return self._bucle
+
+    def _cliente_http(self):
+        # Solo desde el bucle propio: el pool de conexiones de httpx no se puede usar desde otro bucle
+        if self._cliente is None:
+            limites = httpx.Limits(max_connections=CONEXIONES, max_keepalive_connections=CONEXIONES)
+            self._cliente = httpx.AsyncClient(limits=limites, follow_redirects=True)
+        return self._cliente
+
+    def cerrar(self):
+        """Cierra las conexiones y detiene el bucle propio; un refresco posterior los vuelve a crear."""
+        with self._lock:
+            bucle, self._bucle = self._bucle, None
+        if bucle is None:
+            return
+        if self._cliente is not None:
+            asyncio.run_coroutine_threadsafe(self._cliente.aclose(), bucle).result()
+            self._cliente = None
+        bucle.call_soon_threadsafe(bucle.stop)
+
+    # 🔹 Validadores HTTP de la última respuesta de cada fuente (peticiones condicionales)
+    def _ruta_validadores(self):
+        return os.path.join(self.directorio, VALIDADORES)
+
+    def _leer_validadores(self):
+        try:
+            with open(self._ruta_validadores(), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _guardar_validadores(self, validadores):
+        # Se fusiona con el fichero actual: otro refresco simultáneo pudo guardar los de otras fuentes
+        os.makedirs(self.directorio, exist_ok=True)
+        with self._lock_validadores:
+            todos = {**self._leer_validadores(), **validadores}
+            escribir_atomico(self._ruta_validadores(), lambda f: json.dump(todos, f))
+
+    async def _pedir(self, cliente, nombre, url, params, validador, limite):
+        """GET con reintentos y backoff exponencial; devuelve la respuesta (200 o 304) y los intentos."""
+        cabeceras = {}
+        if validador.get("etag"):
+            cabeceras["If-None-Match"] = validador["etag"]
+        if validador.get("last_modified"):
+            cabeceras["If-Modified-Since"] = validador["last_modified"]
+        limitador = self.limitadores.get(self.fuentes[nombre]["tipo"])
+        for intento in range(1, self.reintentos + 1):
+            try:
+                if limitador is not None:
+                    await limitador.esperar()
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise httpx.TimeoutException(f"{nombre}: timeout de la fuente agotado")
+                respuesta = await cliente.get(url, params=params, headers=cabeceras, timeout=restante)
+                if respuesta.status_code == 429 or respuesta.status_code >= 500:
+                    raise Reintentable(f"HTTP {respuesta.status_code}", _retry_after(respuesta))
+                if respuesta.status_code != 304:
+                    respuesta.raise_for_status()
+                return respuesta, intento
+            except (httpx.TransportError, Reintentable) as e:
+                espera = getattr(e, "espera", None) or self.espera_base * 2 ** (intento - 1) * random.uniform(0.5, 1.5)
+                if intento == self.reintentos or time.monotonic() + espera >= limite:
+                    raise
+                await asyncio.sleep(espera)
+
+    async def _fred(self, cliente, nombre, validador, limite):
+        almacen = leer_almacen(self.directorio, nombre)
+        desde = almacen["date"].iloc[-1] if len(almacen) else None
+        params = {"series_id": nombre, "api_key": self.api_key, "file_type": "json"}
+        if desde is not None:
+            params["observation_start"] = desde.strftime("%Y-%m-%d")
+        # Sin almacén local no hay nada que revalidar: un 304 dejaría la fuente sin valor
+        respuesta, intentos = await self._pedir(cliente, nombre, f"{self.base_url}/series/observations",
+                                                params, validador if len(almacen) else {}, limite)
+        if respuesta.status_code == 304:
+            return almacen, 0, intentos, respuesta
+        nuevos = parsear_observaciones(respuesta.json())
+        df = fusionar(almacen, desde, nuevos)
+        if len(nuevos):
+            guardar_almacen(self.directorio, nombre, df)
+        return df, max(len(df) - len(almacen), 0), intentos, respuesta
+
+    def _leer_csv(self, nombre):
+        ruta = os.path.join(self.directorio, f"{nombre}.csv")
+        if not os.path.exists(ruta):
+            return None
+        return pd.read_csv(ruta)
+
+    async def _csv(self, cliente, nombre, validador, limite):
+        anterior = self._leer_csv(nombre)
+        respuesta, intentos = await self._pedir(cliente, nombre, self.fuentes[nombre]["url"], None,
+                                                validador if anterior is not None else {}, limite)
+        if respuesta.status_code == 304:
+            return anterior, 0, intentos, respuesta
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = os.path.join(self.directorio, f"{nombre}.csv")
+        escribir_atomico(ruta, lambda f: f.write(respuesta.content), "wb")
+        df = pd.read_csv(ruta)
+        return df, max(len(df) - (len(anterior) if anterior is not None else 0), 0), intentos, respuesta
+
+    @staticmethod
+    def _ultimo(df, tipo):
+        if df is None or len(df) == 0:
+            return None, None
+        if tipo == "fred":
+            return round(float(df["value"].iloc[-1]), 4), df["date"].iloc[-1].strftime("%Y-%m-%d")
+        # Histórico de CBOE: DATE en formato MM/DD/AAAA y cierre en CLOSE
+        return round(float(df["CLOSE"].iloc[-1]), 4), pd.to_datetime(df["DATE"].iloc[-1]).strftime("%Y-%m-%d")
+
+    async def _fuente(self, cliente, nombre, validadores):
+        tipo, timeout = self.fuentes[nombre]["tipo"], self.fuentes[nombre]["timeout"]
+        start = time.perf_counter()
+        limite = time.monotonic() + timeout
+        intentos = 0
+        try:
+            descargar = self._fred if tipo == "fred" else self._csv
+            df, nuevas, intentos, respuesta = await asyncio.wait_for(
+                descargar(cliente, nombre, validadores.get(nombre, {}), limite), timeout)
+            origen = "no_modificado" if respuesta.status_code == 304 else "red"
+            validadores[nombre] = {"etag": respuesta.headers.get("ETag"),
+                                   "last_modified": respuesta.headers.get("Last-Modified")}
+            error = None
+        except Exception as e:
+            # 🔹 Fuente lenta o caída: último dato almacenado, si lo hay
+            df = leer_almacen(self.directorio, nombre) if tipo == "fred" else self._leer_csv(nombre)
+            origen = "stale" if df is not None and len(df) else "error"
+            nuevas, error = 0, f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        valor, fecha = self._ultimo(df, tipo)
+        latencia = round((time.perf_counter() - start) * 1000, 2)
+        tiempos.registrar(f"actualizacion:{nombre}", latencia)
+        tiempos.contar(f"actualizacion:{origen}")
+        return {"fuente": nombre, "origen": origen, "valor": valor, "fecha": fecha, "latencia": latencia,
+                "intentos": intentos, "nuevas": nuevas, "error": error}
+
+    async def refrescar(self, nombres=None, forzar=False):
+        """Refresca a la vez las fuentes pedidas (todas por defecto); devuelve {nombre: resultado}."""
+        bucle = self._bucle_propio()
+        if asyncio.get_running_loop() is not bucle:
+            return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.refrescar(nombres, forzar), bucle))
+        nombres = list(nombres or self.fuentes)
+        ahora = time.time()
+        with self._lock:
+            # Un fallo reciente se sigue sirviendo como "stale"/"error" hasta el próximo reintento
+            resultados = {} if forzar else {n: dict(e[1], origen=_origen_memoria(e[1]["origen"]), latencia=0.0)
+                                            for n in nombres if (e := self._memoria.get(n)) and ahora < e[0]}
+            # 🔹 Una sola descarga por fuente: quien llega con otra en marcha espera su resultado
+            propias, ajenas = {}, {}
+            for n in nombres:
+                if n in resultados:
+                    continue
+                if n in self._en_curso:
+                    ajenas[n] = self._en_curso[n]
+                else:
+                    propias[n] = self._en_curso[n] = Future()
+        if propias:
+            try:
+                validadores = self._leer_validadores()
+                cliente = self._cliente_http()
+                with tiempos.medir("actualizacion:total"):
+                    nuevos = await asyncio.gather(*(self._fuente(cliente, n, validadores) for n in propias))
+                self._guardar_validadores({n: validadores[n] for n in propias if n in validadores})
+            except BaseException as e:
+                with self._lock:
+                    for n, futuro in propias.items():
+                        del self._en_curso[n]
+                        futuro.set_exception(e)
+                raise
+            with self._lock:
+                for r in nuevos:
+                    duracion = self.ttl if r["origen"] in ("red", "no_modificado") else self.reintento
+                    self._memoria[r["fuente"]] = (time.time() + duracion, r)
+                    del self._en_curso[r["fuente"]]
+                    propias[r["fuente"]].set_result(r)
+            resultados.update({r["fuente"]: r for r in nuevos})
+        for n, futuro in ajenas.items():
+            resultados[n] = dict(await asyncio.wrap_future(futuro))
+        return {n: resultados[n] for n in nombres}
+
+    def refrescar_sync(self, nombres=None, forzar=False):
+        return asyncio.run_coroutine_threadsafe(self.refrescar(nombres, forzar), self._bucle_propio()).result()
+
+    def ultimo_valor(self, nombre):
+        """Mismo formato que ClienteFRED.ultimo_valor; solo refresca la fuente pedida si ha caducado."""
+        r = self.refrescar_sync([nombre])[nombre]
+        estados = {
+            "caché": "✅ FRED OK (caché)",
+            "red": "✅ FRED OK",
+            "no_modificado": "✅ FRED OK (sin cambios)",
+            "stale": f"⚠️ FRED no disponible, último valor conocido (stale): {r['error']}",
+            "error": f"❌ Error FRED: {r['error']}",
+        }
+        return {"valor": r["valor"], "fecha": r["fecha"], "latencia": r["latencia"], "origen": r["origen"],
+                "estado": estados[r["origen"]]}
+
+
+if __name__ == "__main__":
+    actualizador = Actualizador()
+    for nombre, r in actualizador.refrescar_sync(forzar=True).items():
+        print(f"{nombre:>9}: {r['origen']:<13} {r['latencia']:>9.1f} ms  {r['intentos']} intento(s)  "
+              f"{r['nuevas']} nuevas  último {r['valor']} ({r['fecha']})" + (f"  {r['error']}" if r["error"] else ""))
+    actualizador.cerrar()
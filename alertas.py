@@ -0,0 +1,186 @@
+import math
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+import tiempos
+
+# 🔹 Métodos de umbral disponibles
+#   global      -> media + k·std sobre todo el horizonte (criterio original)
+#   movil       -> media y std de una ventana móvil de observaciones anteriores
+#   exponencial -> media y varianza con ponderación exponencial
+#   robusto     -> mediana + k·1.4826·MAD de una ventana móvil (insensible a picos aislados)
+# Los métodos de ventana comparan el cambio relativo diario de la dispersión, no su nivel: la dispersión
+# crece con el horizonte y, sobre el nivel, casi todos los días superarían la media de los anteriores
+METODOS = ["global", "movil", "exponencial", "robusto"]
+K_DISPERSION = 1
+K_VARIACION = 2
+ESCALA_MAD = 1.4826
+MIN_OBSERVACIONES = 10  # observaciones previas necesarias antes de fijar un umbral de ventana
+
+
+def _centro_escala(serie, metodo, ventana):
+    # Umbrales causales: cada día se compara con lo observado antes de él. movil y exponencial usan las
+    # mismas recursiones que DetectorOnline, de modo que el cálculo por lotes y el online coinciden
+    if metodo == "global":
+        return serie.mean(), serie.std()
+    previa = serie.shift(1)
+    if metodo == "movil":
+        rolling = previa.rolling(ventana, min_periods=MIN_OBSERVACIONES)
+        return rolling.mean(), rolling.std()
+    if metodo == "exponencial":
+        ewm = previa.ewm(span=ventana, adjust=False, min_periods=MIN_OBSERVACIONES)
+        return ewm.mean(), ewm.std(bias=True)
+    if metodo == "robusto":
+        mediana = previa.rolling(ventana, min_periods=MIN_OBSERVACIONES).median()
+        mad = (previa - mediana).abs().rolling(ventana, min_periods=MIN_OBSERVACIONES).median()
+        return mediana, mad * ESCALA_MAD
+    raise ValueError(f"Método de alerta desconocido: {metodo}")
+
+
+def detectar(df, metodo="global", ventana=60, k_dispersion=K_DISPERSION, k_variacion=K_VARIACION):
+    """Máscara booleana de días con alerta por dispersión alta o variación abrupta del valor estimado."""
+    variacion = df["DXY estimado"].diff()
+    dispersion = df["Dispersión"] if metodo == "global" else df["Dispersión"].pct_change()
+    centro, escala = _centro_escala(dispersion, metodo, ventana)
+    alta_dispersion = dispersion > centro + k_dispersion * escala
+    if metodo == "global":
+        # Criterio original: |variación| > 2·std de la variación
+        abrupta = variacion.abs() > variacion.std() * k_variacion
+    else:
+        centro_v, escala_v = _centro_escala(variacion, metodo, ventana)
+        abrupta = (variacion - centro_v).abs() > k_variacion * escala_v
+    return (alta_dispersion | abrupta).to_numpy()
+
+
+# 🔹 Índice de alertas precalculado por artefacto y configuración; se recalcula solo si la tabla se recarga
+_indices = {}  # (nombre, metodo, ventana) -> (Tabla, posiciones)
+_lock = threading.Lock()
+
+
+def indice_alertas(nombre, tabla, metodo="global", ventana=60):
+    clave = (nombre, metodo, ventana)
+    with _lock:
+        entrada = _indices.get(clave)
+        tiempos.acierto("alertas", entrada is not None and entrada[0] is tabla)
+        if entrada is None or entrada[0] is not tabla:
+            with tiempos.medir(f"alertas:{metodo}"):
+                entrada = (tabla, np.flatnonzero(detectar(tabla.filas(columnas=["DXY estimado", "Dispersión"]), metodo, ventana)))
+            _indices[clave] = entrada
+        return entrada[1]
+
+
+class DetectorOnline:
+    """Umbral actualizado en O(1) por observación (ventana móvil con sumas acumuladas o ponderación exponencial)."""
+
+    def __init__(self, metodo="exponencial", ventana=60, k=K_VARIACION, min_observaciones=MIN_OBSERVACIONES):
+        if metodo not in ("movil", "exponencial"):
+            raise ValueError("El detector online admite los métodos 'movil' y 'exponencial'")
+        self.metodo = metodo
+        self.ventana = ventana
+        self.k = k
+        self.min_observaciones = min_observaciones
+        self.n = 0
+        self.media = 0.0
+        self.varianza = 0.0
+        self._alpha = 2 / (ventana + 1)
+        self._valores = deque(maxlen=ventana)
+        self._suma = 0.0
+        self._suma_cuad = 0.0
+
+    def umbral(self):
+        if self.n < self.min_observaciones:
+            return None
+        return self.media, math.sqrt(max(self.varianza, 0.0))
+
+    def actualizar(self, valor):
+        """Evalúa el valor con el umbral actual y después lo incorpora. Devuelve True si es alerta."""
+        umbral = self.umbral()
+        alerta = umbral is not None and abs(valor - umbral[0]) > self.k * umbral[1]
+        self.n += 1
+        if self.metodo == "exponencial":
+            if self.n == 1:
+                self.media = valor
+            else:
+                delta = valor - self.media
+                self.media += self._alpha * delta
+                self.varianza = (1 - self._alpha) * (self.varianza + self._alpha * delta * delta)
+        else:
+            if len(self._valores) == self.ventana:
+                saliente = self._valores[0]
+                self._suma -= saliente
+                self._suma_cuad -= saliente * saliente
+            self._valores.append(valor)
+            self._suma += valor
+            self._suma_cuad += valor * valor
+            m = len(self._valores)
+            self.media = self._suma / m
+            self.varianza = (self._suma_cuad - m * self.media ** 2) / (m - 1) if m > 1 else 0.0
+        return alerta
+
+
+class MonitorReal:
+    """Alertas sobre datos reales frente a predichos a medida que llegan nuevos puntos (FRED/DXY)."""
+
+    def __init__(self, metodo="exponencial", ventana=60, k_error=2, k_variacion=2):
+        self.error = DetectorOnline(metodo, ventana, k_error)
+        self.variacion = DetectorOnline(metodo, ventana, k_variacion)
+        self._anterior = None
+
+    def actualizar(self, fecha, real, predicho):
+        if not (math.isfinite(real) and math.isfinite(predicho)):
+            # Día sin dato: no altera los umbrales ni la referencia de la variación
+            return {"Fecha": fecha, "Error": math.nan, "Alerta error": False, "Alerta variación": False,
+                    "Alerta": False}
+        error = real - predicho
+        alerta_error = self.error.actualizar(error)
+        alerta_variacion = False
+        if self._anterior is not None:
+            alerta_variacion = self.variacion.actualizar(real - self._anterior)
+        self._anterior = real
+        return {
+            "Fecha": fecha,
+            "Error": error,
+            "Alerta error": alerta_error,
+            "Alerta variación": alerta_variacion,
+            "Alerta": alerta_error or alerta_variacion,
+        }
+
+    def procesar(self, fechas, reales, predichos):
+        return pd.DataFrame([self.actualizar(f, r, p) for f, r, p in zip(fechas, reales, predichos)])
+
+
+# 🔹 Seguimiento de datos reales frente a predichos por artefacto: si la comparativa solo crece (días nuevos
+#   publicados por el reentrenamiento) se procesan únicamente las filas añadidas, en O(1) por observación
+_monitores = {}  # (nombre, metodo, ventana) -> (Tabla, MonitorReal, posiciones con alerta)
+
+
+def monitor_para(nombre, tabla, metodo="exponencial", ventana=60):
+    """Posiciones de la comparativa con alerta de error o de variación real, mantenidas de forma incremental."""
+    clave = (nombre, metodo, ventana)
+    with _lock:
+        entrada = _monitores.get(clave)
+        tiempos.acierto("monitor", entrada is not None and entrada[0] is tabla)
+        if entrada is not None and entrada[0] is tabla:
+            return entrada[2]
+        n = len(entrada[0]) if entrada is not None else 0
+        extiende = (entrada is not None and n <= len(tabla)
+                    and np.array_equal(tabla.fechas_de(slice(0, n)), entrada[0].fechas_de(slice(None)))
+                    and all(np.allclose(tabla.columna(c, slice(0, n)), entrada[0].columna(c), equal_nan=True)
+                            for c in ("DXY real", "DXY estimado")))
+        if extiende:
+            monitor, posiciones = entrada[1], list(entrada[2])
+        else:
+            monitor, posiciones, n = MonitorReal(metodo, ventana), [], 0
+        nuevas = slice(n, None)
+        fechas = tabla.fechas_de(nuevas)
+        reales, predichos = tabla.columna("DXY real", nuevas), tabla.columna("DXY estimado", nuevas)
+        with tiempos.medir("alertas:monitor"):
+            for i, (fecha, real, predicho) in enumerate(zip(fechas, reales.tolist(), predichos.tolist()), start=n):
+                if monitor.actualizar(fecha, real, predicho)["Alerta"]:
+                    posiciones.append(i)
+        entrada = (tabla, monitor, np.array(posiciones, dtype=np.int64))
+        _monitores[clave] = entrada
+        return entrada[2]
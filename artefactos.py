@@ -0,0 +1,163 @@
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # sin pyarrow se sigue leyendo el CSV/XLSX original
+    pa = None
+    feather = None
+
+# 🔹 Artefactos del modelo que consume la app (nombre lógico -> fichero exportado desde Jupyter)
+ARTEFACTOS = {
+    "predicciones": "predicciones_2025_2029.csv",
+    "escenarios": "escenarios_dxy_2025_2029.csv",
+    "comparativa": "comparativa_dxy_modelo.csv",
+    "julio": "comparativa_julio_2025.xlsx",
+    "abanico": "abanico_dxy_2025_2029.csv",  # opcional: simulación Monte Carlo
+    "dataset": "dataset_final_economico.csv",  # variables económicas (clasificador de decisiones)
+}
+DIRECTORIO_COLUMNAR = os.environ.get("ARTEFACTOS_DIR", "artefactos")
+DIRECTORIO_PARES = os.environ.get("PARES_DIR", "pares")  # un subdirectorio por par de divisas
+DIRECTORIO_VERSIONES = os.environ.get("VERSIONES_DIR", "versiones")  # publicaciones de reentrenamiento.py
+VERSIONADOS = ["predicciones", "escenarios", "comparativa"]
+PUNTERO = "ACTUAL"  # nombre de la versión vigente; se sustituye de forma atómica al publicar
+_puntero = (None, None)  # (firma del fichero ACTUAL, versión)
+
+
+# 🔹 Nombres de artefacto por par: "predicciones@DEXUSUK" es la tabla de predicciones de ese par
+def clave(nombre, par=None):
+    return nombre if par is None else f"{nombre}@{par}"
+
+
+# 🔹 Versión publicada por el reentrenamiento (None = ficheros de la raíz, exportados desde Jupyter).
+#   Se relee solo si cambia el puntero, así que las instancias en marcha ven la nueva versión sin reiniciar
+def version_actual():
+    global _puntero
+    ruta = os.path.join(DIRECTORIO_VERSIONES, PUNTERO)
+    try:
+        estado = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    firma = (estado.st_ino, estado.st_mtime_ns)
+    if _puntero[0] != firma:
+        with open(ruta, encoding="utf-8") as f:
+            _puntero = (firma, f.read().strip() or None)
+    return _puntero[1]
+
+
+def _version(base, par):
+    return version_actual() if not par and base in VERSIONADOS else None
+
+
+def fuente(nombre):
+    base, _, par = nombre.partition("@")
+    if par:
+        return os.path.join(DIRECTORIO_PARES, par, ARTEFACTOS[base])
+    version = _version(base, par)
+    return os.path.join(DIRECTORIO_VERSIONES, version, ARTEFACTOS[base]) if version else ARTEFACTOS[base]
+
+
+def ruta_columnar(nombre):
+    base, _, par = nombre.partition("@")
+    version = _version(base, par)
+    if version:
+        return os.path.join(DIRECTORIO_VERSIONES, version, f"{base}.feather")
+    return os.path.join(DIRECTORIO_COLUMNAR, par, f"{base}.feather")
+
+
+# 🔹 Lectura del formato original (CSV o Excel) con índice de fechas
+def leer_original(nombre):
+    ruta = fuente(nombre)
+    if ruta.endswith(".xlsx"):
+        df = pd.read_excel(ruta, parse_dates=["Fecha"])
+    else:
+        df = pd.read_csv(ruta, parse_dates=["Fecha"])
+    return df.set_index("Fecha")
+
+
+# 🔹 Tipos compactos: valores float32 e índice datetime64
+def compactar(df):
+    df = df.copy()
+    columnas = df.select_dtypes(include="floating").columns
+    df[columnas] = df[columnas].astype(np.float32)
+    df.index = pd.DatetimeIndex(df.index, name="Fecha").astype("datetime64[ns]")
+    return df
+
+
+def exportar(nombre):
+    df = compactar(leer_original(nombre))
+    ruta = ruta_columnar(nombre)
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    # Temporal propio (mkstemp): dos procesos que exportan a la vez no escriben sobre el mismo fichero
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), prefix=os.path.basename(ruta) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # Sin compresión y en un solo lote para abrirlo mapeado en memoria: cada columna es un array contiguo
+            feather.write_feather(df.reset_index(), f, compression="uncompressed", chunksize=max(len(df), 1))
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+    return ruta
+
+
+def disponible(nombre):
+    return os.path.exists(fuente(nombre))
+
+
+def exportar_todos():
+    return [exportar(nombre) for nombre in ARTEFACTOS if disponible(nombre)]
+
+
+def columnar_actualizado(nombre):
+    ruta = ruta_columnar(nombre)
+    return (feather is not None and os.path.exists(ruta)
+            and os.path.getmtime(ruta) >= os.path.getmtime(fuente(nombre)))
+
+
+def cargar(nombre):
+    if feather is None:
+        return leer_original(nombre)
+    if not columnar_actualizado(nombre):
+        exportar(nombre)
+    tabla = feather.read_table(ruta_columnar(nombre), memory_map=True)
+    # split_blocks evita consolidar columnas: los float32 quedan sobre el mapa de memoria
+    return tabla.to_pandas(split_blocks=True).set_index("Fecha")
+
+
+# 🔹 Columnas sin construir un DataFrame (datos.Tabla): con pyarrow son vistas de solo lectura del
+#   feather mapeado, que comparten todos los procesos que abren el mismo fichero
+def cargar_columnas(nombre):
+    if feather is None:
+        df = leer_original(nombre)
+        return df.index.values, {c: df[c].to_numpy() for c in df.columns}
+    if not columnar_actualizado(nombre):
+        exportar(nombre)
+    tabla = feather.read_table(ruta_columnar(nombre), memory_map=True)
+    columnas = {c: _array(tabla.column(c)) for c in tabla.column_names}
+    return columnas.pop("Fecha"), columnas
+
+
+def _array(columna):
+    # combine_chunks copia aunque haya un solo lote; los feather exportados aquí siempre tienen uno
+    lote = columna.chunk(0) if columna.num_chunks == 1 else columna.combine_chunks()
+    return lote.to_numpy(zero_copy_only=False)
+
+
+# 🔹 CSV y XLSX se mantienen como formatos de exportación
+def exportar_csv(nombre, ruta):
+    cargar(nombre).to_csv(ruta)
+
+
+def exportar_xlsx(nombre, ruta):
+    cargar(nombre).to_excel(ruta)
+
+
+if __name__ == "__main__":
+    for ruta in exportar_todos() if len(sys.argv) == 1 else map(exportar, sys.argv[1:]):
+        print(f"✅ {ruta} generado correctamente")
@@ -0,0 +1,124 @@
+import hashlib
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import tiempos
+from escenarios import REGRESORES, comprobar_regresores
+
+SALIDA = "comparativa_dxy_modelo.csv"
+DIRECTORIO_CACHE = os.environ.get("BACKTEST_CACHE_DIR", "cache_backtest")
+
+
+# 🔹 Particiones walk-forward con la semántica de TimeSeriesSplit (expansiva, o móvil con max_train_size),
+#    pero ancladas al inicio de la serie: al llegar datos nuevos las particiones antiguas no se mueven
+def particiones(n, inicial=504, paso=21, max_train_size=None, gap=0):
+    inicio_test = inicial + gap
+    while inicio_test < n:
+        fin_train = inicio_test - gap
+        inicio_train = 0 if max_train_size is None else max(0, fin_train - max_train_size)
+        fin_test = min(inicio_test + paso, n)
+        if fin_test - inicio_test < paso:
+            break  # la última partición incompleta se evalúa cuando haya datos suficientes
+        yield (inicio_train, fin_train), (inicio_test, fin_test)
+        inicio_test += paso
+
+
+def preparar(df_economico):
+    comprobar_regresores(df_economico)
+    df_reg = df_economico[["Fecha", "DXY"] + REGRESORES].dropna()
+    if df_reg.empty:
+        raise ValueError("Ningún día del dataset económico tiene DXY y todos los regresores a la vez")
+    return df_reg.rename(columns={"Fecha": "ds", "DXY": "y"}).sort_values("ds").reset_index(drop=True)
+
+
+# 🔹 Clave de caché: contenido de los datos de la ventana + límites + configuración del modelo
+def clave(df_reg, train, test, config):
+    h = hashlib.sha1()
+    tramo = df_reg.iloc[train[0]:test[1]]
+    h.update(pd.util.hash_pandas_object(tramo, index=False).to_numpy().tobytes())
+    h.update(repr((train[1] - train[0], test[1] - test[0], sorted(config.items()))).encode())
+    return h.hexdigest()
+
+
+def ajustar_particion(df_train, df_test, config):
+    from prophet import Prophet
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    model = Prophet(**config)
+    for regresor in REGRESORES:
+        model.add_regressor(regresor)
+    with tiempos.medir("prophet:fit"):
+        model.fit(df_train)
+    with tiempos.medir("prophet:predict"):
+        forecast = model.predict(df_test[["ds"] + REGRESORES])
+    return forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].assign(y=df_test["y"].to_numpy())
+
+
+def _ejecutar(args):
+    ruta, df_train, df_test, config = args
+    resultado = ajustar_particion(df_train, df_test, config)
+    temporal = ruta + ".tmp"
+    joblib.dump(resultado, temporal)
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def backtest(df_economico, inicial=504, paso=21, max_train_size=None, gap=0, config=None,
+             procesos=None, directorio_cache=DIRECTORIO_CACHE):
+    """Predicciones fuera de muestra por partición; solo se ajustan las particiones que no están en caché."""
+    config = config or {}
+    df_reg = preparar(df_economico)
+    os.makedirs(directorio_cache, exist_ok=True)
+
+    tareas, rutas = [], []
+    for i, (train, test) in enumerate(particiones(len(df_reg), inicial, paso, max_train_size, gap)):
+        ruta = os.path.join(directorio_cache, f"{clave(df_reg, train, test, config)}.pkl")
+        rutas.append((i, ruta))
+        if not os.path.exists(ruta):
+            tareas.append((ruta, df_reg.iloc[train[0]:train[1]], df_reg.iloc[test[0]:test[1]], config))
+
+    if tareas:
+        # Cada partición se ajusta en su propio proceso; Prophet ya es monohilo
+        with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as pool:
+            for futuro in as_completed([pool.submit(_ejecutar, t) for t in tareas]):
+                futuro.result()
+
+    return pd.concat([joblib.load(ruta).assign(Fold=i) for i, ruta in rutas], ignore_index=True), len(tareas)
+
+
+# 🔹 Misma estructura que la comparativa del notebook (más la partición de origen)
+def comparativa(resultado):
+    df_comparativa = pd.DataFrame({
+        "Fecha": resultado["ds"],
+        "DXY real": resultado["y"],
+        "DXY estimado": resultado["yhat"],
+        "Confianza": 1 / (resultado["yhat_upper"] - resultado["yhat_lower"]),
+    })
+    df_comparativa["Error absoluto"] = np.abs(df_comparativa["DXY real"] - df_comparativa["DXY estimado"])
+    df_comparativa["Error porcentual"] = np.abs(
+        (df_comparativa["DXY real"] - df_comparativa["DXY estimado"]) / df_comparativa["DXY real"]) * 100
+    df_comparativa["Fold"] = resultado["Fold"].to_numpy()
+    return df_comparativa
+
+
+def generar(df_economico, salida=SALIDA, **kwargs):
+    resultado, nuevas = backtest(df_economico, **kwargs)
+    df_comparativa = comparativa(resultado)
+    df_comparativa.to_csv(salida, index=False)
+    return df_comparativa, nuevas
+
+
+if __name__ == "__main__":
+    df = pd.read_csv("dataset_final_economico.csv", parse_dates=["Fecha"])
+    movil = "--movil" in sys.argv
+    try:
+        df_comparativa, nuevas = generar(df, max_train_size=1260 if movil else None)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+    print(f"✅ {SALIDA} generado ({df_comparativa['Fold'].nunique()} particiones, {nuevas} ajustadas de nuevo)")
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import actualizacion  # noqa: E402
+from fred_client import ClienteFRED  # noqa: E402
+
+# 🔹 Servidor simulado de FRED y CBOE: latencia por fuente, fallos transitorios y respuestas 304
+RETARDOS = {"DEXUSEU": 0.20, "FEDFUNDS": 0.40, "CPIAUCSL": 0.30, "VIX": 0.50}
+FALLOS = {"FEDFUNDS": 1}  # primeras peticiones que responden 503 (para ejercitar los reintentos)
+
+
+def _series(dias=4_000, seed=0):
+    rng = np.random.default_rng(seed)
+    fechas = pd.bdate_range(end="2025-09-05", periods=dias).strftime("%Y-%m-%d")
+    series = {}
+    for nombre, inicio in (("DEXUSEU", 1.17), ("FEDFUNDS", 4.3), ("CPIAUCSL", 320.0)):
+        valores = inicio + np.cumsum(rng.normal(0, inicio * 0.003, dias))
+        series[nombre] = list(zip(fechas, np.round(valores, 4).tolist()))
+    vix = 17 + np.abs(np.cumsum(rng.normal(0, 0.8, dias)))
+    csv = "DATE,OPEN,HIGH,LOW,CLOSE\n" + "".join(
+        f"{pd.Timestamp(f).strftime('%m/%d/%Y')},{v:.6f},{v:.6f},{v:.6f},{v:.6f}\n" for f, v in zip(fechas, vix))
+    return series, csv.encode()
+
+
+class Simulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    series, vix = _series()
+    fallos = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        nombre = consulta.get("series_id", "VIX") if url.path.endswith("observations") else "VIX"
+        time.sleep(RETARDOS.get(nombre, 0))
+        if Simulador.fallos.get(nombre, 0) > 0:
+            Simulador.fallos[nombre] -= 1
+            return self._responder(503, b"", "text/plain")
+        if nombre == "VIX":
+            cuerpo, tipo = Simulador.vix, "text/csv"
+        else:
+            desde = consulta.get("observation_start", "")
+            observaciones = [{"date": f, "value": str(v)} for f, v in Simulador.series[nombre] if f >= desde]
+            cuerpo, tipo = json.dumps({"observations": observaciones}).encode(), "application/json"
+        etag = '"' + hashlib.sha1(cuerpo).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._responder(304, b"", tipo, etag)
+        self._responder(200, cuerpo, tipo, etag)
+
+    def _responder(self, codigo, cuerpo, tipo, etag=None):
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+def secuencial(base, directorio):
+    # Camino anterior: una serie tras otra con requests (ClienteFRED) y el CSV del VIX al final
+    start = time.perf_counter()
+    cliente = ClienteFRED(base_url=f"{base}/fred", directorio=directorio)
+    for nombre in ("DEXUSEU", "FEDFUNDS", "CPIAUCSL"):
+        try:
+            cliente.observaciones(nombre)
+        except Exception as e:
+            print(f"   {nombre}: {type(e).__name__}")
+    requests.get(f"{base}/vix.csv", timeout=15)
+    return time.perf_counter() - start
+
+
+def concurrente(base, directorio, timeouts=None):
+    fuentes = {n: {**f, "timeout": (timeouts or {}).get(n, f["timeout"])} for n, f in actualizacion.FUENTES.items()}
+    fuentes["VIX"]["url"] = f"{base}/vix.csv"
+    actualizador = actualizacion.Actualizador(fuentes=fuentes, base_url=f"{base}/fred", directorio=directorio)
+    start = time.perf_counter()
+    resultados = actualizador.refrescar_sync(forzar=True)
+    return time.perf_counter() - start, resultados
+
+
+def main():
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), Simulador)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{servidor.server_port}"
+    directorio = tempfile.mkdtemp()
+    try:
+        print(f"Retardos simulados: {RETARDOS} (suma {sum(RETARDOS.values()):.2f} s, máximo "
+              f"{max(RETARDOS.values()):.2f} s); fallos transitorios: {FALLOS}")
+        Simulador.fallos = dict(FALLOS)
+        print(f"{'secuencial (requests)':<28} {secuencial(base, os.path.join(directorio, 'sec')):>7.2f} s")
+
+        # La segunda pasada solo pide desde la última fecha; la tercera ya repite validadores (304)
+        for etiqueta in ("asyncio (primera descarga)", "asyncio (incremental)", "asyncio (condicional)"):
+            Simulador.fallos = dict(FALLOS) if "primera" in etiqueta else {}
+            total, resultados = concurrente(base, os.path.join(directorio, "async"))
+            print(f"{etiqueta:<28} {total:>7.2f} s")
+            for nombre, r in resultados.items():
+                print(f"   {nombre:>9}: {r['origen']:<13} {r['latencia']:>8.1f} ms  {r['intentos']} intento(s)  "
+                      f"{r['nuevas']} nuevas")
+
+        # Una fuente más lenta que su timeout no retrasa a las demás: se sirve su último dato (stale)
+        RETARDOS["CPIAUCSL"] = 3.0
+        total, resultados = concurrente(base, os.path.join(directorio, "async"), timeouts={"CPIAUCSL": 1})
+        print(f"{'asyncio (CPI 3 s, timeout 1 s)':<28} {total:>7.2f} s  CPIAUCSL: {resultados['CPIAUCSL']['origen']}")
+    finally:
+        servidor.shutdown()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import artefactos  # noqa: E402
+
+# 🔹 Carga medida en un proceso nuevo para que el RSS no arrastre lecturas previas
+MEDICION = r"""
+import json, sys, time
+import pandas as pd
+import pyarrow.feather as feather
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096 / 1e6
+
+formato, ruta = sys.argv[1], sys.argv[2]
+antes = rss_mb()
+start = time.perf_counter()
+if formato == "csv":
+    df = pd.read_csv(ruta, parse_dates=["Fecha"]).set_index("Fecha")
+else:
+    df = feather.read_table(ruta, memory_map=True).to_pandas(split_blocks=True).set_index("Fecha")
+segundos = time.perf_counter() - start
+print(json.dumps({"segundos": segundos, "rss_mb": rss_mb() - antes}))
+"""
+
+
+def escalar(df, factor):
+    # Repite la tabla con un índice horario para mantener fechas únicas y ordenadas
+    escalado = pd.concat([df] * factor)
+    escalado.index = pd.date_range(df.index[0], periods=len(escalado), freq="h", name="Fecha")
+    return escalado
+
+
+def medir(formato, ruta):
+    salida = subprocess.run([sys.executable, "-c", MEDICION, formato, ruta],
+                            capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout)
+
+
+def main(factores=(1, 10, 100, 1000)):
+    base = artefactos.leer_original("predicciones")
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'filas':>10} {'csv s':>8} {'csv MB':>8} {'feather s':>10} {'feather MB':>11}")
+        for factor in factores:
+            df = escalar(base, factor)
+            ruta_csv = os.path.join(tmp, "pred.csv")
+            ruta_feather = os.path.join(tmp, "pred.feather")
+            df.to_csv(ruta_csv)
+            artefactos.feather.write_feather(artefactos.compactar(df).reset_index(), ruta_feather,
+                                             compression="uncompressed")
+            csv = medir("csv", ruta_csv)
+            col = medir("feather", ruta_feather)
+            print(f"{len(df):>10} {csv['segundos']:>8.3f} {csv['rss_mb']:>8.1f} "
+                  f"{col['segundos']:>10.3f} {col['rss_mb']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(f) for f in sys.argv[1:]) or (1, 10, 100, 1000))
@@ -0,0 +1,74 @@
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# 🔹 Cada app se mide en un proceso nuevo: el arranque en frío incluye todos los imports
+MEDICION = r"""
+import json, os, sys, time
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+ruta, multipagina, clics = sys.argv[1], sys.argv[2] == "1", int(sys.argv[3])
+t0 = time.perf_counter()
+at = AppTest.from_file(ruta, default_timeout=300).run()
+frio = time.perf_counter() - t0
+pagina = None
+if multipagina:
+    t0 = time.perf_counter()
+    at.switch_page("paginas/prediccion.py").run()
+    pagina = time.perf_counter() - t0
+tiempos_clic = []
+for dia in pd.bdate_range("2025-09-11", periods=clics):
+    t0 = time.perf_counter()
+    at.date_input[0].set_value(dia.date()).run()
+    tiempos_clic.append(time.perf_counter() - t0)
+errores = [e.value for e in at.exception]
+fragmento = None
+if multipagina:
+    import tiempos
+    fila = tiempos.resumen().set_index("Medición").loc["fragmento:prediccion"]
+    fragmento = fila["p50 (ms)"] / 1000
+print(json.dumps({"frio": frio, "pagina": pagina, "clic": sorted(tiempos_clic)[len(tiempos_clic) // 2],
+                  "fragmento": fragmento, "errores": errores}))
+"""
+
+
+def medir(ruta, multipagina, clics=10):
+    entorno = dict(os.environ, FRED_BASE_URL=os.environ.get("FRED_BASE_URL", "http://127.0.0.1:9/fred"))
+    salida = subprocess.run([sys.executable, "-c", MEDICION, ruta, "1" if multipagina else "0", str(clics)],
+                            capture_output=True, text=True, check=True, cwd=RAIZ, env=entorno)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def app_de_revision(revision):
+    # La versión anterior de app.py se ejecuta sobre los módulos actuales del repositorio
+    codigo = subprocess.run(["git", "show", f"{revision}:app.py"], capture_output=True, text=True,
+                            check=True, cwd=RAIZ).stdout
+    ruta = os.path.join(RAIZ, ".app_referencia.py")
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(codigo)
+    return ruta
+
+
+def main(referencia=None):
+    def fmt(valor):
+        return f"{valor * 1000:>10.1f}" if valor is not None else f"{'–':>10}"
+
+    filas = [("actual", medir(os.path.join(RAIZ, "app.py"), multipagina=True))]
+    if referencia:
+        ruta = app_de_revision(referencia)
+        try:
+            filas.append((referencia, medir(ruta, multipagina=False)))
+        finally:
+            os.remove(ruta)
+    print(f"{'app':>12} {'frío ms':>10} {'página ms':>10} {'clic ms':>10} {'fragm. ms':>10}")
+    for nombre, r in filas:
+        print(f"{nombre:>12} {fmt(r['frio'])} {fmt(r['pagina'])} {fmt(r['clic'])} {fmt(r['fragmento'])}"
+              + (f"  errores: {r['errores']}" if r["errores"] else ""))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
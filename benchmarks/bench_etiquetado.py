@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import caracteristicas  # noqa: E402
+
+
+# 🔹 Regla original del notebook (fila a fila con apply); la equivalencia se comprueba en tests/test_caracteristicas.py
+def etiquetar_decision(row):
+    if row['yhat'] > row['yhat_upper'] - 0.01 and row['dispersión'] < 10:
+        return 'cambiar'
+    elif row['yhat'] < row['yhat_lower'] + 0.01 and row['dispersión'] < 10:
+        return 'no_cambiar'
+    else:
+        return 'evaluar'
+
+
+def sintetico(filas, seed=0):
+    rng = np.random.default_rng(seed)
+    dxy = 90 + np.cumsum(rng.normal(0, 0.4, filas))
+    yhat = dxy + rng.normal(0, 1, filas)
+    ancho = rng.gamma(4, 1.5, filas)
+    return pd.DataFrame({
+        "Fecha": pd.date_range("2010-01-04", periods=filas, freq="h"),
+        "DXY": dxy,
+        "yhat": yhat,
+        "yhat_lower": yhat - ancho * rng.uniform(0, 1, filas),
+        "yhat_upper": yhat + ancho * rng.uniform(0, 1, filas),
+    })
+
+
+def main(tamaños=(10_000, 100_000, 1_000_000, 5_000_000)):
+    print(f"{'filas':>10} {'apply s':>9} {'vectorizado s':>14}")
+    for filas in tamaños:
+        df = caracteristicas.derivar_variables(sintetico(filas))
+        start = time.perf_counter()
+        caracteristicas.etiquetar_decision(df)
+        vectorizado = time.perf_counter() - start
+        # apply solo hasta 100k filas: por encima tarda minutos
+        if filas <= 100_000:
+            start = time.perf_counter()
+            df.apply(etiquetar_decision, axis=1)
+            fila_a_fila = f"{time.perf_counter() - start:9.3f}"
+        else:
+            fila_a_fila = f"{'-':>9}"
+        print(f"{filas:>10} {fila_a_fila} {vectorizado:>14.3f}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(f) for f in sys.argv[1:]) or (10_000, 100_000, 1_000_000, 5_000_000))
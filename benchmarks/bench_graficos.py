@@ -0,0 +1,74 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import artefactos  # noqa: E402
+import graficos  # noqa: E402
+
+ALTO_PX = 500  # alto del gráfico en la app
+
+
+def escalar(df, factor, seed=0):
+    # Factor 1: comparativa real. Mayor: paseo aleatorio con la volatilidad diaria del DXY real
+    if factor == 1:
+        return df
+    rng = np.random.default_rng(seed)
+    n = len(df) * factor
+    real = df["DXY real"].iloc[0] + np.cumsum(rng.normal(0, df["DXY real"].diff().std(), n))
+    estimado = real + rng.normal(0, (df["DXY real"] - df["DXY estimado"]).std(), n)
+    indice = pd.date_range(df.index[0], periods=n, freq="h", name="Fecha")
+    return pd.DataFrame({"DXY real": real, "DXY estimado": estimado}, index=indice)
+
+
+def figura_completa(df):
+    fig = go.Figure()
+    for columna in ("DXY real", "DXY estimado"):
+        fig.add_trace(go.Scatter(x=df.index, y=df[columna], mode="lines", name=columna))
+    return fig
+
+
+def desviacion_px(x, y, xr, yr):
+    # Envolvente (mín./máx.) por columna de píxeles: completa frente a la reducida interpolada.
+    # Devuelve la desviación media y el percentil 99 en píxeles.
+    columnas = np.minimum(((x - x[0]) / (x[-1] - x[0]) * graficos.ANCHO_PX).astype(int), graficos.ANCHO_PX - 1)
+    grupos = pd.DataFrame({"c": columnas, "a": y, "b": np.interp(x, xr, yr)}).groupby("c")
+    diferencia = np.maximum((grupos["a"].max() - grupos["b"].max()).abs(),
+                            (grupos["a"].min() - grupos["b"].min()).abs())
+    escala = ALTO_PX / (np.nanmax(y) - np.nanmin(y))
+    return float(diferencia.mean()) * escala, float(diferencia.quantile(0.99)) * escala
+
+
+def main(factores=(1, 10, 100)):
+    base = artefactos.leer_original("comparativa")
+    print(f"{'filas':>9} {'completo KB':>12} {'reducido KB':>12} {'completo ms':>12} {'reducido ms':>12} "
+          f"{'pirámide ms':>12} {'desv. px (media/p99)':>21}")
+    for factor in factores:
+        df = escalar(base, factor)
+        t0 = time.perf_counter()
+        completo = len(figura_completa(df).to_json())
+        t_completo = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        piramide = graficos.Piramide(df.index.values, {c: df[c].to_numpy() for c in ("DXY real", "DXY estimado")})
+        t_piramide = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fig = go.Figure()
+        series = piramide.consultar()
+        for columna, (x, y) in series.items():
+            fig.add_trace(graficos.traza(x, y, mode="lines", name=columna))
+        reducido = len(fig.update_layout(xaxis_type="date").to_json())
+        t_reducido = time.perf_counter() - t0
+
+        x = piramide.x
+        media, p99 = np.max([desviacion_px(x, df[c].to_numpy(dtype=float), *series[c]) for c in series], axis=0)
+        print(f"{len(df):>9} {completo / 1e3:>12.1f} {reducido / 1e3:>12.1f} {t_completo * 1e3:>12.1f} "
+              f"{t_reducido * 1e3:>12.1f} {t_piramide * 1e3:>12.1f} {media:>10.2f} / {p99:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(f) for f in sys.argv[1:]) or (1, 10, 100))
@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import artefactos  # noqa: E402
+import sinteticos  # noqa: E402
+
+# 🔹 Memoria residente de las tablas de predicción y escenarios, cada disposición en un proceso nuevo
+#   pandas -> read_csv en float64 con la "Variación estimada" añadida sobre el DataFrame (app.py original)
+#   tabla  -> datos.obtener(), la representación compartida por las sesiones de la app
+TABLAS = ["predicciones", "escenarios", "abanico", "comparativa"]
+GENERADORES = {"predicciones": sinteticos.predicciones, "escenarios": sinteticos.escenarios,
+               "abanico": sinteticos.abanico, "comparativa": sinteticos.comparativa}
+
+MEDICION = r"""
+import gc, json, sys
+import numpy as np
+import pandas as pd
+import artefactos, datos
+
+def memoria():
+    # RSS total y su parte anónima (la que no comparten los procesos que mapean el mismo feather)
+    campos = {}
+    with open("/proc/self/status") as f:
+        for linea in f:
+            clave, _, valor = linea.partition(":")
+            if clave in ("VmRSS", "RssAnon", "RssFile"):
+                campos[clave] = int(valor.split()[0]) / 1024
+    return campos
+
+disposicion, nombres = sys.argv[1], [n for n in sys.argv[2].split(",") if artefactos.disponible(n)]
+gc.collect()
+antes = memoria()
+if disposicion == "pandas":
+    tablas = [pd.read_csv(artefactos.fuente(n), parse_dates=["Fecha"]).set_index("Fecha") for n in nombres]
+    for df in tablas:
+        if "DXY estimado" in df:
+            df["Variación estimada"] = df["DXY estimado"].diff()
+else:
+    tablas = [datos.obtener(n) for n in nombres]
+    for tabla in tablas:
+        # Consulta habitual de la app: el rango visible, con las columnas derivadas solo para esas filas
+        tabla.rango(tabla.inicio, tabla.inicio + pd.DateOffset(months=6))
+gc.collect()
+despues = memoria()
+if disposicion == "pandas":
+    datos_mb = sum(int(df.memory_usage(index=True, deep=True).sum()) for df in tablas) / 2**20
+else:
+    datos_mb = sum(tabla.nbytes for tabla in tablas) / 2**20
+print(json.dumps({"filas": sum(len(t) for t in tablas), "datos": datos_mb,
+                  **{clave: despues[clave] - antes[clave] for clave in antes}}))
+"""
+
+
+def medir(directorio, disposicion, nombres=TABLAS):
+    entorno = dict(os.environ, PYTHONPATH=RAIZ, ARTEFACTOS_DIR=os.path.join(directorio, "artefactos"),
+                   VERSIONES_DIR=os.path.join(directorio, "versiones"))
+    salida = subprocess.run([sys.executable, "-c", MEDICION, disposicion, ",".join(nombres)],
+                            capture_output=True, text=True, check=True, cwd=directorio, env=entorno)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def preparar(directorio, factor):
+    # 1× son los ficheros del repositorio; el resto, versiones sintéticas con el mismo esquema
+    for nombre in TABLAS:
+        destino = os.path.join(directorio, artefactos.ARTEFACTOS[nombre])
+        if factor == 1 and os.path.exists(os.path.join(RAIZ, artefactos.ARTEFACTOS[nombre])):
+            shutil.copy(os.path.join(RAIZ, artefactos.ARTEFACTOS[nombre]), destino)
+        elif factor != 1:
+            GENERADORES[nombre](factor).reset_index().to_csv(destino, index=False)
+    medir(directorio, "tabla")  # exporta los feather antes de medir
+
+
+def _reduccion(r, referencia, clave):
+    return f"{1 - r[clave] / referencia[clave]:.0%}" if referencia[clave] > 0 else "–"
+
+
+def main(factores):
+    # datos: bytes de los arrays de las tablas; anónima: RSS privado de cada worker (sin las páginas del feather)
+    print(f"{'factor':>7} {'filas':>9} {'disposición':>12} {'datos MB':>9} {'RSS MB':>9} {'anónima MB':>11} "
+          f"{'reducción RSS':>14} {'anónima':>8}")
+    for factor in factores:
+        with tempfile.TemporaryDirectory() as directorio:
+            preparar(directorio, factor)
+            referencia = None
+            for disposicion in ("pandas", "tabla"):
+                r = medir(directorio, disposicion)
+                referencia = referencia or r
+                print(f"{factor:>6}× {r['filas']:>9} {disposicion:>12} {r['datos']:>9.1f} {r['VmRSS']:>9.1f} "
+                      f"{r['RssAnon']:>11.1f} {_reduccion(r, referencia, 'VmRSS'):>14} "
+                      f"{_reduccion(r, referencia, 'RssAnon'):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="RSS de las tablas de predicción y escenarios cargadas")
+    parser.add_argument("--factores", type=int, nargs="+", default=[1, 100])
+    main(parser.parse_args().factores)
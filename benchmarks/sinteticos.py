@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# 🔹 Generadores sintéticos con el mismo esquema que los artefactos y las fuentes reales
+#   factor 1 ≈ tamaño actual; las series son paseos aleatorios con la volatilidad diaria del DXY real
+FILAS = {"predicciones": 1_124, "comparativa": 3_889, "dataset": 3_908}
+VOLATILIDAD = 0.4  # desviación típica de la variación diaria del DXY (puntos)
+LIMITE = pd.Timestamp.max.normalize() - pd.Timedelta(days=1)
+
+
+def indice(inicio, n):
+    # Días laborables mientras quepan en datetime64[ns]; si no, horas o minutos (fechas únicas y ordenadas)
+    # (el fin se estima antes de generar: un calendario laborable de millones de días es muy lento)
+    disponible = (LIMITE - pd.Timestamp(inicio)).total_seconds()
+    for freq, paso in (("B", 1.4 * 86_400), ("h", 3_600), ("10min", 600), ("min", 60)):
+        if paso * (n + 10) < disponible:
+            return pd.date_range(inicio, periods=n, freq=freq, name="Fecha")
+    raise ValueError(f"{n} filas no caben en el rango de fechas de pandas")
+
+
+def _paseo(rng, n, inicio=100.0, volatilidad=VOLATILIDAD):
+    return inicio + np.cumsum(rng.normal(0, volatilidad, n))
+
+
+def predicciones(factor, seed=0):
+    rng = np.random.default_rng(seed)
+    n = FILAS["predicciones"] * factor
+    yhat = _paseo(rng, n, 118.6, 0.05)
+    dispersion = rng.gamma(16, 0.28, n)
+    reparto = rng.uniform(0.3, 0.7, n)
+    return pd.DataFrame({
+        "DXY estimado": yhat,
+        "yhat_lower": yhat - dispersion * reparto,
+        "yhat_upper": yhat + dispersion * (1 - reparto),
+        "Dispersión": dispersion,
+        "Confianza": 1 / dispersion,
+    }, index=indice("2025-09-10", n))
+
+
+def escenarios(factor, seed=0):
+    # Almacén ancho como escenarios_dxy_2025_2029.csv: el neutro coincide con las predicciones
+    pred = predicciones(factor, seed)
+    desplazamiento = np.linspace(0, 6.5, len(pred))
+    return pd.DataFrame({
+        "DXY_neutro": pred["DXY estimado"],
+        "DXY_positivo": pred["DXY estimado"] + desplazamiento,
+        "DXY_negativo": pred["DXY estimado"] - desplazamiento,
+        **pred[["yhat_lower", "yhat_upper", "Dispersión", "Confianza"]],
+    }, index=pred.index)
+
+
+def abanico(factor, seed=0, cuantiles=(5, 10, 25, 50, 75, 90, 95)):
+    # Percentiles de la simulación Monte Carlo (montecarlo.py): bandas que se abren con el horizonte
+    pred = predicciones(factor, seed)
+    ancho = np.sqrt(np.arange(1, len(pred) + 1) / 252) * 6
+    z = {5: -1.645, 10: -1.282, 25: -0.674, 50: 0.0, 75: 0.674, 90: 1.282, 95: 1.645}
+    return pd.DataFrame({f"P{q}": pred["DXY estimado"] + z[q] * ancho for q in cuantiles}, index=pred.index)
+
+
+def comparativa(factor, seed=0):
+    rng = np.random.default_rng(seed)
+    n = FILAS["comparativa"] * factor
+    real = _paseo(rng, n, 79.2)
+    estimado = real + rng.normal(0, 2.5, n)
+    return pd.DataFrame({
+        "DXY real": real,
+        "DXY estimado": estimado,
+        "Confianza": 1 / rng.gamma(16, 0.28, n),
+        "Error absoluto": np.abs(estimado - real),
+        "Error porcentual": np.abs(estimado - real) / real * 100,
+    }, index=indice("2010-02-01", n))
+
+
+def etiquetado(factor, seed=0):
+    # Entrada del etiquetado del notebook: DXY real y el intervalo de Prophet
+    rng = np.random.default_rng(seed)
+    n = FILAS["dataset"] * factor
+    dxy = _paseo(rng, n, 90.0)
+    yhat = dxy + rng.normal(0, 1, n)
+    ancho = rng.gamma(4, 1.5, n)
+    return pd.DataFrame({
+        "Fecha": indice("2010-01-04", n),
+        "DXY": dxy,
+        "yhat": yhat,
+        "yhat_lower": yhat - ancho * rng.uniform(0, 1, n),
+        "yhat_upper": yhat + ancho * rng.uniform(0, 1, n),
+    })
+
+
+def fechas_escenarios(factor):
+    return indice("2025-09-10", FILAS["predicciones"] * factor)
+
+
+# 🔹 Fuentes crudas de la ingesta (DXY de Yahoo, VIX de CBOE, inflación mensual y FEDFUNDS de FRED)
+def fuentes(directorio, factor, seed=0, fin="2025-09-09"):
+    """Escribe las cuatro fuentes en ``directorio`` con sus formatos originales; devuelve las filas de DXY.
+
+    La ingesta trabaja con fechas diarias: si el calendario no cabe en datetime64[ns] se lanza ValueError.
+    """
+    import ingesta
+
+    rng = np.random.default_rng(seed)
+    n = FILAS["dataset"] * factor
+    # La ingesta convierte las fechas a datetime64[ns]: el calendario debe empezar después de 1677
+    if 1.4 * n > (pd.Timestamp(fin) - pd.Timestamp("1678-01-01")).days:
+        raise ValueError(f"La ingesta es diaria: {n} días laborables no caben en datetime64[ns]")
+    dias = pd.bdate_range(end=fin, periods=n)
+
+    def escribir(ruta, cabecera, lineas):
+        ruta = os.path.join(directorio, ruta)
+        os.makedirs(os.path.dirname(ruta) or directorio, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as f:
+            f.write(cabecera)
+            f.writelines(lineas)
+
+    dxy = _paseo(rng, n, 77.5)
+    escribir(ingesta.FUENTES["DXY"], "Price,DXY\nTicker,DX-Y.NYB\nFecha,\n",
+             [f"{d},{v!r}\n" for d, v in zip(dias.strftime("%Y-%m-%d"), dxy.tolist())])
+    # El VIX no cotiza algunos días del DXY: se omite ~1 de cada 20 para que la interpolación trabaje
+    vix = np.abs(_paseo(rng, n, 17.5, 1.2))
+    cotiza = rng.uniform(size=n) > 0.05
+    escribir(ingesta.FUENTES["VIX"], "DATE,OPEN,HIGH,LOW,CLOSE\n",
+             [f"{d},{v:.6f},{v:.6f},{v:.6f},{v:.6f}\n"
+              for d, v in zip(dias[cotiza].strftime("%m/%d/%Y"), vix[cotiza])])
+    meses = pd.date_range(dias[0].to_period("M").to_timestamp(), dias[-1], freq="MS")
+    inflacion = 21.5 + np.cumsum(np.abs(rng.normal(0.2, 0.3, len(meses))))
+    escribir(ingesta.FUENTES["Inflacion_USA"], "date,value\n",
+             [f"{m},{v:.3f}\n" for m, v in zip(meses.strftime("%Y-%m-%d"), inflacion)])
+    tasa = np.clip(_paseo(rng, len(meses), 2.0, 0.15), 0, None)
+    escribir(ingesta.FUENTES["Tasa_FED"], "date,value\n",
+             [f"{m},{v:.2f}\n" for m, v in zip(meses.strftime("%Y-%m-%d"), tasa)])
+    return n
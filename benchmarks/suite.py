@@ -0,0 +1,261 @@
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import alertas  # noqa: E402
+import artefactos  # noqa: E402
+import caracteristicas  # noqa: E402
+import datos  # noqa: E402
+import escenarios  # noqa: E402
+import ingesta  # noqa: E402
+import precision  # noqa: E402
+import sinteticos  # noqa: E402
+
+HISTORIAL = os.path.join(RAIZ, "benchmarks", "historial.jsonl")
+FACTORES = (1, 10, 100, 1000)
+PRESUPUESTO = 30.0  # s: una etapa que supera esto con un factor no se mide con los siguientes
+MINIMO_S = 0.2  # se repite cada medición hasta acumular este tiempo (como mucho REPETICIONES veces)
+REPETICIONES = 5
+UMBRAL_REGRESION = 0.25  # 25 % más lenta que la referencia
+RUIDO_S = 0.005  # diferencias menores que esto no cuentan como regresión (ruido de medición)
+
+
+# 🔹 Etapas: preparar(factor, directorio) -> (filas, ejecutar); solo se cronometra ejecutar()
+def _carga_csv(factor, directorio):
+    for nombre, generar in (("predicciones", sinteticos.predicciones), ("comparativa", sinteticos.comparativa)):
+        generar(factor).to_csv(os.path.join(directorio, artefactos.ARTEFACTOS[nombre]))
+    filas = (sinteticos.FILAS["predicciones"] + sinteticos.FILAS["comparativa"]) * factor
+    return filas, lambda: [artefactos.leer_original(n) for n in ("predicciones", "comparativa")]
+
+
+def _carga_feather(factor, directorio):
+    filas, _ = _carga_csv(factor, directorio)
+    for nombre in ("predicciones", "comparativa"):
+        artefactos.exportar(nombre)
+    return filas, lambda: [datos.Tabla.desde_columnas(*artefactos.cargar_columnas(n))
+                           for n in ("predicciones", "comparativa")]
+
+
+def _metricas(factor, directorio):
+    df = sinteticos.comparativa(factor)
+    medio = df.index[len(df) // 2]
+
+    def ejecutar():
+        cubo = precision.CuboPrecision.desde_comparativa(df)
+        return cubo.consultar(), cubo.consultar(df.index[0], medio)
+    return len(df), ejecutar
+
+
+def _alertas(metodo):
+    def preparar(factor, directorio):
+        df = sinteticos.predicciones(factor)
+        return len(df), lambda: alertas.detectar(df, metodo)
+    return preparar
+
+
+def _rango(factor, directorio, consultas=1_000):
+    tabla = datos.Tabla(sinteticos.predicciones(factor))
+    rng = np.random.default_rng(0)
+    extremos = np.sort(rng.choice(tabla.fechas, size=(consultas, 2)), axis=1)
+
+    def ejecutar():
+        for inicio, fin in extremos:
+            tabla.rango(inicio, fin)
+    return len(tabla), ejecutar
+
+
+def _ingesta(factor, directorio):
+    filas = sinteticos.fuentes(directorio, factor)
+    return filas, lambda: ingesta.reconstruir(directorio)
+
+
+def _ingesta_incremental(factor, directorio, nuevas=20):
+    # Estado construido sin los últimos ``nuevas`` días de DXY y VIX; cada ejecución añade solo esos
+    filas = sinteticos.fuentes(directorio, factor)
+    rutas = [os.path.join(directorio, ingesta.FUENTES[nombre]) for nombre in ("DXY", "VIX")]
+    completas = {}
+    for ruta in rutas:
+        with open(ruta, "rb") as f:
+            completas[ruta] = f.read()
+        with open(ruta, "wb") as f:
+            f.write(b"".join(completas[ruta].splitlines(keepends=True)[:-nuevas]))
+    ingesta.reconstruir(directorio)
+    copia = tempfile.mkdtemp(dir=directorio)
+    for nombre in (ingesta.DATASET, ingesta.ESTADO):
+        shutil.copy(os.path.join(directorio, nombre), copia)
+    for ruta, contenido in completas.items():
+        with open(ruta, "wb") as f:
+            f.write(contenido)
+
+    def ejecutar():
+        for nombre in (ingesta.DATASET, ingesta.ESTADO):
+            shutil.copy(os.path.join(copia, nombre), directorio)
+        return ingesta.actualizar(directorio)
+    return filas, ejecutar
+
+
+def _etiquetado(factor, directorio):
+    df = sinteticos.etiquetado(factor)
+
+    def ejecutar():
+        variables = caracteristicas.derivar_variables(df)
+        return (caracteristicas.etiquetar_decision(variables),
+                caracteristicas.etiquetar_por_variacion(variables, caracteristicas.UMBRAL_RELATIVO, relativo=True))
+    return len(df), ejecutar
+
+
+def _escenarios(factor, directorio):
+    fechas = sinteticos.fechas_escenarios(factor)
+    base = {"VIX": 19.5, "Inflacion_USA": 250.0, "Tasa_FED": 2.1}
+
+    def ejecutar():
+        rejilla = escenarios.rejilla_escaleras(fechas=fechas, base=base)
+        return [escenarios.crear_df_escenario(d, fechas, base) for d in rejilla.values()]
+    return len(fechas), ejecutar
+
+
+ETAPAS = {
+    "carga:csv": _carga_csv,
+    "carga:feather": _carga_feather,
+    "metricas": _metricas,
+    "alertas:global": _alertas("global"),
+    "alertas:robusto": _alertas("robusto"),
+    "rango": _rango,
+    "ingesta": _ingesta,
+    "ingesta:incremental": _ingesta_incremental,
+    "etiquetado": _etiquetado,
+    "escenarios": _escenarios,
+}
+
+
+def cronometrar(ejecutar):
+    tiempos, total = [], 0.0
+    while len(tiempos) < REPETICIONES and (total < MINIMO_S or not tiempos):
+        t0 = time.perf_counter()
+        ejecutar()
+        tiempos.append(time.perf_counter() - t0)
+        total += tiempos[-1]
+    return min(tiempos), len(tiempos)
+
+
+def medir(etapa, factor):
+    # Cada medición en un directorio propio: los artefactos se leen con rutas relativas
+    anterior = os.getcwd()
+    with tempfile.TemporaryDirectory() as directorio:
+        os.chdir(directorio)
+        try:
+            filas, ejecutar = ETAPAS[etapa](factor, directorio)
+            segundos, repeticiones = cronometrar(ejecutar)
+        finally:
+            os.chdir(anterior)
+    return {"filas": filas, "s": segundos, "repeticiones": repeticiones}
+
+
+# 🔹 Historial JSON-lines: una línea por etapa y factor, con el commit para comparar entre revisiones
+def revision():
+    def git(*args):
+        return subprocess.run(["git", *args], capture_output=True, text=True, cwd=RAIZ).stdout.strip()
+    return git("rev-parse", "--short", "HEAD") or None, bool(git("status", "--porcelain", "--untracked-files=no"))
+
+
+def leer_historial(ruta=HISTORIAL):
+    if not os.path.exists(ruta):
+        return []
+    with open(ruta, encoding="utf-8") as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+def guardar(resultados, ruta=HISTORIAL):
+    with open(ruta, "a", encoding="utf-8") as f:
+        for r in resultados:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+
+def referencia(historial, commit, maquina, revision_ref=None):
+    """Última medición de cada (etapa, factor) en otro commit (o en ``revision_ref``) de la misma máquina."""
+    previas = {}
+    for r in historial:
+        if r["maquina"] != maquina or r.get("error"):
+            continue
+        if ((r["commit"] or "").startswith(revision_ref) if revision_ref else r["commit"] != commit):
+            previas[(r["etapa"], r["factor"])] = r
+    return previas
+
+
+def _pendiente(anterior, actual):
+    # Exponente de escalado entre dos factores: ~1 lineal, >1 superlineal, <1 dominado por costes fijos
+    if anterior is None or anterior.get("s") is None or actual.get("s") is None:
+        return None
+    return math.log(actual["s"] / anterior["s"]) / math.log(actual["filas"] / anterior["filas"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de rendimiento con datos sintéticos escalados (1× a 1000×)")
+    parser.add_argument("--factores", type=int, nargs="+", default=list(FACTORES))
+    parser.add_argument("--etapas", nargs="+", choices=list(ETAPAS), default=list(ETAPAS))
+    parser.add_argument("--presupuesto", type=float, default=PRESUPUESTO,
+                        help="segundos a partir de los que una etapa deja de escalarse")
+    parser.add_argument("--historial", default=HISTORIAL)
+    parser.add_argument("--sin-historial", action="store_true", help="no añadir los resultados al historial")
+    parser.add_argument("--comparar", nargs="?", const="", metavar="REVISION",
+                        help="comparar con la última medición de otro commit (o de REVISION)")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION)
+    args = parser.parse_args(argv)
+
+    commit, sucio = revision()
+    maquina = f"{platform.node()}/{platform.machine()}/{os.cpu_count()}cpu"
+    fecha = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    previas = referencia(leer_historial(args.historial), commit, maquina, args.comparar) \
+        if args.comparar is not None else {}
+
+    resultados, regresiones = [], []
+    print(f"{'etapa':<20} {'factor':>7} {'filas':>10} {'s':>10} {'filas/s':>12} {'escalado':>9} {'vs ref.':>8}")
+    for etapa in args.etapas:
+        previo = None
+        for factor in sorted(args.factores):
+            base = {"fecha": fecha, "commit": commit, "sucio": sucio, "maquina": maquina,
+                    "python": platform.python_version(), "etapa": etapa, "factor": factor}
+            if previo is not None and previo.get("s", 0) > args.presupuesto:
+                resultados.append({**base, "error": f"omitido: {previo['s']:.1f} s con {previo['factor']}×"})
+                print(f"{etapa:<20} {factor:>7} {'':>10} {'omitido (supera el presupuesto)':>33}")
+                continue
+            try:
+                r = {**base, **medir(etapa, factor)}
+            except (ValueError, MemoryError) as e:
+                resultados.append({**base, "error": str(e)})
+                print(f"{etapa:<20} {factor:>7} {'':>10} {'error: ' + str(e)}")
+                continue
+            pendiente = _pendiente(previo, r)
+            ref = previas.get((etapa, factor))
+            cambio = r["s"] / ref["s"] - 1 if ref else None
+            if cambio is not None and cambio > args.umbral and r["s"] - ref["s"] > RUIDO_S:
+                regresiones.append((etapa, factor, ref["commit"], cambio))
+            print(f"{etapa:<20} {factor:>7} {r['filas']:>10} {r['s']:>10.4f} {r['filas'] / r['s']:>12.0f} "
+                  f"{'' if pendiente is None else f'{pendiente:.2f}':>9} "
+                  f"{'' if cambio is None else f'{cambio:+.0%}':>8}")
+            resultados.append(r)
+            previo = r
+
+    if not args.sin_historial:
+        guardar(resultados, args.historial)
+        print(f"📄 {len(resultados)} mediciones añadidas a {os.path.relpath(args.historial)}")
+    for etapa, factor, ref_commit, cambio in regresiones:
+        print(f"⚠️ Regresión: {etapa} con {factor}× es un {cambio:.0%} más lenta que en {ref_commit}")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
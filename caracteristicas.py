@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+# 🔹 Umbrales por defecto de las reglas del notebook
+UMBRAL_DISPERSION = 10      # dispersión máxima para tomar una decisión firme
+BANDA = 0.01                # margen respecto a los límites del intervalo de Prophet
+UMBRAL_VARIACION = 0.5      # variación diaria (puntos DXY) para cambiar / no cambiar
+UMBRAL_RELATIVO = 0.003     # variación relativa al DXY (versión con mejoras)
+
+DECISIONES = np.array(["cambiar", "no_cambiar", "evaluar"], dtype=object)
+
+
+# 🔹 Dispersión y confianza del intervalo de Prophet
+def dispersion(df):
+    return df["yhat_upper"].to_numpy() - df["yhat_lower"].to_numpy()
+
+
+def confianza(disp):
+    with np.errstate(divide="ignore"):
+        return 1 / np.asarray(disp, dtype=float)
+
+
+# 🔹 Regla inicial: posición de yhat dentro del intervalo y dispersión acotada
+def etiquetar_decision(df, umbral_dispersion=UMBRAL_DISPERSION, banda=BANDA):
+    yhat = df["yhat"].to_numpy()
+    disp = df["dispersión"].to_numpy() if "dispersión" in df else dispersion(df)
+    estable = disp < umbral_dispersion
+    indice = np.select(
+        [(yhat > df["yhat_upper"].to_numpy() - banda) & estable,
+         (yhat < df["yhat_lower"].to_numpy() + banda) & estable],
+        [0, 1], default=2)
+    return pd.Series(DECISIONES[indice], index=df.index, name="decision")
+
+
+# 🔹 Etiquetado por variación del DXY (absoluta o relativa al propio DXY)
+def etiquetar_por_variacion(df, umbral=UMBRAL_VARIACION, relativo=False, neutra="evaluar"):
+    variacion = df["variacion"].to_numpy() if "variacion" in df else np.diff(df["DXY"].to_numpy(), prepend=np.nan)
+    limite = df["DXY"].to_numpy() * umbral if relativo else umbral
+    indice = np.select([variacion > limite, variacion < -limite], [0, 1], default=2)
+    etiquetas = np.array(["cambiar", "no_cambiar", neutra], dtype=object)
+    return pd.Series(etiquetas[indice], index=df.index, name="decision")
+
+
+# 🔹 Variables del clasificador: temporales, Prophet, retardos y retornos
+def derivar_variables(df, retardos=(1,), retornos=(1,)):
+    fechas = pd.DatetimeIndex(df["Fecha"])
+    dxy = df["DXY"].to_numpy(dtype=float)
+    nuevas = {
+        "dia_semana": fechas.dayofweek.to_numpy(),
+        "mes": fechas.month.to_numpy(),
+        "año": fechas.year.to_numpy(),
+    }
+    for k in retardos:
+        previo = np.full_like(dxy, np.nan)
+        previo[k:] = dxy[:-k]
+        nuevas["DXY_prev" if k == 1 else f"DXY_lag{k}"] = previo
+        if k == 1:
+            nuevas["variacion"] = dxy - previo
+    for k in retornos:
+        previo = np.full_like(dxy, np.nan)
+        previo[k:] = dxy[:-k]
+        nuevas[f"retorno_{k}"] = dxy / previo - 1
+    if "yhat_upper" in df and "yhat_lower" in df:
+        disp = dispersion(df)
+        nuevas["dispersión"] = disp
+        nuevas["confianza_prophet"] = confianza(disp)
+    return df.assign(**nuevas)
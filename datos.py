@@ -0,0 +1,305 @@
+import hashlib
+import os
+import re
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+import artefactos
+import tiempos
+
+
+# 🔹 Representación compacta de los artefactos, compartida por todas las sesiones del proceso:
+#   - el eje de fechas se guarda una vez como enteros int32 (días desde 1970; minutos si hay horas)
+#   - los valores se guardan en float32; los escenarios (DXY_*) y los cuantiles (P5…P95) forman un
+#     bloque contiguo (k, n) por tabla
+#   - las columnas que se deducen de otras no se guardan: se calculan solo para las filas pedidas
+GRUPOS = {"escenarios": re.compile(r"DXY_.+"), "cuantiles": re.compile(r"P\d+")}
+UNIDADES = {u: int(np.timedelta64(1, u).astype("timedelta64[ns]").astype(np.int64)) for u in ("D", "m")}
+TOLERANCIA = 1e-4  # diferencia relativa admitida para sustituir una columna del fichero por su fórmula
+
+
+def _variacion(tabla, filas):
+    posiciones = np.arange(len(tabla))[filas]
+    estimado = tabla.columna("DXY estimado")
+    variacion = estimado[posiciones] - estimado[np.maximum(posiciones - 1, 0)]
+    return np.where(posiciones > 0, variacion, np.nan).astype(np.float32)
+
+
+# Columna -> (columnas de las que depende, fórmula(tabla, filas)); el orden permite encadenarlas
+DERIVADAS = {
+    "Dispersión": (("yhat_lower", "yhat_upper"),
+                   lambda t, f: t.columna("yhat_upper", f) - t.columna("yhat_lower", f)),
+    "Confianza": (("Dispersión",), lambda t, f: 1 / t.columna("Dispersión", f)),
+    "Error absoluto": (("DXY real", "DXY estimado"),
+                       lambda t, f: np.abs(t.columna("DXY estimado", f) - t.columna("DXY real", f))),
+    "Error porcentual": (("Error absoluto", "DXY real"),
+                         lambda t, f: t.columna("Error absoluto", f) / t.columna("DXY real", f) * 100),
+    "Variación estimada": (("DXY estimado",), _variacion),
+}
+
+_compartidos = weakref.WeakValueDictionary()  # huella del contenido -> array de solo lectura ya cargado
+_lock_compartidos = threading.Lock()
+
+
+def _compartir(valores):
+    # Dos tablas con el mismo eje de fechas o la misma columna (predicciones y escenarios de una
+    # versión comparten yhat_lower/yhat_upper) guardan un único array
+    valores = np.ascontiguousarray(valores)
+    huella = (valores.dtype.str, valores.shape, hashlib.sha1(valores.data).hexdigest())
+    with _lock_compartidos:
+        existente = _compartidos.get(huella)
+        if existente is not None:
+            return existente
+        valores.flags.writeable = False
+        _compartidos[huella] = valores
+        return valores
+
+
+def _eje(indice):
+    # Unidad más gruesa que representa todas las fechas exactamente y cabe en int32; si no, ns en int64
+    ns = pd.DatetimeIndex(indice).as_unit("ns").asi8
+    limites = np.iinfo(np.int32)
+    for unidad, paso in UNIDADES.items():
+        if not (ns % paso).any():
+            enteros = ns // paso
+            if not len(enteros) or (limites.min <= enteros.min() and enteros.max() <= limites.max):
+                return _compartir(enteros.astype(np.int32)), unidad
+    return _compartir(ns), "ns"
+
+
+def _valores(valores):
+    dtype = getattr(valores, "dtype", None)
+    if pd.api.types.is_float_dtype(dtype):
+        return _compartir(np.asarray(valores, dtype=np.float32))
+    if isinstance(dtype, np.dtype) and dtype.kind in "iu":
+        return _compartir(np.asarray(pd.to_numeric(valores, downcast="integer")))
+    return pd.array(valores, copy=False)  # texto y categorías: se guardan tal cual
+
+
+class Tabla:
+    """Tabla de solo lectura compartida entre sesiones, con búsquedas binarias sobre el eje de fechas.
+
+    ``columna`` devuelve vistas de los arrays guardados y ``filas``/``rango``/``buscar`` construyen un
+    DataFrame solo con las filas pedidas (las columnas derivadas se calculan para esas filas).
+    """
+
+    def __init__(self, df):
+        self._cargar(df.index, {c: df[c] for c in df.columns})
+
+    @classmethod
+    def desde_columnas(cls, fechas, columnas):
+        """Tabla a partir de arrays sueltos (artefactos.cargar_columnas) sin construir un DataFrame."""
+        tabla = cls.__new__(cls)
+        tabla._cargar(fechas, columnas)
+        return tabla
+
+    def _cargar(self, fechas, columnas):
+        fechas = pd.DatetimeIndex(fechas)
+        if not fechas.is_monotonic_increasing:
+            orden = np.argsort(fechas.asi8, kind="stable")
+            fechas, columnas = fechas[orden], {c: np.asarray(v)[orden] for c, v in columnas.items()}
+        self.eje, self.unidad = _eje(fechas)
+        self.columnas = list(columnas)
+        self._cabecera = pd.Index(self.columnas)
+        self._valores = {}  # columna -> array 1-D de solo lectura
+        self._grupos = {}  # grupo -> (columnas, bloque float32 (k, n))
+        self._derivadas = set()  # columnas que se calculan al pedirlas
+        for grupo, patron in GRUPOS.items():
+            miembros = [c for c in self.columnas
+                        if patron.fullmatch(c) and pd.api.types.is_float_dtype(columnas[c].dtype)]
+            if miembros:
+                bloque = np.empty((len(miembros), len(fechas)), dtype=np.float32)
+                for k, c in enumerate(miembros):
+                    bloque[k] = columnas[c]
+                bloque.flags.writeable = False
+                self._grupos[grupo] = (miembros, bloque)
+                self._valores.update(zip(miembros, bloque))
+        for c in self.columnas:
+            if c not in self._valores and c not in DERIVADAS:
+                self._valores[c] = _valores(columnas[c])
+        for c, (dependencias, formula) in DERIVADAS.items():
+            if not all(d in self for d in dependencias):
+                if c in columnas:
+                    self._valores[c] = _valores(columnas[c])
+            elif c not in columnas:
+                self._derivadas.add(c)  # disponible aunque no esté en el fichero (Variación estimada)
+            elif (pd.api.types.is_float_dtype(columnas[c].dtype)
+                  and np.allclose(formula(self, slice(None)), np.asarray(columnas[c], dtype=float),
+                                  rtol=TOLERANCIA, atol=TOLERANCIA, equal_nan=True)):
+                self._derivadas.add(c)
+            else:
+                self._valores[c] = _valores(columnas[c])
+
+    def __len__(self):
+        return len(self.eje)
+
+    def __contains__(self, columna):
+        return columna in self._valores or columna in self._derivadas
+
+    @property
+    def nbytes(self):
+        """Bytes de los arrays de la tabla (eje, bloques y columnas sueltas; las derivadas no ocupan)."""
+        arrays = {id(bloque): bloque for _, bloque in self._grupos.values()}
+        agrupadas = {c for miembros, _ in self._grupos.values() for c in miembros}
+        arrays.update((id(v), v) for c, v in self._valores.items() if c not in agrupadas)
+        return self.eje.nbytes + sum(a.nbytes for a in arrays.values())
+
+    # 🔹 Acceso a columnas sin copiar: vistas de solo lectura de los arrays guardados
+    def columna(self, nombre, filas=slice(None)):
+        """Valores de ``nombre`` para ``filas`` (slice o posiciones); las derivadas se calculan al vuelo."""
+        if nombre in self._valores:
+            return self._valores[nombre][filas]
+        if nombre in self._derivadas:
+            return DERIVADAS[nombre][1](self, filas)
+        raise KeyError(nombre)
+
+    def grupo(self, nombre):
+        """(columnas, bloque (k, n)) de los escenarios o los cuantiles; ([], None) si la tabla no los tiene."""
+        return self._grupos.get(nombre, ([], None))
+
+    def matriz(self, columnas, filas=slice(None)):
+        """Array float64 (filas, columnas); si todas son del mismo grupo se leen de su bloque contiguo."""
+        for miembros, bloque in self._grupos.values():
+            if columnas and set(columnas) <= set(miembros):
+                indices = [miembros.index(c) for c in columnas]
+                if isinstance(filas, slice):
+                    return bloque[indices, filas].T.astype(float)
+                return bloque[np.ix_(indices, np.asarray(filas))].T.astype(float)
+        if not columnas:
+            return np.empty((len(self.eje[filas]), 0))
+        return np.column_stack([self.columna(c, filas) for c in columnas]).astype(float)
+
+    def fechas_de(self, filas=slice(None)):
+        return self.eje[filas].astype(f"datetime64[{self.unidad}]").astype("datetime64[ns]")
+
+    @property
+    def fechas(self):
+        return self.fechas_de()
+
+    def filas(self, filas=slice(None), columnas=None):
+        """DataFrame con índice Fecha solo para ``filas``; ``columnas`` admite también las derivadas."""
+        columnas = self._cabecera if columnas is None else pd.Index(columnas)
+        indice = pd.DatetimeIndex(self.fechas_de(filas), name="Fecha")
+        valores = [self.columna(c, filas) for c in columnas]
+        if all(isinstance(v, np.ndarray) and v.dtype == np.float32 for v in valores):
+            # Un solo bloque float32: mucho más barato que construir el DataFrame columna a columna
+            bloque = np.empty((len(valores), len(indice)), dtype=np.float32)
+            for k, v in enumerate(valores):
+                bloque[k] = v
+            return pd.DataFrame(bloque.T, index=indice, columns=columnas, copy=False)
+        return pd.DataFrame(dict(zip(columnas, valores)), index=indice)
+
+    @property
+    def inicio(self):
+        return pd.Timestamp(self.fechas_de(0))
+
+    @property
+    def fin(self):
+        return pd.Timestamp(self.fechas_de(-1))
+
+    # 🔹 Fechas -> enteros del eje; "arriba" redondea hacia la fecha siguiente del eje
+    def _claves(self, fechas, redondeo="abajo"):
+        ns = np.asarray(fechas, dtype="datetime64[ns]").astype(np.int64)
+        paso = UNIDADES.get(self.unidad, 1)
+        claves = -(-ns // paso) if redondeo == "arriba" else ns // paso
+        return claves, claves * paso == ns
+
+    def posicion(self, fecha):
+        clave, exacta = self._claves(np.datetime64(pd.Timestamp(fecha), "ns"))
+        i = int(np.searchsorted(self.eje, clave))
+        if exacta and i < len(self.eje) and self.eje[i] == clave:
+            return i
+        return None
+
+    # 🔹 Posiciones de muchas fechas con una sola búsqueda vectorizada; -1 donde no hay dato
+    def posiciones(self, fechas):
+        claves, encontradas = self._claves(pd.to_datetime(np.asarray(fechas)).values)
+        i = np.searchsorted(self.eje, claves)
+        encontradas &= i < len(self.eje)
+        encontradas[encontradas] = self.eje[i[encontradas]] == claves[encontradas]
+        return np.where(encontradas, i, -1)
+
+    # 🔹 Fila de una fecha en O(log n); None si no hay dato para ese día
+    def buscar(self, fecha):
+        i = self.posicion(fecha)
+        return None if i is None else self.filas([i]).iloc[0]
+
+    # 🔹 Límites [i, j) del rango de fechas, ambos extremos incluidos
+    def limites(self, inicio, fin):
+        desde, _ = self._claves(np.datetime64(pd.Timestamp(inicio), "ns"), "arriba")
+        hasta, _ = self._claves(np.datetime64(pd.Timestamp(fin), "ns"))
+        i = int(np.searchsorted(self.eje, desde, side="left"))
+        j = int(np.searchsorted(self.eje, hasta, side="right"))
+        return i, max(i, j)
+
+    def rango(self, inicio, fin):
+        i, j = self.limites(inicio, fin)
+        return self.filas(slice(i, j))
+
+
+# 🔹 Caché de proceso: cada artefacto se carga una vez y se comparte entre sesiones
+_tablas = {}  # nombre -> (firma, hash, Tabla)
+_locks = {}
+_lock_global = threading.Lock()
+
+
+def _lock(nombre):
+    with _lock_global:
+        return _locks.setdefault(nombre, threading.Lock())
+
+
+def _firma(ruta):
+    # La ruta forma parte de la firma: una versión nueva del reentrenamiento vive en otro directorio
+    estado = os.stat(ruta)
+    return ruta, estado.st_mtime_ns, estado.st_size
+
+
+def _hash(ruta):
+    h = hashlib.sha1()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def disponible(nombre, par=None):
+    return artefactos.disponible(artefactos.clave(nombre, par))
+
+
+def obtener(nombre, par=None):
+    nombre = artefactos.clave(nombre, par)
+    ruta = artefactos.fuente(nombre)
+    firma = _firma(ruta)
+    entrada = _tablas.get(nombre)
+    if entrada is not None and entrada[0] == firma:
+        tiempos.acierto("datos", True)
+        return entrada[2]
+
+    with _lock(nombre):
+        # Otra sesión pudo recargarlo mientras esperábamos el lock
+        entrada = _tablas.get(nombre)
+        if entrada is not None and entrada[0] == firma:
+            tiempos.acierto("datos", True)
+            return entrada[2]
+        # Si solo cambia el mtime pero no el contenido, se conserva la tabla cargada
+        h = _hash(ruta)
+        if entrada is not None and entrada[1] == h:
+            _tablas[nombre] = (firma, h, entrada[2])
+            tiempos.acierto("datos", True)
+            return entrada[2]
+        tiempos.acierto("datos", False)
+        with tiempos.medir(f"carga:{nombre}"):
+            tabla = Tabla.desde_columnas(*artefactos.cargar_columnas(nombre))
+        _tablas[nombre] = (firma, h, tabla)
+        return tabla
+
+
+def invalidar(nombre=None):
+    with _lock_global:
+        if nombre is None:
+            _tablas.clear()
+        else:
+            _tablas.pop(nombre, None)
@@ -0,0 +1,183 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import artefactos
+import escenarios
+import tiempos
+from escenarios import REGRESORES
+
+# 🔹 Pares de divisas de FRED (tipo de cambio diario) que se pronostican además del DXY
+PARES = {
+    "DEXUSEU": "USD por EUR",
+    "DEXUSUK": "USD por GBP",
+    "DEXSZUS": "CHF por USD",
+    "DEXJPUS": "JPY por USD",
+    "DEXCAUS": "CAD por USD",
+    "DEXUSAL": "USD por AUD",
+}
+TABLAS = ["predicciones", "escenarios", "comparativa"]  # artefactos que se publican por par
+METADATOS = "modelo.json"
+
+
+def etiqueta(par):
+    return "DXY (índice dólar)" if par is None else f"{par} · {PARES.get(par, par)}"
+
+
+def directorio(par):
+    return os.path.join(artefactos.DIRECTORIO_PARES, par)
+
+
+def entrenados():
+    """Pares con artefactos publicados, en el orden de PARES (y después los no catalogados)."""
+    if not os.path.isdir(artefactos.DIRECTORIO_PARES):
+        return []
+    publicados = [p for p in os.listdir(artefactos.DIRECTORIO_PARES)
+                  if artefactos.disponible(artefactos.clave("predicciones", p))]
+    return sorted(publicados, key=lambda p: (list(PARES).index(p) if p in PARES else len(PARES), p))
+
+
+def metadatos(par):
+    ruta = os.path.join(directorio(par), METADATOS)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 🔹 Datos de entrenamiento: cada observación del par con los regresores conocidos en esa fecha
+def preparar(observaciones, df_economico):
+    escenarios.comprobar_regresores(df_economico)
+    economico = df_economico[["Fecha"] + REGRESORES].dropna().sort_values("Fecha")
+    economico["Fecha"] = economico["Fecha"].astype("datetime64[ns]")
+    serie = observaciones.rename(columns={"date": "Fecha", "value": "y"})[["Fecha", "y"]].dropna()
+    serie["Fecha"] = serie["Fecha"].astype("datetime64[ns]")
+    df = pd.merge_asof(serie.sort_values("Fecha"), economico, on="Fecha")
+    return df.dropna().rename(columns={"Fecha": "ds"}).reset_index(drop=True)
+
+
+def ajustar(df_reg, config=None, init=None):
+    """Prophet con los regresores macro; ``init`` arranca la optimización desde parámetros previos."""
+    from prophet import Prophet
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+
+    model = Prophet(**(config or {}))
+    for regresor in REGRESORES:
+        model.add_regressor(regresor)
+    with tiempos.medir("prophet:fit"):
+        model.fit(df_reg, **({"init": init} if init is not None else {}))
+    return model
+
+
+def tablas(model, df_reg, fechas=None):
+    """Predicciones, escenarios y comparativa de un modelo ajustado, con el esquema de las del DXY."""
+    fechas = fechas if fechas is not None else escenarios.fechas_futuras()
+    with tiempos.medir("prophet:predict"):
+        ajuste = model.predict(df_reg[["ds"] + REGRESORES])
+
+    # Misma estructura que la comparativa y las predicciones del notebook (columnas "DXY ..." incluidas)
+    real, estimado = df_reg["y"].to_numpy(), ajuste["yhat"].to_numpy()
+    comparativa = pd.DataFrame({
+        "Fecha": df_reg["ds"],
+        "DXY real": real,
+        "DXY estimado": estimado,
+        "Confianza": 1 / (ajuste["yhat_upper"] - ajuste["yhat_lower"]).to_numpy(),
+        "Error absoluto": np.abs(real - estimado),
+        "Error porcentual": np.abs((real - estimado) / real) * 100,
+    })
+    base = {r: df_reg[r].mean() for r in REGRESORES}
+    tabla_escenarios = escenarios.construir_tabla(
+        escenarios.evaluar(model, escenarios.ESCENARIOS_BASE, fechas, base, procesos=1), fechas)
+    predicciones = tabla_escenarios[["Fecha", "DXY_neutro", "yhat_lower", "yhat_upper", "Dispersión", "Confianza"]]
+    predicciones = predicciones.rename(columns={"DXY_neutro": "DXY estimado"})
+    return {"predicciones": predicciones, "escenarios": tabla_escenarios, "comparativa": comparativa}
+
+
+def entrenar(df_reg, fechas=None, config=None):
+    """Ajusta Prophet con regresores para un par y devuelve sus tablas con el esquema de las del DXY."""
+    return tablas(ajustar(df_reg, config), df_reg, fechas)
+
+
+# 🔹 Almacén particionado por par: pares/<serie>/*.csv (+ columnar en artefactos/<serie>/)
+def publicar(par, tablas, **extra):
+    destino = directorio(par)
+    os.makedirs(destino, exist_ok=True)
+    for nombre, df in tablas.items():
+        ruta = os.path.join(destino, artefactos.ARTEFACTOS[nombre])
+        df.to_csv(ruta + ".tmp", index=False)
+        os.replace(ruta + ".tmp", ruta)
+        if artefactos.feather is not None:
+            artefactos.exportar(artefactos.clave(nombre, par))
+    info = {"par": par, "descripcion": PARES.get(par, par),
+            "entrenado": datetime.now(timezone.utc).isoformat(timespec="seconds"), **extra}
+    ruta = os.path.join(destino, METADATOS)
+    with open(ruta + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    os.replace(ruta + ".tmp", ruta)
+    return info
+
+
+def _entrenar_par(par, df_reg, config):
+    start = time.perf_counter()
+    tablas = entrenar(df_reg, config=config)
+    return publicar(par, tablas, filas=len(df_reg), desde=df_reg["ds"].iloc[0].strftime("%Y-%m-%d"),
+                    hasta=df_reg["ds"].iloc[-1].strftime("%Y-%m-%d"),
+                    segundos=round(time.perf_counter() - start, 2))
+
+
+def entrenar_pares(pares=None, df_economico=None, cliente=None, procesos=None, config=None):
+    """Entrena cada par en su propio proceso y publica sus artefactos en cuanto termina.
+
+    Genera (par, metadatos) o (par, excepción) según van terminando: un par lento o con error no
+    retrasa ni impide la publicación de los demás.
+    """
+    from fred_client import ClienteFRED
+
+    pares = list(pares or PARES)
+    if df_economico is None:
+        df_economico = artefactos.leer_original("dataset").reset_index()
+    cliente = cliente or ClienteFRED()
+    with ProcessPoolExecutor(max_workers=min(len(pares), procesos or os.cpu_count())) as pool:
+        futuros, fallidos = {}, []
+        # Cada par se envía al pool en cuanto llegan sus observaciones: la descarga del siguiente
+        # se solapa con el entrenamiento de los anteriores
+        for par in pares:
+            try:
+                observaciones = cliente.observaciones(par)[0]
+                df_reg = preparar(observaciones, df_economico)
+                if len(df_reg) < 2:
+                    raise ValueError(f"{par}: sin observaciones que coincidan con el dataset económico")
+            except Exception as e:
+                fallidos.append((par, e))
+                continue
+            futuros[pool.submit(_entrenar_par, par, df_reg, config)] = par
+        yield from fallidos
+        for futuro in as_completed(futuros):
+            try:
+                yield futuros[futuro], futuro.result()
+            except Exception as e:
+                yield futuros[futuro], e
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrena en paralelo los modelos por par de divisas")
+    parser.add_argument("pares", nargs="*", help=f"series de FRED (por defecto: {', '.join(PARES)})")
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+    errores = 0
+    for par, resultado in entrenar_pares(args.pares or None, procesos=args.procesos):
+        if isinstance(resultado, Exception):
+            errores += 1
+            print(f"❌ {par}: {resultado}")
+        else:
+            print(f"✅ {par}: {resultado['filas']} observaciones ({resultado['desde']} a {resultado['hasta']}), "
+                  f"{resultado['segundos']} s")
+    sys.exit(1 if errores else 0)
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import alertas
+import tiempos
+from fred_client import DIRECTORIO_CACHE, leer_almacen
+
+# 🔹 Modo en vivo del KPI USD → EUR: un productor en segundo plano por proceso escribe las cotizaciones
+#   en un búfer circular compartido por todas las sesiones; cada sesión solo lee una copia al pintar
+ACTIVO = os.environ.get("EN_VIVO", "0") == "1"
+FUENTE = os.environ.get("EN_VIVO_FUENTE", "fred")  # "fred" o "replay"
+INTERVALO = float(os.environ.get("EN_VIVO_INTERVALO", "5"))  # s entre refrescos del fragmento
+CAPACIDAD = int(os.environ.get("EN_VIVO_CAPACIDAD", "720"))  # ticks que se conservan
+INACTIVIDAD = 300  # s sin lectores tras los que el productor deja de consultar la fuente
+
+
+class Anillo:
+    """Búfer circular de tamaño fijo con (instante, valor): la memoria no crece con el tiempo."""
+
+    def __init__(self, capacidad=CAPACIDAD):
+        self.capacidad = capacidad
+        self._instantes = np.full(capacidad, np.nan)
+        self._valores = np.full(capacidad, np.nan)
+        self.total = 0  # ticks recibidos desde el arranque
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self.total, self.capacidad)
+
+    def añadir(self, instante, valor):
+        with self._lock:
+            i = self.total % self.capacidad
+            self._instantes[i] = instante
+            self._valores[i] = valor
+            self.total += 1
+
+    def ultimos(self, n=None):
+        """Copia de los ``n`` últimos ticks (todos por defecto), del más antiguo al más reciente."""
+        with self._lock:
+            k = len(self) if n is None else min(n, len(self))
+            posiciones = np.arange(self.total - k, self.total) % self.capacidad
+            return self._instantes[posiciones], self._valores[posiciones]
+
+
+# 🔹 Fuentes intercambiables: leer() devuelve {"valor", "fecha", "origen", "estado"} o lanza una excepción
+class FuenteFRED:
+    """Último valor publicado en FRED, a través del Actualizador (caché TTL, reintentos y stale)."""
+
+    intervalo = 60.0
+
+    def __init__(self, actualizador, serie="DEXUSEU"):
+        self.actualizador = actualizador
+        self.serie = serie
+        self.etiqueta = f"FRED · {serie}"
+        self.unidad = "EUR"
+
+    def leer(self):
+        info = self.actualizador.ultimo_valor(self.serie)
+        if info["valor"] is None:
+            raise RuntimeError(info["estado"])
+        return {k: info[k] for k in ("valor", "fecha", "origen", "estado")}
+
+
+class FuenteReplay:
+    """Reproduce un histórico local como si fueran cotizaciones nuevas (demostraciones y pruebas sin red)."""
+
+    intervalo = 1.0
+
+    def __init__(self, fechas, valores, etiqueta, unidad="EUR"):
+        if len(valores) == 0:
+            raise ValueError(f"{etiqueta}: histórico vacío")
+        self.fechas = pd.DatetimeIndex(fechas).strftime("%Y-%m-%d").to_numpy()
+        self.valores = np.asarray(valores, dtype=float)
+        self.etiqueta = etiqueta
+        self.unidad = unidad
+        self._posicion = 0
+
+    @classmethod
+    def desde_historico(cls, directorio=DIRECTORIO_CACHE):
+        # DEXUSEU del almacén de FRED si ya se descargó; si no, el CSV del DXY del repositorio
+        almacen = leer_almacen(directorio, "DEXUSEU")
+        if len(almacen):
+            return cls(almacen["date"], almacen["value"], "Reproducción · DEXUSEU")
+        import ingesta
+
+        with open(ingesta.FUENTES["DXY"], encoding="utf-8") as f:
+            dxy = ingesta.PARSERS["DXY"](f.read())
+        return cls(dxy["Fecha"], dxy["valor"], "Reproducción · DXY", unidad="puntos")
+
+    def leer(self):
+        i = self._posicion % len(self.valores)  # al llegar al final vuelve a empezar
+        self._posicion += 1
+        return {"valor": round(float(self.valores[i]), 4), "fecha": self.fechas[i], "origen": "replay",
+                "estado": "▶️ Reproducción del histórico"}
+
+
+class Productor:
+    """Hilo que consulta la fuente cada ``intervalo`` segundos y guarda cada cotización en el anillo.
+
+    Solo se consulta la fuente mientras alguna sesión haya leído en los últimos INACTIVIDAD segundos.
+    Una lectura con la misma fecha que el tick anterior (FRED publica una vez al día) no es un tick nuevo:
+    solo actualiza el estado. Cada variación entre ticks pasa por un detector online
+    (alertas.DetectorOnline, O(1) por tick) y el tick queda marcado con "alerta" si es abrupta.
+    """
+
+    def __init__(self, fuente, anillo=None, intervalo=None, detector=None):
+        self.fuente = fuente
+        self.anillo = anillo or Anillo()
+        self.intervalo = intervalo or fuente.intervalo
+        self.detector = detector or alertas.DetectorOnline("exponencial")
+        self.ultimo = None  # metadatos del tick más reciente
+        self.error = None
+        self._lectura = time.monotonic()
+        self._parar = threading.Event()
+        self._hilo = None
+
+    def iniciar(self):
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._bucle, name="en_vivo", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+
+    def consultar(self, n=None):
+        """(ultimo, instantes, valores) para pintar; marca que hay lectores activos."""
+        self._lectura = time.monotonic()
+        return self.ultimo, *self.anillo.ultimos(n)
+
+    def _bucle(self):
+        while not self._parar.is_set():
+            if time.monotonic() - self._lectura < INACTIVIDAD:
+                start = time.perf_counter()
+                try:
+                    tick = self.fuente.leer()
+                    self.error = None
+                except Exception as e:
+                    tick, self.error = None, e
+                    tiempos.contar("en_vivo:error")
+                tiempos.registrar("en_vivo:lectura", (time.perf_counter() - start) * 1000)
+                if tick is not None and self.ultimo is not None and tick["fecha"] == self.ultimo["fecha"]:
+                    # Sin publicación nueva: repetir el valor aplanaría la serie y la varianza del detector
+                    self.ultimo = dict(tick, alerta=self.ultimo["alerta"])
+                    tiempos.contar("en_vivo:sin_cambios")
+                elif tick is not None:
+                    anterior = self.ultimo["valor"] if self.ultimo is not None else None
+                    tick["alerta"] = anterior is not None and self.detector.actualizar(tick["valor"] - anterior)
+                    self.anillo.añadir(time.time(), tick["valor"])
+                    self.ultimo = tick
+                    tiempos.contar("en_vivo:tick")
+            self._parar.wait(self.intervalo)
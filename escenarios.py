@@ -0,0 +1,153 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import tiempos
+
+REGRESORES = ["VIX", "Inflacion_USA", "Tasa_FED"]
+SALIDA = "escenarios_dxy_2025_2029.csv"
+
+# 🔹 Escenarios del notebook expresados como rejilla declarativa (factores sobre el promedio histórico)
+ESCENARIOS_BASE = {
+    "neutro": {},
+    "positivo": {"VIX": {"factor": 0.8}, "Inflacion_USA": {"factor": 0.9}, "Tasa_FED": {"factor": 0.95}},
+    "negativo": {"VIX": {"factor": 1.2}, "Inflacion_USA": {"factor": 1.1}, "Tasa_FED": {"factor": 1.1}},
+}
+
+
+# 🔹 Comprobación previa al entrenamiento: el dataset debe traer todos los regresores con datos
+def comprobar_regresores(df_economico):
+    faltan = [r for r in REGRESORES if r not in df_economico.columns or df_economico[r].isna().all()]
+    if faltan:
+        raise ValueError(f"El dataset económico no contiene datos de {', '.join(faltan)}: "
+                         "ejecuta `python ingesta.py` para descargar FEDFUNDS y regenerar el dataset")
+
+
+def fechas_futuras(inicio="2025-09-10", fin="2029-12-31"):
+    return pd.date_range(start=inicio, end=fin, freq="B")  # Días laborables
+
+
+# 🔹 Trayectoria de un regresor a partir de su especificación
+#   número                      -> valor constante
+#   {"factor": f}               -> promedio histórico * f
+#   {"escalera": {fecha: valor}} -> escalones (p. ej. subidas de tipos), partiendo del promedio
+#   {"shock": d, "desde", "hasta", "factor"} -> shock aditivo en una ventana de fechas
+#   función(fechas, base)       -> array con la trayectoria completa
+def trayectoria(especificacion, fechas, base):
+    if especificacion is None:
+        return np.full(len(fechas), base, dtype=float)
+    if callable(especificacion):
+        return np.asarray(especificacion(fechas, base), dtype=float)
+    if np.isscalar(especificacion):
+        return np.full(len(fechas), float(especificacion))
+    valores = np.full(len(fechas), base * especificacion.get("factor", 1.0), dtype=float)
+    if "escalera" in especificacion:
+        for fecha, valor in sorted((pd.Timestamp(f), v) for f, v in especificacion["escalera"].items()):
+            valores[fechas >= fecha] = valor
+    if "shock" in especificacion:
+        ventana = np.ones(len(fechas), dtype=bool)
+        if "desde" in especificacion:
+            ventana &= fechas >= pd.Timestamp(especificacion["desde"])
+        if "hasta" in especificacion:
+            ventana &= fechas <= pd.Timestamp(especificacion["hasta"])
+        valores[ventana] += especificacion["shock"]
+    return valores
+
+
+def crear_df_escenario(definicion, fechas, base):
+    return pd.DataFrame({"ds": fechas, **{r: trayectoria(definicion.get(r), fechas, base[r]) for r in REGRESORES}})
+
+
+# 🔹 Escalera de subidas de tipos y shocks de VIX para generar rejillas grandes
+def rejilla_escaleras(subidas=(0.25, 0.5), cada_meses=(3, 6), shocks_vix=(10, 20, 30),
+                      fechas=None, base=None):
+    fechas = fechas if fechas is not None else fechas_futuras()
+    rejilla = dict(ESCENARIOS_BASE)
+    for subida in subidas:
+        for meses in cada_meses:
+            hitos = pd.date_range(fechas[0], fechas[-1], freq=f"{meses}MS")
+            tasa = base["Tasa_FED"] if base else 0.0
+            rejilla[f"tipos+{subida}cada{meses}m"] = {
+                "Tasa_FED": {"escalera": {f: tasa + subida * (i + 1) for i, f in enumerate(hitos)}}
+            }
+    for shock in shocks_vix:
+        rejilla[f"vix+{shock}"] = {"VIX": {"shock": shock, "desde": fechas[0],
+                                          "hasta": fechas[0] + pd.DateOffset(months=3)}}
+    return rejilla
+
+
+# 🔹 Componentes compartidos: tendencia y estacionalidad se calculan una sola vez (escenario neutro)
+def coeficientes(model):
+    from prophet.utilities import regressor_coefficients
+    coef = regressor_coefficients(model).set_index("regressor")
+    if (coef["regressor_mode"] != "additive").any():
+        return None  # con regresores multiplicativos no se puede separar el efecto
+    return coef.loc[REGRESORES, "coef"].to_numpy()
+
+
+_modelo_proceso = None
+
+
+def _iniciar_proceso(model):
+    global _modelo_proceso
+    _modelo_proceso = model
+
+
+def _predecir(args):
+    nombre, df = args
+    with tiempos.medir("prophet:predict"):
+        forecast = _modelo_proceso.predict(df)
+    return nombre, forecast[["yhat", "yhat_lower", "yhat_upper"]].to_numpy()
+
+
+def evaluar(model, rejilla, fechas, base, procesos=None, exacto=False):
+    """Devuelve {nombre: array (n_fechas, 3) con yhat, yhat_lower, yhat_upper}."""
+    trayectorias = {nombre: crear_df_escenario(definicion, fechas, base) for nombre, definicion in rejilla.items()}
+    coef = None if exacto else coeficientes(model)
+
+    if coef is not None:
+        # Una sola llamada a predict; cada escenario suma su efecto lineal de regresores
+        referencia = crear_df_escenario({}, fechas, base)
+        with tiempos.medir("prophet:predict"):
+            neutro = model.predict(referencia)[["yhat", "yhat_lower", "yhat_upper"]].to_numpy()
+        x_ref = referencia[REGRESORES].to_numpy()
+        resultado = {}
+        for nombre, df in trayectorias.items():
+            efecto = (df[REGRESORES].to_numpy() - x_ref) @ coef
+            resultado[nombre] = neutro + efecto[:, None]
+        return resultado
+
+    # Predicción completa de cada escenario repartida entre procesos
+    procesos = procesos or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_proceso, initargs=(model,)) as pool:
+        return dict(pool.map(_predecir, trayectorias.items()))
+
+
+# 🔹 Almacén ancho: una columna DXY_<escenario> por escenario + intervalo del neutro
+def construir_tabla(resultado, fechas):
+    neutro = resultado.get("neutro", next(iter(resultado.values())))
+    tabla = pd.DataFrame({"Fecha": fechas})
+    for nombre, valores in resultado.items():
+        tabla[f"DXY_{nombre}"] = valores[:, 0]
+    tabla["yhat_lower"] = neutro[:, 1]
+    tabla["yhat_upper"] = neutro[:, 2]
+    tabla["Dispersión"] = neutro[:, 2] - neutro[:, 1]
+    tabla["Confianza"] = 1 / tabla["Dispersión"]
+    return tabla
+
+
+def generar(model, df_modelo, rejilla=None, fechas=None, salida=SALIDA, procesos=None, exacto=False):
+    # Sin un regresor la media base sería NaN y todos los escenarios saldrían vacíos
+    comprobar_regresores(df_modelo)
+    fechas = fechas if fechas is not None else fechas_futuras()
+    base = {r: df_modelo[r].mean() for r in REGRESORES}
+    rejilla = rejilla or ESCENARIOS_BASE
+    tabla = construir_tabla(evaluar(model, rejilla, fechas, base, procesos, exacto), fechas)
+    tabla.to_csv(salida, index=False)
+    return tabla
+
+
+def nombres(columnas):
+    return [c[len("DXY_"):] for c in columnas if c.startswith("DXY_")]
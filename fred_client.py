@@ -0,0 +1,162 @@
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import requests
+
+import tiempos
+
+# 🔹 Configuración de la API FRED (se puede apuntar a un servidor local de pruebas con FRED_BASE_URL)
+FRED_BASE_URL = os.environ.get("FRED_BASE_URL", "https://api.stlouisfed.org/fred")
+FRED_API_KEY = os.environ.get("FRED_API_KEY", "437ffc22620f0fe3615350b1764f112b")
+DIRECTORIO_CACHE = os.environ.get("FRED_CACHE_DIR", "cache_fred")
+
+
+# 🔹 Almacén local de observaciones (fecha, valor), ordenado por fecha; compartido con actualizacion.py
+def ruta_almacen(directorio, series_id):
+    return os.path.join(directorio, f"{series_id}.csv")
+
+
+def leer_almacen(directorio, series_id):
+    ruta = ruta_almacen(directorio, series_id)
+    if not os.path.exists(ruta):
+        return pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"),
+                             "value": pd.Series(dtype="float64")})
+    return pd.read_csv(ruta, parse_dates=["date"])
+
+
+def escribir_atomico(ruta, escribir, modo="w"):
+    """Escribe con ``escribir(f)`` en un temporal propio del mismo directorio y lo renombra sobre ``ruta``.
+
+    Cada escritor tiene su temporal (mkstemp): dos refrescos simultáneos no se pisan el fichero a medias.
+    """
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)),
+                                    prefix=os.path.basename(ruta) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, modo, **({} if "b" in modo else {"encoding": "utf-8", "newline": ""})) as f:
+            escribir(f)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+def guardar_almacen(directorio, series_id, df):
+    os.makedirs(directorio, exist_ok=True)
+    escribir_atomico(ruta_almacen(directorio, series_id),
+                     lambda f: df.to_csv(f, index=False, date_format="%Y-%m-%d"))
+
+
+def parsear_observaciones(data):
+    nuevos = pd.DataFrame(data["observations"], columns=["date", "value"])
+    nuevos["date"] = pd.to_datetime(nuevos["date"])
+    nuevos["value"] = pd.to_numeric(nuevos["value"], errors="coerce")
+    return nuevos.dropna(subset=["value"])
+
+
+def fusionar(almacen, desde, nuevos):
+    # La última observación puede haber sido revisada: prevalece la descargada
+    df = pd.concat([almacen[almacen["date"] < desde] if desde is not None else almacen, nuevos])
+    return df.drop_duplicates(subset="date", keep="last").sort_values("date").reset_index(drop=True)
+
+
+class ClienteFRED:
+    """Cliente FRED con caché TTL en memoria y almacén local incremental de observaciones."""
+
+    def __init__(self, api_key=FRED_API_KEY, base_url=FRED_BASE_URL,
+                 directorio=DIRECTORIO_CACHE, ttl=3600, timeout=5, reintento=60):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.directorio = directorio
+        self.ttl = ttl
+        self.timeout = timeout
+        self.reintento = reintento
+        self._memoria = {}  # series_id -> (caducidad, DataFrame, origen, error)
+        self._locks = {}
+        self._lock_global = threading.Lock()
+
+    # 🔹 Un lock por serie: sesiones concurrentes no repiten la misma descarga
+    def _lock(self, series_id):
+        with self._lock_global:
+            return self._locks.setdefault(series_id, threading.Lock())
+
+    def _leer_almacen(self, series_id):
+        return leer_almacen(self.directorio, series_id)
+
+    def _guardar_almacen(self, series_id, df):
+        guardar_almacen(self.directorio, series_id, df)
+
+    # 🔹 Descarga solo las observaciones desde la última fecha almacenada
+    def _descargar(self, series_id, desde=None):
+        params = {
+            "series_id": series_id,
+            "api_key": self.api_key,
+            "file_type": "json",
+        }
+        if desde is not None:
+            params["observation_start"] = desde.strftime("%Y-%m-%d")
+        response = requests.get(f"{self.base_url}/series/observations",
+                                params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return parsear_observaciones(response.json())
+
+    def _actualizar(self, series_id):
+        almacen = self._leer_almacen(series_id)
+        desde = almacen["date"].iloc[-1] if len(almacen) else None
+        nuevos = self._descargar(series_id, desde)
+        df = fusionar(almacen, desde, nuevos)
+        if len(nuevos):
+            self._guardar_almacen(series_id, df)
+        return df
+
+    def observaciones(self, series_id):
+        """Devuelve (DataFrame, origen, latencia_ms, error). Origen: "caché", "red" o "stale"."""
+        resultado = self._observaciones(series_id)
+        tiempos.registrar(f"fred:{series_id}", resultado[2])
+        tiempos.contar(f"fred:{resultado[1]}")
+        return resultado
+
+    def _observaciones(self, series_id):
+        start = time.perf_counter()
+        entrada = self._memoria.get(series_id)
+        if entrada is not None and time.time() < entrada[0]:
+            return entrada[1], entrada[2], round((time.perf_counter() - start) * 1000, 2), entrada[3]
+
+        with self._lock(series_id):
+            # Otra sesión pudo refrescar la serie mientras esperábamos el lock
+            entrada = self._memoria.get(series_id)
+            if entrada is not None and time.time() < entrada[0]:
+                return entrada[1], entrada[2], round((time.perf_counter() - start) * 1000, 2), entrada[3]
+            try:
+                df = self._actualizar(series_id)
+            except Exception as e:
+                # 🔹 API lenta o caída: se sirve el último valor bueno conocido y se reintenta más tarde
+                anterior = entrada[1] if entrada is not None else self._leer_almacen(series_id)
+                if len(anterior) == 0:
+                    raise
+                self._memoria[series_id] = (time.time() + self.reintento, anterior, "stale", e)
+                return anterior, "stale", round((time.perf_counter() - start) * 1000, 2), e
+            self._memoria[series_id] = (time.time() + self.ttl, df, "caché", None)
+            return df, "red", round((time.perf_counter() - start) * 1000, 2), None
+
+    def ultimo_valor(self, series_id):
+        df, origen, latencia, error = self.observaciones(series_id)
+        if len(df) == 0:
+            # Almacén vacío y FRED sin observaciones (serie recién publicada o consulta sin datos)
+            return {"valor": None, "fecha": None, "latencia": latencia, "origen": origen,
+                    "estado": f"⚠️ FRED no devolvió observaciones de {series_id}"}
+        latest = df.iloc[-1]
+        estados = {
+            "caché": "✅ FRED OK (caché)",
+            "red": "✅ FRED OK",
+            "stale": f"⚠️ FRED no disponible, último valor conocido (stale): {type(error).__name__}",
+        }
+        return {
+            "valor": round(latest["value"], 4),
+            "fecha": latest["date"].strftime("%Y-%m-%d"),
+            "latencia": latencia,
+            "origen": origen,
+            "estado": estados[origen],
+        }
@@ -0,0 +1,146 @@
+import threading
+
+import numpy as np
+
+import tiempos
+
+# 🔹 Capa de datos para gráficos: series reducidas según el rango visible y trazas WebGL si hay muchos puntos
+ANCHO_PX = 1_200  # ancho aproximado de un gráfico a página completa
+PUNTOS = 2 * ANCHO_PX  # puntos por traza enviados al navegador: mínimo y máximo por columna de píxeles
+PRESELECCION = 4  # el nivel de la pirámide debe tener al menos PRESELECCION × PUNTOS en el rango
+MINIMO = 250  # el nivel más grueso de la pirámide no baja de aquí
+UMBRAL_WEBGL = 1_000  # a partir de aquí se usa Scattergl
+
+
+def _eje(fechas):
+    # Milisegundos desde 1970 como float64: plotly los interpreta como fechas y viajan en binario
+    return np.asarray(fechas, dtype="datetime64[ns]").astype("datetime64[ms]").astype(np.int64).astype(float)
+
+
+def lttb(x, y, n):
+    """Posiciones elegidas por Largest-Triangle-Three-Buckets (conserva picos y forma con n puntos)."""
+    total = len(y)
+    if n >= total or n < 3:
+        return np.arange(total)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    bordes = np.floor(np.linspace(1, total - 1, n - 1)).astype(int)  # n-2 cubos entre el primero y el último
+    con_dato = ~np.isnan(y[1:total - 1])
+    cuenta = np.maximum(np.add.reduceat(con_dato, bordes[:-1] - 1), 1)
+    media_x = np.add.reduceat(x[1:total - 1], bordes[:-1] - 1) / np.diff(bordes)
+    media_y = np.add.reduceat(np.where(con_dato, y[1:total - 1], 0.0), bordes[:-1] - 1) / cuenta
+
+    elegidos = np.empty(n, dtype=int)
+    elegidos[0], elegidos[-1] = 0, total - 1
+    a = 0
+    for b in range(n - 2):
+        lo, hi = bordes[b], bordes[b + 1]
+        cx, cy = (media_x[b + 1], media_y[b + 1]) if b + 1 < n - 2 else (x[-1], y[-1])
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        area = np.where(np.isnan(area), -1.0, area)
+        a = lo + int(np.argmax(area))
+        elegidos[b + 1] = a
+    return elegidos
+
+
+def minmax(x, y, n):
+    """Posiciones del mínimo y el máximo de cada franja de tiempo (n/2 franjas de igual anchura).
+
+    Con dos puntos por columna de píxeles la envolvente dibujada coincide con la de la serie completa.
+    """
+    total = len(y)
+    if n >= total:
+        return np.arange(total)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    franjas = max(n // 2, 1)
+    ancho = (x[-1] - x[0]) / franjas or 1.0
+    franja = np.minimum(((x - x[0]) / ancho).astype(int), franjas - 1)
+    validos = np.flatnonzero(~np.isnan(y))
+    # Orden por (franja, valor): el primero de cada franja es el mínimo y el último el máximo
+    orden = validos[np.lexsort((y[validos], franja[validos]))]
+    cortes = np.flatnonzero(np.diff(franja[orden])) + 1
+    minimos = orden[np.concatenate([[0], cortes])]
+    maximos = orden[np.concatenate([cortes - 1, [len(orden) - 1]])]
+    return np.unique(np.concatenate([[0, total - 1], minimos, maximos]))
+
+
+def reducir(x, y, n, metodo="minmax"):
+    return lttb(x, y, n) if metodo == "lttb" else minmax(x, y, n)
+
+
+class Piramide:
+    """Niveles de detalle precalculados (cada uno la mitad del anterior) para una o varias series.
+
+    Los niveles se construyen con min-max, vectorizado y sin perder la envolvente; al consultar,
+    el nivel más grueso con detalle suficiente en el rango se reduce a los puntos pedidos con
+    ``metodo`` (min-max alineado a píxeles por defecto, o LTTB).
+    Con ``guia`` todas las columnas comparten las posiciones elegidas sobre esa columna (bandas
+    de cuantiles que deben rellenarse entre sí); sin ella cada columna se reduce por separado.
+    """
+
+    def __init__(self, fechas, columnas, metodo="minmax", guia=None, minimo=MINIMO):
+        self.x = _eje(fechas)
+        self.columnas = {c: np.asarray(v, dtype=float) for c, v in columnas.items()}
+        self.metodo = metodo
+        self.guia = guia
+        completo = np.arange(len(self.x))
+        self.niveles = [{c: completo for c in self._claves()}]
+        while len(next(iter(self.niveles[-1].values()))) > 2 * minimo:
+            previo = self.niveles[-1]
+            self.niveles.append({c: previo[c][minmax(self.x[previo[c]], self.columnas[c][previo[c]],
+                                                     len(previo[c]) // 2)]
+                                 for c in self._claves()})
+
+    def _claves(self):
+        return [self.guia] if self.guia is not None else list(self.columnas)
+
+    def consultar(self, inicio=None, fin=None, puntos=PUNTOS):
+        """{columna: (x, y)} del rango visible con como mucho ``puntos`` por traza."""
+        lo = -np.inf if inicio is None else _eje([inicio])[0]
+        hi = np.inf if fin is None else _eje([fin])[0]
+        resultado = {}
+        for clave in self._claves():
+            # Nivel más grueso que aún tiene suficientes puntos dentro del rango
+            elegidas = None
+            for nivel in reversed(self.niveles):
+                posiciones = nivel[clave]
+                eje = self.x[posiciones]
+                i = int(np.searchsorted(eje, lo, side="left"))
+                j = int(np.searchsorted(eje, hi, side="right"))
+                if j - i >= PRESELECCION * puntos or nivel is self.niveles[0]:
+                    elegidas = posiciones[i:j]
+                    break
+            if len(elegidas) > puntos:
+                elegidas = elegidas[reducir(self.x[elegidas], self.columnas[clave][elegidas], puntos, self.metodo)]
+            # Valores en float32 (la precisión de los artefactos): la mitad de bytes hacia el navegador
+            if self.guia is not None:
+                resultado.update({c: (self.x[elegidas], y[elegidas].astype(np.float32))
+                                  for c, y in self.columnas.items()})
+            else:
+                resultado[clave] = (self.x[elegidas], self.columnas[clave][elegidas].astype(np.float32))
+        return resultado
+
+
+def traza(x, y, umbral_webgl=UMBRAL_WEBGL, **kwargs):
+    import plotly.graph_objects as go
+
+    clase = go.Scattergl if len(x) > umbral_webgl else go.Scatter
+    return clase(x=x, y=y, **kwargs)
+
+
+# 🔹 Pirámides compartidas por proceso; se recalculan solo si la tabla se recarga
+_piramides = {}  # (nombre, columnas, metodo, guia) -> (Tabla, Piramide)
+_lock = threading.Lock()
+
+
+def piramide_para(nombre, tabla, columnas, metodo="minmax", guia=None):
+    clave = (nombre, tuple(columnas), metodo, guia)
+    with _lock:
+        entrada = _piramides.get(clave)
+        tiempos.acierto("piramides", entrada is not None and entrada[0] is tabla)
+        if entrada is None or entrada[0] is not tabla:
+            with tiempos.medir(f"piramide:{nombre}"):
+                entrada = (tabla, Piramide(tabla.fechas, {c: tabla.columna(c) for c in columnas}, metodo, guia))
+            _piramides[clave] = entrada
+        return entrada[1]
@@ -0,0 +1,118 @@
+import io
+import threading
+
+import numpy as np
+import pandas as pd
+
+import tiempos
+
+BLOQUE = 10_000  # filas por fragmento en las exportaciones
+
+
+class SumasRango:
+    """Sumas acumuladas de las columnas numéricas de una Tabla: medias de cualquier rango en O(1)."""
+
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self.columnas = [c for c in tabla.columnas if pd.api.types.is_numeric_dtype(tabla.columna(c).dtype)]
+        valores = tabla.matriz(self.columnas)
+        validos = ~np.isnan(valores)
+        ceros = np.zeros((1, len(self.columnas)))
+        self._suma = np.vstack([ceros, np.cumsum(np.where(validos, valores, 0.0), axis=0)])
+        self._cuenta = np.vstack([ceros, np.cumsum(validos, axis=0)])
+
+    def medias(self, inicio, fin, columnas=None):
+        i, j = self.tabla.limites(inicio, fin)
+        suma = self._suma[j] - self._suma[i]
+        cuenta = self._cuenta[j] - self._cuenta[i]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            medias = pd.Series(suma / cuenta, index=self.columnas)
+        return {"filas": j - i, **(medias if columnas is None else medias[columnas]).to_dict()}
+
+
+_sumas = {}  # nombre de artefacto -> SumasRango
+_lock = threading.Lock()
+
+
+def sumas_para(nombre, tabla):
+    with _lock:
+        entrada = _sumas.get(nombre)
+        tiempos.acierto("sumas", entrada is not None and entrada.tabla is tabla)
+        if entrada is None or entrada.tabla is not tabla:
+            with tiempos.medir(f"sumas:{nombre}"):
+                entrada = SumasRango(tabla)
+            _sumas[nombre] = entrada
+        return entrada
+
+
+# 🔹 Exportaciones por fragmentos: cada bloque de filas [k, k + bloque) se materializa, se escribe y se libera;
+#   nunca se construye el informe completo en memoria
+def _bloques(tabla, i, j, bloque):
+    for k in range(i, j, bloque):
+        yield tabla.filas(slice(k, min(k + bloque, j)))
+
+
+def csv_por_bloques(tabla, i, j, bloque=BLOQUE):
+    yield tabla.filas(slice(i, i)).to_csv(date_format="%Y-%m-%d").encode("utf-8")
+    for trozo in _bloques(tabla, i, j, bloque):
+        yield trozo.to_csv(header=False, date_format="%Y-%m-%d").encode("utf-8")
+
+
+def xlsx_por_bloques(tabla, i, j, destino, bloque=BLOQUE):
+    from openpyxl import Workbook
+
+    # Libro en modo write_only: las filas se vuelcan al fichero según se añaden
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet("Informe")
+    hoja.append(["Fecha"] + list(tabla.columnas))
+    for trozo in _bloques(tabla, i, j, bloque):
+        fechas = trozo.index.to_pydatetime()
+        for fecha, fila in zip(fechas, trozo.itertuples(index=False)):
+            hoja.append([fecha] + [None if pd.isna(v) else (float(v) if isinstance(v, (float, np.floating)) else v)
+                                   for v in fila])
+    libro.save(destino)
+
+
+def pdf_resumen(metricas, inicio, fin, destino, titulo="Informe de predicción del dólar (DXY)"):
+    # Figura propia, sin pyplot: no toca el backend ni el estado global de matplotlib que comparten las sesiones
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8.27, 11.69))  # A4
+    fig.text(0.08, 0.92, titulo, fontsize=16, color="#003366", weight="bold")
+    fig.text(0.08, 0.88, f"Periodo: {pd.Timestamp(inicio):%d/%m/%Y} – {pd.Timestamp(fin):%d/%m/%Y}", fontsize=11)
+    y = 0.82
+    for nombre, valor in metricas.items():
+        texto = f"{valor:.2f}" if isinstance(valor, (float, np.floating)) else f"{valor}"
+        fig.text(0.10, y, f"{nombre}: {texto}", fontsize=11)
+        y -= 0.03
+    fig.text(0.08, 0.05, "Grupo Procourval – Departamento de Datos", fontsize=9, color="gray")
+    with PdfPages(destino) as pdf:
+        pdf.savefig(fig)
+
+
+def a_fichero(escribir):
+    """Ejecuta una exportación sobre un BytesIO y lo devuelve listo para leer.
+
+    st.download_button solo admite bytes, BytesIO o ficheros binarios abiertos y lee el contenido
+    entero de todas formas; los bloques limitan las filas materializadas, no el tamaño del fichero.
+    """
+    destino = io.BytesIO()
+    escribir(destino)
+    destino.seek(0)
+    return destino
+
+
+def csv_a_fichero(tabla, i, j, bloque=BLOQUE):
+    def escribir(destino):
+        for trozo in csv_por_bloques(tabla, i, j, bloque):
+            destino.write(trozo)
+    return a_fichero(escribir)
+
+
+def xlsx_a_fichero(tabla, i, j, bloque=BLOQUE):
+    return a_fichero(lambda destino: xlsx_por_bloques(tabla, i, j, destino, bloque))
+
+
+def pdf_a_fichero(metricas, inicio, fin):
+    return a_fichero(lambda destino: pdf_resumen(metricas, inicio, fin, destino))
@@ -0,0 +1,358 @@
+import io
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from fred_client import DIRECTORIO_CACHE, escribir_atomico
+
+# 🔹 Fuentes del dataset económico (mismas que el notebook) y fichero resultante. VIX, IPC y tasa FED se
+#   leen de los almacenes locales que mantiene el refresco concurrente (refrescar_fuentes)
+FUENTES = {
+    "DXY": "DXY_Index.csv",
+    "VIX": os.path.join(DIRECTORIO_CACHE, "VIX.csv"),  # histórico de CBOE
+    "Inflacion_USA": os.path.join(DIRECTORIO_CACHE, "CPIAUCSL.csv"),  # almacén local de FRED
+    "Tasa_FED": os.path.join(DIRECTORIO_CACHE, "FEDFUNDS.csv"),
+}
+REMOTAS = {"VIX": "VIX", "Inflacion_USA": "CPIAUCSL", "Tasa_FED": "FEDFUNDS"}  # fuente de actualizacion.py
+SEMILLAS = {"VIX": "VIX_History.csv", "Inflacion_USA": "Inflacion_USA.csv"}  # histórico incluido en el repo
+MENSUALES = ["Inflacion_USA", "Tasa_FED"]
+DATASET = "dataset_final_economico.csv"
+ESTADO = "ingesta_estado.json"
+COLUMNAS = ["Fecha", "DXY", "VIX", "Inflacion_USA", "Tasa_FED", "dia_semana", "mes", "año"]
+
+
+def _numero(serie):
+    # to_numeric puede perder el último dígito; astype(float) de numpy conserva el valor del texto
+    validos = pd.to_numeric(serie, errors="coerce").notna().to_numpy()
+    valores = np.full(len(serie), np.nan)
+    valores[validos] = serie.to_numpy(dtype=object)[validos].astype(float)
+    return pd.Series(valores, index=serie.index)
+
+
+# 🔹 Parsers: reciben texto CSV (completo o solo las líneas nuevas) y devuelven (Fecha, valor)
+def _parsear_dxy(texto):
+    # Cabecera de Yahoo en varias filas (Price/Ticker/Fecha): se descartan al no ser fechas
+    df = pd.read_csv(io.StringIO(texto), header=None, names=["Fecha", "valor"], dtype=str)
+    df["Fecha"] = pd.to_datetime(df["Fecha"], format="%Y-%m-%d", errors="coerce")
+    df["valor"] = _numero(df["valor"])
+    return df.dropna()
+
+
+def _parsear_vix(texto):
+    df = pd.read_csv(io.StringIO(texto), header=None, usecols=[0, 4], names=["Fecha", "valor"], dtype=str)
+    df["Fecha"] = pd.to_datetime(df["Fecha"], format="%m/%d/%Y", errors="coerce")
+    df["valor"] = _numero(df["valor"])
+    return df.dropna()
+
+
+def _parsear_mensual(texto):
+    df = pd.read_csv(io.StringIO(texto), header=None, names=["Fecha", "valor"], dtype=str)
+    df["Fecha"] = pd.to_datetime(df["Fecha"], format="%Y-%m-%d", errors="coerce")
+    df["valor"] = _numero(df["valor"])
+    df = df.dropna(subset=["Fecha"])
+    df["Fecha"] = df["Fecha"].dt.to_period("M").dt.to_timestamp()
+    return df.groupby("Fecha", as_index=False)["valor"].mean().dropna()
+
+
+PARSERS = {
+    "DXY": _parsear_dxy,
+    "VIX": _parsear_vix,
+    "Inflacion_USA": _parsear_mensual,
+    "Tasa_FED": _parsear_mensual,
+}
+
+
+# 🔹 Lectura incremental: solo los bytes añadidos desde la marca de agua de cada fuente
+def _leer_nuevas(nombre, ruta, marca):
+    if not os.path.exists(ruta):
+        return PARSERS[nombre](""), marca
+    with open(ruta, "rb") as f:
+        offset = marca["offset"] if marca else 0
+        if marca:
+            # La última línea procesada debe seguir en su sitio; si no, el fichero se reescribió
+            ultima = marca["ultima_linea"].encode()
+            f.seek(offset - len(ultima))
+            if f.read(len(ultima)) != ultima:
+                raise ValueError(f"La fuente {nombre} ha cambiado antes de la marca de agua")
+        f.seek(offset)
+        bruto = f.read()
+    # Solo líneas completas; una línea a medio escribir se lee en la siguiente pasada
+    completo = bruto[:bruto.rfind(b"\n") + 1]
+    if not completo:
+        return PARSERS[nombre](""), marca
+    lineas = completo.rstrip(b"\n").split(b"\n")
+    nuevas = PARSERS[nombre](completo.decode())
+    fecha = nuevas["Fecha"].max() if len(nuevas) else None
+    if marca and marca.get("fecha") and (fecha is None or fecha < pd.Timestamp(marca["fecha"])):
+        fecha = pd.Timestamp(marca["fecha"])
+    return nuevas, {
+        "offset": offset + len(completo),
+        "ultima_linea": lineas[-1].decode() + "\n",
+        "fecha": fecha.strftime("%Y-%m-%d") if fecha is not None else None,
+    }
+
+
+# 🔹 Interpolación lineal por posiciones relativas: no depende del desplazamiento de la ventana
+def _interpolar(valores):
+    valores = valores.copy()
+    validos = np.flatnonzero(~np.isnan(valores))
+    if len(validos) == 0:
+        return valores
+    huecos = np.flatnonzero(np.isnan(valores))
+    huecos = huecos[huecos > validos[0]]
+    derecha = np.searchsorted(validos, huecos)
+    izquierda = validos[derecha - 1]
+    final = derecha == len(validos)
+    # Tras el último dato real se mantiene el último valor (como interpolate de pandas)
+    valores[huecos[final]] = valores[izquierda[final]]
+    h, i, d = huecos[~final], izquierda[~final], validos[derecha[~final]]
+    valores[h] = valores[i] + (valores[d] - valores[i]) * ((h - i) / (d - i))
+    return valores
+
+
+def _rellenar(filas, semillas):
+    df = filas.copy()
+    df["VIX"] = _interpolar(df["VIX"].to_numpy(dtype=float))
+    for columna in MENSUALES:
+        valores = df[columna]
+        if semillas.get(columna) is not None and len(valores) and pd.isna(valores.iloc[0]):
+            valores = valores.copy()
+            valores.iloc[0] = semillas[columna]
+        df[columna] = valores.ffill()
+    df["dia_semana"] = df["Fecha"].dt.dayofweek
+    df["mes"] = df["Fecha"].dt.month
+    df["año"] = df["Fecha"].dt.year
+    return df[COLUMNAS]
+
+
+def _a_csv(df, cabecera=False):
+    return df.to_csv(index=False, header=cabecera, date_format="%Y-%m-%d", lineterminator="\n")
+
+
+def _cargar_estado(directorio):
+    ruta = os.path.join(directorio, ESTADO)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _escribir_atomico(ruta, prefijo_desde, bytes_prefijo, texto):
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    fd, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    with os.fdopen(fd, "wb") as destino:
+        if bytes_prefijo:
+            # Copia binaria del tramo ya consolidado, sin volver a parsearlo
+            with open(prefijo_desde, "rb") as origen:
+                restante = bytes_prefijo
+                while restante:
+                    bloque = origen.read(min(restante, 1 << 20))
+                    destino.write(bloque)
+                    restante -= len(bloque)
+        destino.write(texto.encode("utf-8"))
+        destino.flush()
+        os.fsync(destino.fileno())
+    os.replace(temporal, ruta)
+
+
+# 🔹 Sin almacén todavía, VIX e IPC parten del histórico incluido en el repo: el primer refresco solo
+#   descarga lo posterior y la ingesta sin red sigue teniendo todas las fuentes
+def _sembrar(directorio):
+    for nombre, origen in SEMILLAS.items():
+        destino, origen = os.path.join(directorio, FUENTES[nombre]), os.path.join(directorio, origen)
+        if os.path.exists(destino) or not os.path.exists(origen):
+            continue
+        with open(origen, "rb") as f:
+            contenido = f.read()
+        if nombre in MENSUALES:
+            # Cabecera del almacén de FRED (fred_client.leer_almacen)
+            contenido = b"date,value\n" + contenido.split(b"\n", 1)[1]
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        escribir_atomico(destino, lambda f: f.write(contenido), "wb")
+
+
+# 🔹 Descarga incremental de VIX, IPC y FEDFUNDS a los almacenes locales con el refresco concurrente
+def refrescar_fuentes(directorio=".", actualizador=None):
+    """Refresca las fuentes remotas del dataset; lanza RuntimeError si una no se descarga ni tiene copia local."""
+    from actualizacion import Actualizador
+
+    _sembrar(directorio)
+    propio = actualizador is None
+    actualizador = actualizador or Actualizador(directorio=os.path.join(directorio, DIRECTORIO_CACHE))
+    try:
+        resultados = actualizador.refrescar_sync(list(REMOTAS.values()))
+    finally:
+        if propio:
+            actualizador.cerrar()
+    fallidas = [f"{fuente} ({r['error']})" for fuente, r in resultados.items() if r["origen"] == "error"]
+    if fallidas:
+        raise RuntimeError(f"No se pudo descargar {', '.join(fallidas)} y no hay copia local")
+    return resultados
+
+
+def actualizar(directorio=".", reconstruir=False):
+    """Añade al dataset las filas nuevas de cada fuente. Devuelve el número de filas recalculadas."""
+    ruta_dataset = os.path.join(directorio, DATASET)
+    _sembrar(directorio)
+    # Sin una fuente la columna quedaría vacía en el dataset versionado: se aborta antes de escribir
+    faltan = [f"{nombre} ({ruta})" for nombre, ruta in FUENTES.items()
+              if not os.path.exists(os.path.join(directorio, ruta))]
+    if faltan:
+        raise FileNotFoundError(f"Faltan fuentes del dataset: {', '.join(faltan)}. VIX, IPC y FEDFUNDS se "
+                                "descargan con `python ingesta.py` (necesita acceso a FRED y CBOE)")
+    estado = None if reconstruir else _cargar_estado(directorio)
+    if estado is not None and (not os.path.exists(ruta_dataset)
+                               or os.path.getsize(ruta_dataset) != estado["tamaño"]):
+        estado = None  # el dataset se modificó fuera de la ingesta
+
+    try:
+        nuevas, marcas = {}, {}
+        for nombre, ruta in FUENTES.items():
+            marca = estado["fuentes"].get(nombre) if estado else None
+            if estado is not None and marca is None and os.path.exists(os.path.join(directorio, ruta)):
+                raise ValueError(f"Nueva fuente disponible: {nombre}")
+            nuevas[nombre], marcas[nombre] = _leer_nuevas(nombre, os.path.join(directorio, ruta), marca)
+    except ValueError:
+        if estado is None:
+            raise
+        return actualizar(directorio, reconstruir=True)
+
+    cola = pd.DataFrame(estado["cola"] if estado else [], columns=COLUMNAS[:5])
+    cola["Fecha"] = pd.to_datetime(cola["Fecha"]).astype("datetime64[ns]")
+    cola[COLUMNAS[1:5]] = cola[COLUMNAS[1:5]].astype(float)
+    if estado is None:
+        semillas, offset_cola = {}, 0
+        ultima_fecha = None
+    else:
+        semillas, offset_cola = estado["semillas"], estado["offset_cola"]
+        ultima_fecha = pd.Timestamp(estado["ultima_fecha"]) if estado["ultima_fecha"] else None
+
+    # 🔹 Ventana a recalcular: filas provisionales + filas nuevas de DXY
+    dxy = nuevas["DXY"]
+    if ultima_fecha is not None:
+        dxy = dxy[dxy["Fecha"] > ultima_fecha]
+    nuevas_filas = pd.DataFrame({"Fecha": dxy["Fecha"].astype("datetime64[ns]").to_numpy(),
+                                 "DXY": dxy["valor"].to_numpy(dtype=float)})
+    for columna in COLUMNAS[2:5]:
+        nuevas_filas[columna] = np.nan
+    filas = pd.concat([cola, nuevas_filas], ignore_index=True)
+    filas = filas.drop_duplicates(subset="Fecha", keep="last").reset_index(drop=True)
+
+    # Los datos nuevos de cada fuente (y los que llegaron antes que su fila de DXY) solo afectan a la ventana
+    pendientes = {}
+    ultima = filas["Fecha"].max() if len(filas) else ultima_fecha
+    for columna in COLUMNAS[2:5]:
+        previos = pd.DataFrame(estado["pendientes"][columna] if estado else [], columns=["Fecha", "valor"])
+        previos["Fecha"] = pd.to_datetime(previos["Fecha"])
+        fuente = pd.concat([previos, nuevas[columna]], ignore_index=True)
+        serie = fuente.drop_duplicates(subset="Fecha", keep="last").set_index("Fecha")["valor"]
+        filas[columna] = filas[columna].fillna(filas["Fecha"].map(serie))
+        adelantados = serie[serie.index > ultima] if ultima is not None else serie
+        pendientes[columna] = [[f.strftime("%Y-%m-%d"), float(v)] for f, v in adelantados.items()]
+
+    rellenas = _rellenar(filas, semillas)
+
+    # 🔹 Primera fila provisional: tras el último VIX real o en meses aún sin dato mensual
+    reales_vix = np.flatnonzero(filas["VIX"].notna().to_numpy())
+    corte = len(filas) if len(reales_vix) == 0 else int(reales_vix[-1])
+    for columna in MENSUALES:
+        if not marcas[columna] or not marcas[columna]["fecha"]:
+            continue  # fuente sin ningún dato todavía
+        limite = pd.Timestamp(marcas[columna]["fecha"]) + pd.offsets.MonthBegin(1)
+        sin_dato = np.flatnonzero((filas["Fecha"] >= limite).to_numpy())
+        if len(sin_dato):
+            corte = min(corte, int(sin_dato[0]))
+    # La cola empieza siempre en un VIX real para que la interpolación no dependa de la ventana
+    anteriores = reales_vix[reales_vix <= corte]
+    corte = int(anteriores[-1]) if len(anteriores) else 0
+
+    estables = rellenas.iloc[:corte]
+    texto_estable = _a_csv(estables, cabecera=estado is None)
+    texto = texto_estable + _a_csv(rellenas.iloc[corte:])
+    _escribir_atomico(ruta_dataset, ruta_dataset, offset_cola, texto)
+
+    if corte:
+        semillas = {c: (None if pd.isna(estables[c].iloc[-1]) else float(estables[c].iloc[-1]))
+                    for c in MENSUALES}
+    cola_nueva = filas.iloc[corte:]
+    nuevo_estado = {
+        "fuentes": marcas,
+        "semillas": semillas,
+        "pendientes": pendientes,
+        "offset_cola": offset_cola + len(texto_estable.encode("utf-8")),
+        "cola": [[f.strftime("%Y-%m-%d")] + [None if pd.isna(v) else float(v) for v in valores]
+                 for f, *valores in cola_nueva[COLUMNAS[:5]].itertuples(index=False)],
+        "ultima_fecha": filas["Fecha"].max().strftime("%Y-%m-%d") if len(filas) else
+        (ultima_fecha.strftime("%Y-%m-%d") if ultima_fecha is not None else None),
+        "tamaño": os.path.getsize(ruta_dataset),
+    }
+    ruta_estado = os.path.join(directorio, ESTADO)
+    with open(ruta_estado + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(nuevo_estado, f, ensure_ascii=False)
+    os.replace(ruta_estado + ".tmp", ruta_estado)
+    return len(filas)
+
+
+def reconstruir(directorio="."):
+    return actualizar(directorio, reconstruir=True)
+
+
+# 🔹 Comprobación: la construcción incremental por tramos coincide byte a byte con la reconstrucción completa
+def _fecha_linea(nombre, linea):
+    campo = linea.split(b",", 1)[0].decode()
+    try:
+        return pd.Timestamp(datetime.strptime(campo, "%m/%d/%Y" if nombre == "VIX" else "%Y-%m-%d"))
+    except ValueError:
+        return None  # cabecera
+
+
+def verificar_equivalencia(directorio=".", tramos=5):
+    _sembrar(directorio)
+    fuentes = {}
+    for nombre, ruta in FUENTES.items():
+        origen = os.path.join(directorio, ruta)
+        if os.path.exists(origen):
+            with open(origen, "rb") as f:
+                lineas = f.read().splitlines(keepends=True)
+            fuentes[nombre] = [(_fecha_linea(nombre, linea), linea) for linea in lineas]
+    fechas = pd.Series([f for f, _ in fuentes["DXY"] if f is not None])
+    cortes = list(fechas.quantile(np.linspace(0, 1, tramos + 1)[1:]))
+
+    def escribir_hasta(destino, corte):
+        for nombre, lineas in fuentes.items():
+            # El dato mensual del mes en curso aún no está publicado en la fecha de corte
+            limite = corte - pd.offsets.MonthBegin(1) if nombre in MENSUALES else corte
+            if nombre == "VIX":
+                limite = corte + pd.Timedelta(days=7)  # el VIX puede llegar antes que el DXY
+            ruta = os.path.join(destino, FUENTES[nombre])
+            os.makedirs(os.path.dirname(ruta) or destino, exist_ok=True)
+            with open(ruta, "wb") as f:
+                f.write(b"".join(linea for fecha, linea in lineas if fecha is None or fecha <= limite))
+
+    with tempfile.TemporaryDirectory() as incremental, tempfile.TemporaryDirectory() as completo:
+        for corte in cortes:
+            escribir_hasta(incremental, corte)
+            actualizar(incremental)
+        escribir_hasta(completo, cortes[-1])
+        reconstruir(completo)
+        with open(os.path.join(incremental, DATASET), "rb") as a, open(os.path.join(completo, DATASET), "rb") as b:
+            return a.read() == b.read()
+
+
+if __name__ == "__main__":
+    try:
+        if "--sin-red" not in sys.argv:
+            refrescar_fuentes()
+        if "--verificar" in sys.argv:
+            print("✅ Incremental = reconstrucción completa" if verificar_equivalencia()
+                  else "❌ El dataset incremental difiere de la reconstrucción completa")
+            sys.exit(0)
+        n = reconstruir() if "--completo" in sys.argv else actualizar()
+    except (RuntimeError, FileNotFoundError) as e:
+        sys.exit(f"❌ {e}")
+    print(f"✅ {DATASET} actualizado ({n} filas recalculadas)")
@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import datos
+import tiempos
+from caracteristicas import UMBRAL_DISPERSION
+
+# 🔹 Registro de versiones del clasificador Random Forest (cambiar / no_cambiar)
+#   julio    -> ficheros guardados por el notebook en la raíz del proyecto
+#   <otras>  -> registro_modelos/<version>/ con modelo, imputador, columnas y metadatos (ACTUAL apunta a la activa)
+DIRECTORIO_REGISTRO = os.environ.get("MODELOS_DIR", "registro_modelos")
+VERSION_BASE = "julio"
+FICHEROS_BASE = {
+    "modelo": "modelo_rf_julio.pkl",
+    "imputador": "imputador.pkl",
+    "features": "features_rf.pkl",
+}
+UMBRAL_CAMBIO = 0.6  # probabilidad mínima de 'cambiar' (mismo ajuste de umbral que el notebook)
+
+
+def _ficheros(version):
+    if version == VERSION_BASE:
+        return dict(FICHEROS_BASE)
+    carpeta = os.path.join(DIRECTORIO_REGISTRO, version)
+    return {clave: os.path.join(carpeta, f"{clave}.pkl") for clave in FICHEROS_BASE}
+
+
+def _hash(ruta):
+    h = hashlib.sha1()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _firma(ficheros):
+    return tuple((os.stat(r).st_mtime_ns, os.stat(r).st_size) for r in ficheros.values())
+
+
+def hash_datos(df):
+    """Huella del conjunto de entrenamiento para guardarla con la versión."""
+    return hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes()).hexdigest()
+
+
+def disponible(version=None):
+    version = version or version_actual()
+    return all(os.path.exists(r) for r in _ficheros(version).values())
+
+
+def faltantes(version=None):
+    version = version or version_actual()
+    return [r for r in _ficheros(version).values() if not os.path.exists(r)]
+
+
+def metadatos(version):
+    if version == VERSION_BASE:
+        return {"version": VERSION_BASE, "origen": "notebook",
+                "ficheros": {c: _hash(r) for c, r in _ficheros(version).items() if os.path.exists(r)}}
+    with open(os.path.join(DIRECTORIO_REGISTRO, version, "metadatos.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def versiones():
+    """Versiones registradas (la del notebook primero), con sus metadatos."""
+    resultado = [metadatos(VERSION_BASE)] if disponible(VERSION_BASE) else []
+    if os.path.isdir(DIRECTORIO_REGISTRO):
+        registradas = [v for v in os.listdir(DIRECTORIO_REGISTRO)
+                       if os.path.exists(os.path.join(DIRECTORIO_REGISTRO, v, "metadatos.json"))]
+        resultado += sorted((metadatos(v) for v in registradas), key=lambda m: m["creado"])
+    return resultado
+
+
+def version_actual():
+    ruta = os.path.join(DIRECTORIO_REGISTRO, "ACTUAL")
+    if os.path.exists(ruta):
+        with open(ruta, encoding="utf-8") as f:
+            return f.read().strip()
+    registradas = [m["version"] for m in versiones() if m["version"] != VERSION_BASE]
+    return registradas[-1] if registradas else VERSION_BASE
+
+
+def activar(version):
+    if not disponible(version):
+        raise FileNotFoundError(f"La versión {version} no está completa: {', '.join(faltantes(version))}")
+    os.makedirs(DIRECTORIO_REGISTRO, exist_ok=True)
+    # Temporal propio (mkstemp): dos activaciones simultáneas no se pisan el puntero a medias
+    fd, temporal = tempfile.mkstemp(prefix="ACTUAL.", suffix=".tmp", dir=DIRECTORIO_REGISTRO)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.chmod(temporal, 0o644)
+        os.replace(temporal, os.path.join(DIRECTORIO_REGISTRO, "ACTUAL"))
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+# 🔹 Alta de una versión nueva junto a las anteriores; la carpeta aparece completa o no aparece
+def registrar(modelo, imputador, features, version=None, df_entrenamiento=None, activar_version=True, **extra):
+    version = version or datetime.now().strftime("%Y%m%d_%H%M%S")
+    destino = os.path.join(DIRECTORIO_REGISTRO, version)
+    if os.path.exists(destino):
+        raise FileExistsError(f"La versión {version} ya está registrada")
+    os.makedirs(DIRECTORIO_REGISTRO, exist_ok=True)
+    temporal = tempfile.mkdtemp(prefix=f".{version}-", dir=DIRECTORIO_REGISTRO)
+    try:
+        # Sin compresión, para poder cargarlos con mmap_mode
+        for clave, objeto in (("modelo", modelo), ("imputador", imputador), ("features", list(features))):
+            joblib.dump(objeto, os.path.join(temporal, f"{clave}.pkl"))
+        info = {
+            "version": version,
+            "creado": datetime.now().isoformat(timespec="seconds"),
+            "features": list(features),
+            "clases": [int(c) for c in getattr(modelo, "classes_", [])],
+            "ficheros": {c: _hash(os.path.join(temporal, f"{c}.pkl")) for c in FICHEROS_BASE},
+            "datos": hash_datos(df_entrenamiento) if df_entrenamiento is not None else None,
+            **extra,
+        }
+        with open(os.path.join(temporal, "metadatos.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False, indent=1)
+        os.chmod(temporal, 0o755)
+        os.replace(temporal, destino)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    if activar_version:
+        activar(version)
+    return info
+
+
+class Clasificador:
+    """Modelo, imputador y columnas de una versión, cargados una vez por proceso."""
+
+    def __init__(self, version, modelo, imputador, features, info):
+        self.version = version
+        self.modelo = modelo
+        self.imputador = imputador
+        self.features = list(features)
+        self.metadatos = info
+        if "n_jobs" in modelo.get_params():
+            modelo.set_params(n_jobs=-1)  # predict_proba reparte los árboles entre todos los núcleos
+        self._columna_cambio = int(np.flatnonzero(modelo.classes_ == 1)[0])
+
+    def probabilidad_cambio(self, X):
+        # Una única imputación y una única llamada a predict_proba para todo el lote
+        X = pd.DataFrame(self.imputador.transform(X[self.features]), columns=self.features, index=X.index)
+        return self.modelo.predict_proba(X)[:, self._columna_cambio]
+
+    def recomendar(self, X, umbral=UMBRAL_CAMBIO, umbral_dispersion=UMBRAL_DISPERSION):
+        proba = self.probabilidad_cambio(X)
+        accion = np.select([proba >= umbral, proba <= 1 - umbral], ["cambiar", "no_cambiar"], "evaluar")
+        # El modelo solo se entrenó con dispersión < umbral: fuera de ese rango se deja a criterio del analista
+        accion = np.where(X["dispersión"].to_numpy() >= umbral_dispersion, "evaluar", accion)
+        return pd.DataFrame({"Probabilidad cambio": proba, "Acción": accion}, index=X.index)
+
+
+# 🔹 Caché de proceso por versión, invalidada si cambia algún fichero (mismo criterio que datos.py)
+_clasificadores = {}  # version -> (firma, Clasificador)
+_locks = {}
+_lock_global = threading.Lock()
+
+
+def _lock(version):
+    with _lock_global:
+        return _locks.setdefault(version, threading.Lock())
+
+
+def _cargar(ruta):
+    try:
+        return joblib.load(ruta, mmap_mode="r")
+    except ValueError:  # ficheros comprimidos: no admiten mapa de memoria
+        return joblib.load(ruta)
+
+
+def cargar(version=None):
+    version = version or version_actual()
+    ficheros = _ficheros(version)
+    if not disponible(version):
+        raise FileNotFoundError(f"Faltan ficheros del modelo {version}: {', '.join(faltantes(version))}")
+    firma = _firma(ficheros)
+    entrada = _clasificadores.get(version)
+    if entrada is not None and entrada[0] == firma:
+        tiempos.acierto("modelos", True)
+        return entrada[1]
+    with _lock(version):
+        entrada = _clasificadores.get(version)
+        if entrada is not None and entrada[0] == firma:
+            return entrada[1]
+        tiempos.acierto("modelos", False)
+        with tiempos.medir(f"carga:modelo:{version}"):
+            clasificador = Clasificador(version, _cargar(ficheros["modelo"]), _cargar(ficheros["imputador"]),
+                                        _cargar(ficheros["features"]), metadatos(version))
+        _clasificadores[version] = (firma, clasificador)
+        return clasificador
+
+
+# 🔹 Matriz de características por fecha a partir de los artefactos ya cargados
+_economico = {}  # id de la Tabla -> (Tabla, valores con último dato conocido)
+
+
+def _ultimo_conocido(tabla, columnas):
+    entrada = _economico.get(id(tabla))
+    if entrada is None or entrada[0] is not tabla:
+        df = pd.DataFrame({c: tabla.columna(c) if c in tabla else np.full(len(tabla), np.nan) for c in columnas})
+        entrada = (tabla, df.ffill().to_numpy(dtype=float))
+        _economico.clear()
+        _economico[id(tabla)] = entrada
+    return entrada[1]
+
+
+def _prophet(fechas):
+    # yhat y dispersión: predicción futura si existe, si no la comparativa fuera de muestra
+    yhat = np.full(len(fechas), np.nan)
+    dispersion = np.full(len(fechas), np.nan)
+    for nombre, col_yhat in (("comparativa", "DXY estimado"), ("predicciones", "DXY estimado")):
+        if not datos.disponible(nombre):
+            continue
+        tabla = datos.obtener(nombre)
+        pos = tabla.posiciones(fechas)
+        ok = pos >= 0
+        yhat[ok] = tabla.columna(col_yhat, pos[ok])
+        if "Dispersión" in tabla:
+            dispersion[ok] = tabla.columna("Dispersión", pos[ok])
+        else:
+            dispersion[ok] = 1 / tabla.columna("Confianza", pos[ok])
+    return yhat, dispersion
+
+
+def matriz(fechas):
+    fechas = pd.DatetimeIndex(pd.to_datetime(np.asarray(fechas)), name="Fecha")
+    economicas = ["DXY", "VIX", "Inflacion_USA", "Tasa_FED"]
+    X = pd.DataFrame(np.nan, index=fechas, columns=economicas)
+    if datos.disponible("dataset"):
+        tabla = datos.obtener("dataset")
+        valores = _ultimo_conocido(tabla, economicas)
+        # Último dato publicado en cada fecha (el dataset se rellena hacia delante igual que en el notebook)
+        pos = np.searchsorted(tabla.fechas, fechas.values.astype("datetime64[ns]"), side="right") - 1
+        ok = pos >= 0
+        X.loc[ok, economicas] = valores[pos[ok]]
+    X["dia_semana"] = fechas.dayofweek
+    X["mes"] = fechas.month
+    X["año"] = fechas.year
+    X["yhat"], X["dispersión"] = _prophet(fechas)
+    X["confianza_prophet"] = 1 / X["dispersión"]
+    return X
+
+
+def recomendaciones(fechas, version=None, **kwargs):
+    """Acción recomendada para cada fecha con una sola inferencia por lote."""
+    X = matriz(fechas)
+    with tiempos.medir("modelo:inferencia"):
+        return cargar(version).recomendar(X, **kwargs).assign(**{"Dispersión": X["dispersión"].to_numpy()})
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+import escenarios
+import tiempos
+
+CUANTILES = (5, 10, 25, 50, 75, 90, 95)
+SALIDA = "abanico_dxy_2025_2029.csv"
+
+
+# 🔹 Cambios diarios conjuntos de VIX, inflación y tasa FED (una fila por día con los tres datos)
+def cambios_historicos(df_economico):
+    regresores = df_economico.sort_values("Fecha")[escenarios.REGRESORES]
+    return regresores.diff().dropna().to_numpy(dtype=float)
+
+
+def simular_cuantiles(yhat_ref, x_ref, x0, coef, cambios, n_trayectorias=10_000,
+                      cuantiles=CUANTILES, bloque_fechas=64, seed=None):
+    """Cuantiles por fecha del DXY simulado, array (n_fechas, n_cuantiles).
+
+    Cada trayectoria remuestrea días históricos completos (los tres regresores a la vez), así que
+    se conserva la correlación entre VIX, inflación y tasa FED. Se avanza por bloques de fechas
+    arrastrando el nivel de cada trayectoria: la memoria es O(n_trayectorias * bloque_fechas).
+    """
+    rng = np.random.default_rng(seed)
+    yhat_ref = np.asarray(yhat_ref, dtype=float)
+    x_ref, coef = np.asarray(x_ref, dtype=float), np.asarray(coef, dtype=float)
+    q = np.asarray(cuantiles, dtype=float) / 100
+    resultado = np.empty((len(yhat_ref), len(q)))
+    nivel = np.tile(np.asarray(x0, dtype=float), (n_trayectorias, 1))
+    base = yhat_ref - x_ref @ coef
+
+    for inicio in range(0, len(yhat_ref), bloque_fechas):
+        fin = min(inicio + bloque_fechas, len(yhat_ref))
+        pasos = cambios[rng.integers(0, len(cambios), size=(n_trayectorias, fin - inicio))]
+        trayectorias = np.cumsum(pasos, axis=1)
+        trayectorias += nivel[:, None, :]
+        np.maximum(trayectorias, 0, out=trayectorias)  # VIX, inflación y tipos no negativos
+        nivel = trayectorias[:, -1, :]
+        dxy = trayectorias @ coef + base[inicio:fin]
+        resultado[inicio:fin] = np.quantile(dxy, q, axis=0).T
+    return resultado
+
+
+def construir_tabla(fechas, valores, cuantiles=CUANTILES):
+    tabla = pd.DataFrame({"Fecha": fechas})
+    for i, c in enumerate(cuantiles):
+        tabla[f"P{c}"] = valores[:, i]
+    return tabla
+
+
+def generar(model, df_economico, fechas=None, n_trayectorias=10_000, seed=42, salida=SALIDA):
+    escenarios.comprobar_regresores(df_economico)
+    fechas = fechas if fechas is not None else escenarios.fechas_futuras()
+    base = {r: df_economico[r].mean() for r in escenarios.REGRESORES}
+    referencia = escenarios.crear_df_escenario({}, fechas, base)
+    coef = escenarios.coeficientes(model)
+    if coef is None:
+        raise ValueError("La simulación requiere regresores aditivos en el modelo Prophet")
+    with tiempos.medir("prophet:predict"):
+        yhat_ref = model.predict(referencia)["yhat"].to_numpy()
+    ultimos = df_economico.sort_values("Fecha")[escenarios.REGRESORES].ffill().iloc[-1].to_numpy()
+    valores = simular_cuantiles(
+        yhat_ref, referencia[escenarios.REGRESORES].iloc[0].to_numpy(), ultimos, coef,
+        cambios_historicos(df_economico), n_trayectorias=n_trayectorias, seed=seed)
+    tabla = construir_tabla(fechas, valores)
+    tabla.to_csv(salida, index=False)
+    return tabla
@@ -0,0 +1,142 @@
+import matplotlib.pyplot as plt
+import pandas as pd
+import streamlit as st
+
+import artefactos
+import datos
+import precision
+import tiempos
+
+# 🔹 Par de divisas elegido en la barra lateral (None = DXY)
+par = st.session_state.get("par")
+
+# 🔹 Comparativa del par y cubo de precisión compartido entre sesiones
+tabla_comparativa = datos.obtener("comparativa", par)
+cubo = precision.cubo_para(artefactos.clave("comparativa", par), tabla_comparativa)
+# 🔹 Registro de decisiones del notebook (columna "Acierto"), con su propio criterio de acierto
+decisiones = precision.registro_decisiones(par)
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:diagnostico")
+def diagnostico():
+    # 🔹 Selección del periodo a diagnosticar (mes o rango libre), consultado en O(1) sobre el cubo
+    st.markdown("###  Diagnóstico financiero del modelo")
+    modo_periodo = st.radio("Periodo a diagnosticar", ["Mes", "Rango de fechas"], horizontal=True)
+    if modo_periodo == "Mes":
+        meses = sorted(set(cubo.meses()) | set(decisiones.meses()))
+        mes = st.selectbox("Mes", meses[::-1], format_func=lambda m: m.strftime("%m/%Y"))
+        with tiempos.medir("metricas:diagnostico"):
+            metricas = {**cubo.consultar_mes(mes), **decisiones.consultar_mes(mes)}
+        periodo = mes.strftime("%m/%Y")
+    else:
+        rango = st.date_input(
+            "Rango de fechas",
+            value=(tabla_comparativa.fin - pd.DateOffset(months=1), tabla_comparativa.fin),
+            min_value=tabla_comparativa.inicio,
+            max_value=max(tabla_comparativa.fin, pd.Timestamp(decisiones.fechas[-1]) if len(decisiones.fechas)
+                          else tabla_comparativa.fin)
+        )
+        inicio_periodo, fin_periodo = (rango[0], rango[-1]) if len(rango) else (tabla_comparativa.inicio, tabla_comparativa.fin)
+        with tiempos.medir("metricas:diagnostico"):
+            metricas = {**cubo.consultar(inicio_periodo, fin_periodo), **decisiones.consultar(inicio_periodo, fin_periodo)}
+        periodo = f"{inicio_periodo.strftime('%d/%m/%Y')} – {fin_periodo.strftime('%d/%m/%Y')}"
+
+    # Hace falta algún día con decisión registrada o un par de días consecutivos para medir el acierto
+    hay_datos = metricas["decisiones"] or metricas.get("porcentaje_acierto") is not None
+    if not hay_datos:
+        st.warning("⚠️ Sin datos: el periodo no tiene decisiones registradas ni días de la comparativa con los "
+                   "que medir el acierto de dirección.")
+    else:
+        # 🔹 Métricas de rendimiento: acierto de decisión (registro) y de dirección (comparativa), cada una con su nombre
+        if metricas["decisiones"]:
+            aciertos, errores = metricas["aciertos_decision"], metricas["errores_decision"]
+            criterio = "decisión"
+        else:
+            aciertos, errores = metricas["aciertos"], metricas["errores"]
+            criterio = "dirección"
+
+        # 🔹 Evaluación analítica con explicación clara
+        st.markdown(f"####  Diagnóstico – {periodo}")
+        col1, col2 = st.columns(2)
+        if metricas["decisiones"]:
+            col1.metric("Acierto de decisión", f"{metricas['porcentaje_decision']:.1f} %",
+                        help=f"{metricas['aciertos_decision']} de {metricas['decisiones']} días del registro de decisiones")
+        if metricas.get("porcentaje_acierto") is not None:
+            col2.metric("Acierto de dirección", f"{metricas['porcentaje_acierto']:.1f} %",
+                        help=f"{metricas['aciertos']} de {metricas['aciertos'] + metricas['errores']} días de la comparativa")
+        st.caption("El diagnóstico usa el acierto de decisión (columna «Acierto» del registro de julio: la "
+                   "recomendación cambiar / no cambiar coincide con la real) cuando el periodo tiene decisiones "
+                   "registradas, como la sección original (julio 2025: 17 de 22, 77 %). Fuera de ese registro usa el "
+                   "acierto de dirección de la comparativa, que solo compara el signo de la variación diaria y da "
+                   "otras cifras (julio 2025: 8 de 11, 72,7 %).")
+
+    fiabilidad_periodo = precision.fiabilidad(metricas) if hay_datos else None
+    if fiabilidad_periodo == "alta":
+        st.success("✅ Alta fiabilidad: el modelo fue preciso y estable.")
+        st.markdown("""
+        El diagnóstico se basa en dos parámetros clave:
+        - **Porcentaje de acierto**: el modelo acertó en más del 80 % de los días, lo que indica una excelente capacidad para anticipar correctamente la dirección del dólar.
+        - **Confianza media**: con un valor superior a 0.15, el modelo mostró estabilidad en sus estimaciones, lo que refuerza su utilidad en entornos financieros.
+
+        Este rendimiento sugiere que el modelo puede utilizarse para tomar decisiones operativas con seguridad, especialmente en contextos de riesgo controlado.
+        """)
+    elif fiabilidad_periodo == "moderada":
+        st.warning("⚠️ Fiabilidad moderada: útil con supervisión.")
+        st.markdown("""
+        Aunque el modelo acertó entre el 65 % y el 80 % de las veces, lo que indica una fiabilidad aceptable, no alcanza niveles óptimos.
+        La confianza media es razonable, pero se recomienda que las decisiones basadas en este modelo sean revisadas por un analista, especialmente en días con alta volatilidad o eventos macroeconómicos relevantes.
+        """)
+    elif fiabilidad_periodo == "baja":
+        st.error("❌ Fiabilidad baja: el modelo requiere revisión.")
+        st.markdown("""
+        El porcentaje de acierto fue inferior al 65 %, lo que indica que el modelo no logró anticipar correctamente la mayoría de los movimientos del dólar.
+        Además, si la confianza media es baja, las predicciones pueden haber sido inconsistentes o erráticas.
+        En este caso, se recomienda revisar el modelo, ajustar sus parámetros, o incorporar nuevas variables que mejoren su capacidad predictiva.
+        """)
+
+    if hay_datos:
+        # 🔹 Gráfico refinado de aciertos vs errores
+        st.markdown(f"###  Distribución de aciertos y errores ({criterio}) – {periodo}")
+
+        fig, ax = plt.subplots(figsize=(5.5, 3.5))
+        colores = ["#0072B5", "#D55E00"]  # Azul corporativo y rojo financiero
+        barras = ax.bar(["✔️ Aciertos", "❌ Errores"], [aciertos, errores], color=colores, width=0.5)
+
+        # Añadir etiquetas encima de cada barra
+        for barra in barras:
+            altura = barra.get_height()
+            ax.text(barra.get_x() + barra.get_width() / 2, altura + 0.5, f"{int(altura)}", ha='center', va='bottom', fontsize=10)
+
+        ax.set_ylabel("Número de días", fontsize=9)
+        ax.set_title(f"Predicciones correctas vs incorrectas – {periodo}", fontsize=10, color="#003366")
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.grid(axis="y", linestyle="--", alpha=0.3)
+        with tiempos.medir("grafico:diagnostico"):
+            st.pyplot(fig)
+
+
+diagnostico()
+st.markdown("### ¿Qué entendemos por acierto y error en este modelo?")
+st.markdown("""
+El diagnóstico distingue dos medidas de acierto:
+
+- **Acierto de decisión** (registro de decisiones, julio 2025): la recomendación del modelo (cambiar o no cambiar) coincide con la decisión que correspondía según la variación real del dólar. Es el criterio de la sección original y el que determina la fiabilidad cuando el periodo tiene decisiones registradas.
+- **Acierto de dirección** (comparativa, cualquier periodo): el modelo predijo correctamente la dirección del movimiento del dólar respecto al día anterior. Es decir, si el dólar subió y el modelo anticipó una subida, o si bajó y el modelo anticipó una bajada, se considera un acierto.
+
+Por el contrario, un **error** ocurre cuando el modelo predijo una dirección contraria a la que realmente sucedió.  
+Por ejemplo, si el modelo anticipó una subida pero el dólar bajó, eso se contabiliza como error.
+
+---
+
+###  Parámetros que se interpretan para cada caso:
+
+- **DXY real**: es el valor real del índice del dólar en ese día, calculado frente a una cesta de divisas.
+- **Variación real**: indica si el dólar subió o bajó respecto al día anterior.
+- **Predicción modelo**: es la estimación que hizo el modelo sobre el comportamiento del dólar.
+- **Acierto**: en el registro de decisiones se marca como ✔️ si la decisión del modelo coincidió con la real, y ❌ si no lo hizo.
+- **Confianza**: representa la seguridad del modelo en su predicción, calculada a partir de la dispersión del intervalo de Prophet. Cuanto mayor sea la confianza, más estable es la estimación.
+
+Este análisis no mide si el valor exacto fue idéntico, sino si el modelo fue capaz de anticipar correctamente la **tendencia** del mercado, lo cual es clave en entornos financieros donde la dirección del movimiento es más relevante que el valor absoluto.
+""")
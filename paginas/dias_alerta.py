@@ -0,0 +1,100 @@
+import streamlit as st
+
+import alertas
+import artefactos
+import datos
+import tiempos
+
+# 🔹 Par de divisas elegido en la barra lateral (None = DXY)
+par = st.session_state.get("par")
+
+# 🔹 Cargar predicciones futuras (tabla compartida: no se modifica en sitio)
+tabla_pred = datos.obtener("predicciones", par)
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:alertas")
+def dias_alerta():
+    # 🔹 Método de umbral: global (original), ventana móvil, exponencial o robusto (mediana/MAD)
+    st.markdown("### Días con alerta en predicción del dólar")
+    col1, col2 = st.columns(2)
+    metodo_alerta = col1.selectbox(
+        "Método de umbral", alertas.METODOS,
+        format_func={"global": "Global (todo el horizonte)", "movil": "Ventana móvil",
+                     "exponencial": "Media exponencial", "robusto": "Robusto (mediana/MAD)"}.get
+    )
+    ventana_alerta = col2.number_input("Ventana (días)", min_value=5, max_value=250, value=60, step=5,
+                                       disabled=metodo_alerta == "global")
+
+    # 🔹 Índice de alertas precalculado (compartido entre sesiones)
+    posiciones_alerta = alertas.indice_alertas(artefactos.clave("predicciones", par), tabla_pred, metodo_alerta,
+                                               int(ventana_alerta))
+
+    # 🔹 Mostrar resumen
+    st.markdown(f"""
+    Se han detectado **{len(posiciones_alerta)} días** en los que el modelo muestra señales de baja fiabilidad o comportamiento anómalo.  
+    Estos días pueden requerir revisión adicional por parte del equipo analítico.
+    """)
+
+    # 🔹 Tabla paginada: solo se construye y se estiliza la página visible
+    filas_por_pagina = 50
+    paginas = max(1, -(-len(posiciones_alerta) // filas_por_pagina))
+    pagina = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, value=1) - 1
+    visibles = posiciones_alerta[pagina * filas_por_pagina:(pagina + 1) * filas_por_pagina]
+    # La variación respecto al día anterior no se guarda: se calcula solo para las filas visibles
+    df_alertas = tabla_pred.filas(visibles, ["DXY estimado", "yhat_lower", "yhat_upper", "Dispersión",
+                                             "Confianza", "Variación estimada"])
+
+    # 🔹 Mostrar tabla con resaltado vectorizado (todas las filas visibles son alertas)
+    estilo = (
+        df_alertas[[
+            "DXY estimado", "yhat_lower", "yhat_upper", "Dispersión", "Confianza", "Variación estimada"
+        ]].style
+        .format({
+            "DXY estimado": "{:.2f}",
+            "yhat_lower": "{:.2f}",
+            "yhat_upper": "{:.2f}",
+            "Dispersión": "{:.2f}",
+            "Confianza": "{:.2f}",
+            "Variación estimada": "{:+.2f}"
+        })
+        .set_properties(**{"background-color": "#ffcccc"})  # Rojo claro
+    )
+    with tiempos.medir("styler:alertas"):
+        st.dataframe(estilo)
+
+
+dias_alerta()
+
+# 🔹 Comparativa del par: datos reales frente a predichos
+tabla_comparativa = datos.obtener("comparativa", par)
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:alertas_reales")
+def alertas_reales():
+    # 🔹 Detector online sobre el error y la variación real; al crecer la comparativa solo se procesan los días nuevos
+    st.markdown("### Alertas sobre datos reales frente a predichos")
+    posiciones_reales = alertas.monitor_para(artefactos.clave("comparativa", par), tabla_comparativa)
+    st.markdown(f"""
+    En **{len(posiciones_reales)} de {len(tabla_comparativa)} días** de la comparativa, el error del modelo o la variación real del dólar superaron su umbral exponencial.  
+    Se muestran las más recientes.
+    """)
+    recientes = posiciones_reales[::-1][:20]
+    if len(recientes):
+        df_reales = tabla_comparativa.filas(recientes, ["DXY real", "DXY estimado", "Error absoluto"])
+        st.dataframe(df_reales.style.format("{:.2f}").set_properties(**{"background-color": "#ffcccc"}))
+
+
+alertas_reales()
+
+# 🔹 Explicación para audiencia no técnica
+st.markdown("###  ¿Qué significa una alerta?")
+st.markdown("""
+Una alerta se genera cuando el modelo muestra alguno de estos comportamientos:
+- **Alta dispersión**: el rango entre la predicción inferior y superior es demasiado amplio, lo que indica baja confianza.
+- **Variación abrupta**: el valor estimado del dólar cambia bruscamente respecto al día anterior, lo que puede reflejar sensibilidad excesiva o ruido en los datos.
+
+Las filas resaltadas en rojo indican días que requieren especial atención.  
+No significa que el modelo esté fallando, pero sí que conviene revisar el contexto económico de esos días antes de tomar decisiones basadas en esas predicciones.
+""")
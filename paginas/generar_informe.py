@@ -0,0 +1,93 @@
+import pandas as pd
+import streamlit as st
+
+import artefactos
+import datos
+import escenarios
+import informe
+import modelos
+import tiempos
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:informe")
+def generar_informe():
+    # 🔹 Selector de rango de fechas
+    st.markdown("### Generar informe de predicción")
+    datos_informe = st.radio("Datos del informe", ["Predicción (escenario neutro)", "Todos los escenarios"],
+                             horizontal=True)
+    nombre_informe = "predicciones" if datos_informe.startswith("Predicción") else "escenarios"
+    par = st.session_state.get("par")  # par de divisas de la barra lateral (None = DXY)
+    tabla_informe = datos.obtener(nombre_informe, par)
+    fecha_inicio = st.date_input("Fecha inicial", value=pd.to_datetime("2025-09-10"))
+    fecha_fin = st.date_input("Fecha final", value=pd.to_datetime("2025-09-18"))
+
+    # 🔹 Convertir fechas
+    fecha_inicio = pd.to_datetime(fecha_inicio)
+    fecha_fin = pd.to_datetime(fecha_fin)
+
+    # 🔹 Límites del rango por búsqueda binaria y medias por sumas acumuladas (coste constante)
+    inicio_rango, fin_rango = tabla_informe.limites(fecha_inicio, fecha_fin)
+    medias = informe.sumas_para(artefactos.clave(nombre_informe, par), tabla_informe).medias(fecha_inicio, fecha_fin)
+
+    if fin_rango == inicio_rango:
+        st.warning("⚠️ No hay predicciones disponibles en ese rango.")
+    else:
+        # 🔹 Mostrar tabla resumen (paginada)
+        st.markdown("###  Informe de predicción")
+        filas_por_pagina = 100
+        paginas = -(-(fin_rango - inicio_rango) // filas_por_pagina)
+        pagina = 0
+        if paginas > 1:
+            pagina = st.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, value=1,
+                                     key="pagina_informe") - 1
+        desde = inicio_rango + pagina * filas_por_pagina
+        df_pagina = tabla_informe.filas(slice(desde, min(desde + filas_por_pagina, fin_rango)))
+        if par is None and modelos.disponible():
+            # Una sola inferencia para todas las fechas de la página
+            df_pagina = df_pagina.join(modelos.recomendaciones(df_pagina.index)[["Probabilidad cambio", "Acción"]])
+        with tiempos.medir("styler:informe"):
+            st.dataframe(df_pagina.style.format(
+                {c: "{:.2f}" for c in df_pagina.select_dtypes(include="number").columns}
+            ))
+
+        # 🔹 Métricas agregadas
+        st.markdown("###  Métricas del periodo seleccionado")
+        if nombre_informe == "predicciones":
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Valor medio estimado", f"{medias['DXY estimado']:.2f}")
+            col2.metric("Confianza media", f"{medias['Confianza']:.2f}")
+            col3.metric("Dispersión media", f"{medias['Dispersión']:.2f}")
+        else:
+            nombres_informe = escenarios.nombres(tabla_informe.columnas)
+            columnas = st.columns(min(len(nombres_informe), 4))
+            for i, nombre in enumerate(nombres_informe):
+                columnas[i % len(columnas)].metric(f"Media escenario {nombre}", f"{medias['DXY_' + nombre]:.2f}")
+            col1, col2 = st.columns(2)
+            col1.metric("Confianza media", f"{medias['Confianza']:.2f}")
+            col2.metric("Dispersión media", f"{medias['Dispersión']:.2f}")
+
+        # 🔹 Descargas: se generan al pulsar, bloque a bloque desde la tabla (bytes en memoria)
+        sufijo = f"{fecha_inicio:%Y%m%d}_{fecha_fin:%Y%m%d}"
+        col1, col2, col3 = st.columns(3)
+        col1.download_button("⬇️ CSV", data=lambda: informe.csv_a_fichero(tabla_informe, inicio_rango, fin_rango),
+                             file_name=f"informe_{nombre_informe}_{sufijo}.csv", mime="text/csv")
+        col2.download_button("⬇️ Excel", data=lambda: informe.xlsx_a_fichero(tabla_informe, inicio_rango, fin_rango),
+                             file_name=f"informe_{nombre_informe}_{sufijo}.xlsx",
+                             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        col3.download_button("⬇️ Resumen PDF", data=lambda: informe.pdf_a_fichero(medias, fecha_inicio, fecha_fin),
+                             file_name=f"informe_{nombre_informe}_{sufijo}.pdf", mime="application/pdf")
+
+        # 🔹 Explicación para audiencia no técnica
+        st.markdown("###  ¿Cómo interpretar este informe?")
+        st.markdown("""
+        Este informe muestra las estimaciones del valor del dólar (DXY) para el periodo seleccionado.  
+        - El **valor medio estimado** representa la tendencia central del dólar en ese intervalo.  
+        - La **confianza media** indica la estabilidad del modelo: valores altos sugieren predicciones más fiables.  
+        - La **dispersión media** refleja la amplitud del rango de incertidumbre: cuanto menor, más precisa es la estimación.
+
+        Este tipo de informe puede utilizarse para planificación financiera, análisis de riesgo o validación de escenarios futuros.
+        """)
+
+
+generar_informe()
@@ -0,0 +1,49 @@
+import streamlit as st
+
+st.markdown("##  Metodología del modelo de predicción USD/EUR")
+
+st.markdown("""
+Este modelo ha sido desarrollado por el departamento de datos del **Grupo Procurval** con el objetivo de anticipar el comportamiento del dólar frente al euro (USD/EUR) utilizando el índice DXY como referencia.
+
+###  Datos utilizados
+- **Histórico del índice DXY** desde 2010 hasta la actualidad
+- **Variables macroeconómicas** como:
+  - Índice de volatilidad (**VIX**)
+  - Inflación en EE.UU. (**Inflacion_USA**)
+  - Tasa de interés de la Reserva Federal (**Tasa_FED**)
+- Datos extraídos de fuentes oficiales como **FRED**, **Yahoo Finance** y bases internas del grupo
+
+### Técnicas aplicadas
+- **Modelado temporal con Prophet** para estimar el valor futuro del dólar
+- **Clasificación con Random Forest** para evaluar decisiones operativas
+- **Simulación de escenarios** (positivo, negativo, neutro) para análisis estratégico
+- **Evaluación con métricas financieras** como MAE, RMSE, MAPE y dispersión
+
+### Limitaciones del modelo
+- Las predicciones se basan en condiciones macroeconómicas estimadas; eventos inesperados (geopolíticos, financieros) pueden alterar los resultados
+- El modelo no sustituye el juicio experto, sino que lo complementa
+- La confianza del modelo varía según la dispersión del intervalo de predicción
+
+###  Recomendaciones de uso
+- Utilizar el modelo como **herramienta de apoyo** para decisiones tácticas y estratégicas
+- Revisar los días con **alerta** antes de ejecutar decisiones sensibles
+- Consultar los escenarios alternativos para evaluar riesgos y oportunidades
+
+---
+
+## Cierre del proyecto
+
+Este proyecto ha sido diseñado para ofrecer una solución predictiva robusta, transparente y adaptable al entorno actual.  
+El modelo permite anticipar el comportamiento del dólar con fiabilidad y flexibilidad.
+
+**Cristina Puertas**
+**Departamento de Data – Grupo Procourval**
+            cpuertas@gpsc.es
+---
+
+###  Gracias por utilizar esta app
+
+Esta aplicación está en constante evolución. Si tienes sugerencias, mejoras o nuevas variables que se necesiten incorporar dispone de un repositorio en gitHub para gestionar incidencias y propuestas de mejora.
+https://github.com/cpuertas-gpsc/Cambio-divisas
+            **Grupo Procourval – Departamento de Datos**
+""")
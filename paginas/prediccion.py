@@ -0,0 +1,104 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import datos
+import modelos
+import tiempos
+
+# 🔹 Par de divisas elegido en la barra lateral (None = DXY)
+par = st.session_state.get("par")
+
+# 🔹 Cargar predicciones futuras (compartidas entre sesiones)
+tabla_pred = datos.obtener("predicciones", par)
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:prediccion")
+def prediccion():
+    # 🔹 Selector de fecha
+    st.markdown("###  Selecciona una fecha para consultar la predicción del dólar")
+    fecha_seleccionada = st.date_input(
+        "Fecha de predicción",
+        value=tabla_pred.inicio,
+        min_value=tabla_pred.inicio,
+        max_value=tabla_pred.fin
+    )
+
+    # 🔹 Convertir fecha seleccionada a Timestamp
+    fecha_seleccionada = pd.to_datetime(fecha_seleccionada)
+
+    # 🔹 Búsqueda binaria de la predicción para esa fecha
+    fila = tabla_pred.buscar(fecha_seleccionada)
+    if fila is None:
+        st.warning("⚠️ No hay predicción disponible para esa fecha. Intenta con un día laborable.")
+    else:
+        valor_estimado = fila["DXY estimado"]
+        inferior = fila["yhat_lower"]
+        superior = fila["yhat_upper"]
+        confianza = fila["Confianza"]
+
+        # 🔹 Mostrar métricas
+        st.markdown(f"### Predicción para {fecha_seleccionada.strftime('%d/%m/%Y')}")
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Valor estimado (DXY)", f"{valor_estimado:.2f}")
+        col2.metric("Rango de confianza", f"{inferior:.2f} – {superior:.2f}")
+        col3.metric("Confianza del modelo", f"{confianza:.2f}")
+
+        # 🔹 Recomendación operativa del clasificador (cargado una vez por proceso desde el registro)
+        if par is not None:
+            st.caption("El clasificador de decisiones solo está entrenado para el DXY.")
+        elif modelos.disponible():
+            recomendacion = modelos.recomendaciones([fecha_seleccionada]).iloc[0]
+            st.info(f"Acción recomendada: **{recomendacion['Acción']}** "
+                    f"(probabilidad de cambio {recomendacion['Probabilidad cambio']:.0%}, "
+                    f"modelo {modelos.version_actual()})")
+        else:
+            st.caption("Recomendación no disponible: faltan " + ", ".join(modelos.faltantes()))
+
+        # 🔹 Gráfico interactivo con Plotly
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=[fecha_seleccionada], y=[valor_estimado],
+            mode='markers', name='Estimación central',
+            marker=dict(color="#003366", size=12)
+        ))
+        fig.add_trace(go.Scatter(
+            x=[fecha_seleccionada, fecha_seleccionada],
+            y=[inferior, superior],
+            mode='lines', name='Intervalo de confianza',
+            line=dict(color='gray', width=2, dash='dot')
+        ))
+        fig.update_layout(
+            title="Estimación del dólar con intervalo de confianza",
+            xaxis_title="Fecha",
+            yaxis_title="Índice DXY",
+            height=400,
+            showlegend=True,
+            annotations=[
+                dict(
+                    text="Esta estimación representa el escenario neutro del modelo. En versiones anteriores se mostraban también los escenarios positivo y negativo, que encapsulaban el valor del dólar dentro de un rango de confianza.",
+                    xref="paper", yref="paper",
+                    x=0, y=-0.3, showarrow=False,
+                    font=dict(size=12, color="gray")
+                )
+            ]
+        )
+        with tiempos.medir("grafico:prediccion"):
+            st.plotly_chart(fig, use_container_width=True)
+
+        # 🔹 Explicación para audiencia no técnica
+        st.markdown("### ¿Cómo interpretar esta predicción?")
+        st.markdown("""
+        Esta estimación se basa en un modelo estadístico que incorpora variables macroeconómicas como:
+        - **VIX**: índice de volatilidad del mercado
+        - **Inflación en EE.UU.**
+        - **Tasa de interés de la Reserva Federal
+
+        El modelo calcula un valor central para el dólar (DXY) y un **rango de confianza** que representa la posible variación esperada.  
+        Cuanto más estrecho sea ese rango, mayor es la **confianza** del modelo en su predicción.  
+        Esta herramienta permite anticipar el comportamiento del dólar en fechas futuras, lo que puede ser útil para planificación financiera, cobertura de riesgo o toma de decisiones estratégicas.
+        """)
+
+
+prediccion()
@@ -0,0 +1,80 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import datos
+import graficos
+import simulador
+import tiempos
+
+# 🔹 Par de divisas elegido en la barra lateral (None = DXY)
+par = st.session_state.get("par")
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:que_pasaria")
+def que_pasaria():
+    st.markdown("###  ¿Qué pasaría si…? Predicción del dólar con tus propios valores macro")
+    if par is not None:
+        st.caption("El simulador solo está disponible para el modelo del DXY.")
+        return
+    if not simulador.disponible():
+        st.info("Para usar el simulador hace falta un modelo publicado: ejecuta `python reentrenamiento.py`.")
+        return
+
+    # 🔹 Valores de partida: los promedios con los que se calculó la tabla de predicciones
+    tabla_pred = datos.obtener("predicciones")
+    base = simulador.base()
+    col1, col2, col3 = st.columns(3)
+    valores = {
+        "VIX": col1.number_input("VIX", min_value=0.0, value=round(base.get("VIX", 18.5), 1),
+                                 step=simulador.PASOS["VIX"]),
+        "Inflacion_USA": col2.number_input("Inflación USA (IPC)", min_value=0.0,
+                                           value=round(base.get("Inflacion_USA", 250.0), 1),
+                                           step=simulador.PASOS["Inflacion_USA"]),
+        "Tasa_FED": col3.number_input("Tasa FED (%)", min_value=0.0, value=round(base.get("Tasa_FED", 2.0), 2),
+                                      step=simulador.PASOS["Tasa_FED"]),
+    }
+    rango = st.date_input(
+        "Periodo",
+        value=(tabla_pred.inicio, min(tabla_pred.fin, tabla_pred.inicio + pd.DateOffset(months=6))),
+        min_value=tabla_pred.inicio,
+        max_value=tabla_pred.fin
+    )
+    if len(rango) != 2:
+        st.warning("⚠️ Selecciona la fecha de inicio y la de fin.")
+        return
+
+    resultado, cuantizados, acierto, ms = simulador.predecir(valores, *rango)
+    if resultado.empty:
+        st.warning("⚠️ No hay días laborables en el periodo seleccionado.")
+        return
+    neutro = tabla_pred.rango(*rango)["DXY estimado"]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("DXY medio previsto", f"{resultado['DXY estimado'].mean():.2f}",
+                delta=f"{resultado['DXY estimado'].mean() - neutro.mean():+.2f} frente al neutro")
+    col2.metric("Rango de confianza medio",
+                f"{resultado['yhat_lower'].mean():.2f} – {resultado['yhat_upper'].mean():.2f}")
+    col3.metric("DXY al final del periodo", f"{resultado['DXY estimado'].iloc[-1]:.2f}")
+    st.caption(f"Regresores usados: VIX {cuantizados['VIX']:g}, IPC {cuantizados['Inflacion_USA']:g}, "
+               f"FED {cuantizados['Tasa_FED']:g} · {len(resultado)} días · {ms:.1f} ms "
+               f"({'caché compartida' if acierto else 'calculado'})")
+
+    # 🔹 Gráfico: hipótesis del usuario frente al escenario neutro publicado
+    fig = go.Figure()
+    fig.add_trace(graficos.traza(resultado.index, resultado["yhat_upper"], mode="lines",
+                                 line=dict(width=0), showlegend=False, hoverinfo="skip"))
+    fig.add_trace(graficos.traza(resultado.index, resultado["yhat_lower"], mode="lines", fill="tonexty",
+                                 fillcolor="rgba(0, 51, 102, 0.15)", line=dict(width=0),
+                                 name="Intervalo de confianza"))
+    fig.add_trace(graficos.traza(resultado.index, resultado["DXY estimado"], mode="lines",
+                                 name="Tu hipótesis", line=dict(color="#003366", width=2)))
+    fig.add_trace(graficos.traza(neutro.index, neutro, mode="lines", name="Escenario neutro",
+                                 line=dict(color="gray", dash="dot")))
+    fig.update_layout(xaxis_title="Fecha", yaxis_title="Índice DXY", height=420)
+    with tiempos.medir("grafico:que_pasaria"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+que_pasaria()
@@ -0,0 +1,91 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import artefactos
+import datos
+import graficos
+import precision
+import tiempos
+
+# 🔹 Par de divisas elegido en la barra lateral (None = DXY)
+par = st.session_state.get("par")
+
+# 🔹 Cargar comparativa generada desde Jupyter (formato columnar mapeado en memoria)
+tabla_comparativa = datos.obtener("comparativa", par)
+
+# 🔹 Métricas clave desde el cubo de precisión precalculado (sumas acumuladas)
+cubo = precision.cubo_para(artefactos.clave("comparativa", par), tabla_comparativa)
+with tiempos.medir("metricas:resumen"):
+    resumen = cubo.consultar()
+mae = resumen["mae"]
+rmse = resumen["rmse"]
+mape = resumen["mape"]
+bias = resumen["sesgo"]
+direccion_correcta = resumen["porcentaje_acierto"]
+
+# 🔹 Resumen ejecutivo para audiencia no técnica
+st.markdown("###  Resumen del rendimiento del modelo")
+st.markdown(f"""
+Durante el periodo analizado, el modelo logró una precisión notable al estimar el valor del dólar frente a una cesta de divisas (índice DXY).  
+- El **error medio absoluto** fue de **{mae:.2f} puntos**, lo que indica una desviación promedio muy baja.  
+- El **MAPE**, que mide el error relativo, se situó en **{mape:.2f}%**, lo que es aceptable para entornos financieros.  
+- El modelo acertó la **dirección del movimiento** del dólar en un **{direccion_correcta:.2f}%** de los días, lo que lo hace útil para decisiones tácticas.  
+- La **confianza media** del modelo fue de **{resumen['confianza_media']:.2f}**, basada en la dispersión de Prophet.
+
+En resumen, el modelo muestra un comportamiento estable y fiable, especialmente en escenarios neutros.
+""")
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:resumen")
+def grafico_comparativo():
+    # 🔹 Rango visible: la pirámide de detalle devuelve como mucho graficos.PUNTOS puntos por serie
+    rango = st.slider(
+        "Periodo visible",
+        min_value=tabla_comparativa.inicio.to_pydatetime(),
+        max_value=tabla_comparativa.fin.to_pydatetime(),
+        value=(tabla_comparativa.inicio.to_pydatetime(), tabla_comparativa.fin.to_pydatetime()),
+        format="MM/YYYY"
+    )
+    series = graficos.piramide_para(
+        artefactos.clave("comparativa", par), tabla_comparativa, ["DXY real", "DXY estimado"]
+    ).consultar(*rango)
+
+    # 🔹 Gráfico Plotly comparativo (Scattergl si el rango sigue teniendo muchos puntos)
+    fig = go.Figure()
+
+    fig.add_trace(graficos.traza(
+        *series["DXY real"],
+        mode='lines', name='DXY real',
+        line=dict(color='black', width=2)
+    ))
+
+    fig.add_trace(graficos.traza(
+        *series["DXY estimado"],
+        mode='lines', name='DXY estimado (escenario neutro)',
+        line=dict(color='#003366', dash='dash')
+    ))
+
+    fig.update_layout(
+        title=" Evolución del dólar – Real vs Modelo",
+        xaxis_title="Fecha",
+        xaxis_type="date",
+        yaxis_title="Índice DXY",
+        legend=dict(x=0, y=1),
+        margin=dict(l=40, r=40, t=60, b=60),
+        height=500,
+        annotations=[
+            dict(
+                text="Esta gráfica representa el escenario neutro del modelo. En versiones anteriores se mostraban también los escenarios positivo y negativo, que encapsulaban el valor estimado del dólar dentro de un rango de confianza.",
+                xref="paper", yref="paper",
+                x=0, y=-0.3, showarrow=False,
+                font=dict(size=12, color="gray")
+            )
+        ]
+    )
+
+    with tiempos.medir("grafico:resumen"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+grafico_comparativo()
@@ -0,0 +1,135 @@
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+import artefactos
+import datos
+import escenarios
+import graficos
+import tiempos
+
+# 🔹 Par de divisas elegido en la barra lateral (None = DXY)
+par = st.session_state.get("par")
+
+# 🔹 Cargar archivo con escenarios
+tabla_escenarios = datos.obtener("escenarios", par)
+
+
+@st.fragment
+@tiempos.cronometrar("fragmento:simulacion")
+def simulacion():
+    # 🔹 Selector de fecha
+    st.markdown("###  Simulación de escenarios para el dólar")
+    fecha_simulada = st.date_input(
+        "Selecciona una fecha",
+        value=tabla_escenarios.inicio,
+        min_value=tabla_escenarios.inicio,
+        max_value=tabla_escenarios.fin
+    )
+
+    fecha_simulada = pd.to_datetime(fecha_simulada)
+
+    # 🔹 Escenarios disponibles en el almacén (columnas DXY_<escenario>)
+    nombres_escenarios = escenarios.nombres(tabla_escenarios.columnas)
+    seleccion = st.multiselect(
+        "Escenarios a comparar",
+        nombres_escenarios,
+        default=[n for n in ("neutro", "positivo", "negativo") if n in nombres_escenarios]
+    )
+    colores_escenarios = {"neutro": "#003366", "positivo": "green", "negativo": "red"}
+
+    fila = tabla_escenarios.buscar(fecha_simulada)
+    if fila is None:
+        st.warning("⚠️ No hay datos disponibles para esa fecha.")
+    elif not seleccion:
+        st.warning("⚠️ Selecciona al menos un escenario.")
+    else:
+        inferior = fila["yhat_lower"]
+        superior = fila["yhat_upper"]
+        confianza = fila["Confianza"]
+
+        # 🔹 Mostrar métricas
+        st.markdown(f"### Predicciones para {fecha_simulada.strftime('%d/%m/%Y')}")
+        columnas = st.columns(min(len(seleccion), 4))
+        for i, nombre in enumerate(seleccion):
+            columnas[i % len(columnas)].metric(f"Escenario {nombre}", f"{fila['DXY_' + nombre]:.2f}")
+
+        # 🔹 Gráfico interactivo
+        fig = go.Figure()
+        for nombre in seleccion:
+            fig.add_trace(go.Scatter(
+                x=[fecha_simulada], y=[fila["DXY_" + nombre]],
+                mode='markers', name=nombre.capitalize(),
+                marker=dict(color=colores_escenarios.get(nombre), size=12)
+            ))
+        fig.add_trace(go.Scatter(
+            x=[fecha_simulada, fecha_simulada],
+            y=[inferior, superior],
+            mode='lines', name='Intervalo de confianza (neutro)',
+            line=dict(color='gray', width=2, dash='dot')
+        ))
+        fig.update_layout(
+            title="Simulación de escenarios del dólar",
+            xaxis_title="Fecha",
+            yaxis_title="Índice DXY",
+            height=450,
+            showlegend=True,
+            annotations=[
+                dict(
+                    text="El escenario neutro representa condiciones macroeconómicas estables. Los escenarios positivo y negativo encapsulan el valor del dólar bajo condiciones favorables o adversas, respectivamente.",
+                    xref="paper", yref="paper",
+                    x=0, y=-0.3, showarrow=False,
+                    font=dict(size=12, color="gray")
+                )
+            ]
+        )
+        with tiempos.medir("grafico:escenarios"):
+            st.plotly_chart(fig, use_container_width=True)
+
+        # 🔹 Abanico Monte Carlo (percentiles P5–P95 de trayectorias simuladas de los regresores)
+        if datos.disponible("abanico", par):
+            # Las bandas comparten las posiciones elegidas sobre la mediana para rellenarse entre sí
+            abanico = graficos.piramide_para(
+                artefactos.clave("abanico", par), datos.obtener("abanico", par), ["P5", "P25", "P50", "P75", "P95"],
+                guia="P50"
+            ).consultar()
+            fig = go.Figure()
+            for inferior_q, superior_q, opacidad in (("P5", "P95", 0.15), ("P25", "P75", 0.3)):
+                fig.add_trace(graficos.traza(
+                    *abanico[superior_q],
+                    mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'
+                ))
+                fig.add_trace(graficos.traza(
+                    *abanico[inferior_q],
+                    mode='lines', line=dict(width=0), fill='tonexty',
+                    fillcolor=f"rgba(0, 51, 102, {opacidad})", name=f"{inferior_q}–{superior_q}"
+                ))
+            fig.add_trace(graficos.traza(
+                *abanico["P50"],
+                mode='lines', name='Mediana (P50)',
+                line=dict(color='#003366', width=2)
+            ))
+            fig.add_vline(x=fecha_simulada, line=dict(color='gray', dash='dot'))
+            fig.update_layout(
+                title="Abanico de simulación Monte Carlo del dólar",
+                xaxis_title="Fecha",
+                xaxis_type="date",
+                yaxis_title="Índice DXY",
+                height=450,
+                showlegend=True
+            )
+            with tiempos.medir("grafico:abanico"):
+                st.plotly_chart(fig, use_container_width=True)
+
+        # 🔹 Explicación para audiencia no técnica
+        st.markdown("###  ¿Qué representan estos escenarios?")
+        st.markdown("""
+        - **Escenario neutro**: se basa en condiciones macroeconómicas promedio, sin shocks ni cambios bruscos.
+        - **Escenario positivo**: simula un entorno favorable, con baja volatilidad, inflación controlada y política monetaria estable.
+        - **Escenario negativo**: representa un contexto adverso, con alta volatilidad, inflación elevada o subidas agresivas de tipos.
+
+        Estos escenarios permiten anticipar cómo podría comportarse el dólar en distintos contextos, lo que es útil para análisis de riesgo, cobertura financiera y toma de decisiones estratégicas.
+        """)
+
+
+simulacion()
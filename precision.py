@@ -0,0 +1,218 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+import artefactos
+import tiempos
+
+# 🔹 Umbrales del diagnóstico (mismos que la sección de julio)
+UMBRAL_ALTO = 80
+UMBRAL_MODERADO = 65
+CONFIANZA_ALTA = 0.15
+
+CAMPOS = ["dias", "dias_direccion", "aciertos", "error_abs", "error_cuad", "error_pct", "sesgo", "confianza"]
+
+
+def _diarios(real, pred, confianza, real_previo=np.nan, pred_previo=np.nan):
+    # Acierto de dirección: el modelo anticipa el signo de la variación del DXY respecto al día anterior
+    dir_real = np.sign(np.diff(real, prepend=real_previo))
+    dir_pred = np.sign(np.diff(pred, prepend=pred_previo))
+    con_direccion = ~np.isnan(dir_real) & ~np.isnan(dir_pred)
+    error = pred - real
+    return {
+        "dias": np.ones(len(real)),
+        "dias_direccion": con_direccion.astype(float),
+        "aciertos": (con_direccion & (dir_real == dir_pred)).astype(float),
+        "error_abs": np.abs(error),
+        "error_cuad": error ** 2,
+        "error_pct": np.abs(error / real) * 100,
+        "sesgo": error,
+        "confianza": confianza,
+    }
+
+
+class CuboPrecision:
+    """Sumas acumuladas por día (y agregados por mes y año) para diagnosticar cualquier periodo en O(1)."""
+
+    def __init__(self, fechas, real, pred, confianza):
+        self.fechas = np.asarray(fechas, dtype="datetime64[D]")
+        self._real = np.asarray(real, dtype=float)
+        self._pred = np.asarray(pred, dtype=float)
+        diarios = _diarios(self._real, self._pred, np.asarray(confianza, dtype=float))
+        self.acumulados = {c: np.concatenate([[0.0], np.cumsum(diarios[c])]) for c in CAMPOS}
+        self.por_mes = self._agregar(diarios, self.fechas, "M")
+        self.por_año = self._agregar(diarios, self.fechas, "Y")
+
+    @classmethod
+    def desde_comparativa(cls, df):
+        return cls(df.index.values, df["DXY real"].to_numpy(), df["DXY estimado"].to_numpy(),
+                   df["Confianza"].to_numpy())
+
+    @staticmethod
+    def _agregar(diarios, fechas, unidad):
+        periodos = fechas.astype(f"datetime64[{unidad}]")
+        return pd.DataFrame(diarios).groupby(periodos).sum()
+
+    # 🔹 Añadir filas nuevas de la comparativa sin recalcular el histórico
+    def añadir(self, fechas, real, pred, confianza):
+        fechas = np.asarray(fechas, dtype="datetime64[D]")
+        real, pred = np.asarray(real, dtype=float), np.asarray(pred, dtype=float)
+        diarios = _diarios(real, pred, np.asarray(confianza, dtype=float),
+                           self._real[-1] if len(self._real) else np.nan,
+                           self._pred[-1] if len(self._pred) else np.nan)
+        for c in CAMPOS:
+            self.acumulados[c] = np.concatenate([self.acumulados[c], self.acumulados[c][-1] + np.cumsum(diarios[c])])
+        self.fechas = np.concatenate([self.fechas, fechas])
+        self._real = np.concatenate([self._real, real])
+        self._pred = np.concatenate([self._pred, pred])
+        for atributo, unidad in (("por_mes", "M"), ("por_año", "Y")):
+            nuevos = self._agregar(diarios, fechas, unidad)
+            setattr(self, atributo, getattr(self, atributo).add(nuevos, fill_value=0))
+
+    def meses(self):
+        return [pd.Period(m, "M") for m in self.por_mes.index]
+
+    def limites(self, inicio, fin):
+        i = int(np.searchsorted(self.fechas, np.datetime64(pd.Timestamp(inicio), "D"), side="left"))
+        j = int(np.searchsorted(self.fechas, np.datetime64(pd.Timestamp(fin), "D"), side="right"))
+        return i, max(i, j)
+
+    # 🔹 Métricas de un periodo cualquiera: diferencia de dos sumas acumuladas por campo
+    def consultar(self, inicio=None, fin=None):
+        i, j = (0, len(self.fechas)) if inicio is None else self.limites(inicio, fin)
+        s = {c: self.acumulados[c][j] - self.acumulados[c][i] for c in CAMPOS}
+        return self._metricas(s)
+
+    def consultar_mes(self, mes):
+        clave = np.datetime64(pd.Period(mes, "M").start_time, "M")
+        if clave not in self.por_mes.index:
+            return {"dias": 0}
+        return self._metricas(self.por_mes.loc[clave].to_dict())
+
+    @staticmethod
+    def _metricas(s):
+        dias = s["dias"]
+        if dias == 0:
+            return {"dias": 0}
+        aciertos = s["aciertos"]
+        errores = s["dias_direccion"] - aciertos
+        total = s["dias_direccion"]
+        return {
+            "dias": int(dias),
+            "aciertos": int(aciertos),
+            "errores": int(errores),
+            # Sin pares de días consecutivos (p. ej. un solo día) no hay acierto de dirección que medir
+            "porcentaje_acierto": aciertos / total * 100 if total else None,
+            "porcentaje_error": errores / total * 100 if total else None,
+            "confianza_media": s["confianza"] / dias,
+            "mae": s["error_abs"] / dias,
+            "rmse": np.sqrt(s["error_cuad"] / dias),
+            "mape": s["error_pct"] / dias,
+            "sesgo": s["sesgo"] / dias,
+        }
+
+
+class RegistroDecisiones:
+    """Sumas acumuladas de la columna "Acierto" del registro de decisiones (comparativa de julio).
+
+    Acierto de decisión: la recomendación del modelo (cambiar / no cambiar) coincide con la decisión real
+    del día. Es el criterio del diagnóstico de julio y no equivale al acierto de dirección del cubo.
+    """
+
+    def __init__(self, fechas, aciertos, confianza):
+        self.fechas = np.asarray(fechas, dtype="datetime64[D]")
+        self.acumulados = {"decisiones": np.arange(len(self.fechas) + 1, dtype=float),
+                           "aciertos": np.concatenate([[0.0], np.cumsum(aciertos, dtype=float)]),
+                           "confianza": np.concatenate([[0.0], np.cumsum(confianza, dtype=float)])}
+
+    @classmethod
+    def desde_excel(cls, df):
+        df = df.sort_index()
+        return cls(df.index.values, (df["Acierto"] == "✔️").to_numpy(), df["Confianza"].to_numpy(dtype=float))
+
+    def meses(self):
+        return [pd.Period(m, "M") for m in np.unique(self.fechas.astype("datetime64[M]"))]
+
+    def consultar(self, inicio=None, fin=None):
+        if inicio is None:
+            i, j = 0, len(self.fechas)
+        else:
+            i = int(np.searchsorted(self.fechas, np.datetime64(pd.Timestamp(inicio), "D"), side="left"))
+            j = max(i, int(np.searchsorted(self.fechas, np.datetime64(pd.Timestamp(fin), "D"), side="right")))
+        s = {c: self.acumulados[c][j] - self.acumulados[c][i] for c in self.acumulados}
+        decisiones = int(s["decisiones"])
+        if decisiones == 0:
+            return {"decisiones": 0}
+        return {
+            "decisiones": decisiones,
+            "aciertos_decision": int(s["aciertos"]),
+            "errores_decision": decisiones - int(s["aciertos"]),
+            "porcentaje_decision": float(s["aciertos"] / decisiones * 100),
+            "confianza_decision": float(s["confianza"] / decisiones),
+        }
+
+    def consultar_mes(self, mes):
+        periodo = pd.Period(mes, "M")
+        return self.consultar(periodo.start_time, periodo.end_time)
+
+
+def fiabilidad(metricas):
+    # Si el periodo tiene decisiones registradas manda su tasa de acierto (criterio de julio: 17/22 -> moderada);
+    # si no, el acierto de dirección de la comparativa. None si el periodo no permite medir ninguno de los dos
+    if metricas.get("decisiones"):
+        acierto, confianza = metricas["porcentaje_decision"], metricas["confianza_decision"]
+    else:
+        acierto, confianza = metricas.get("porcentaje_acierto"), metricas.get("confianza_media")
+    if acierto is None:
+        return None
+    if acierto >= UMBRAL_ALTO and confianza >= CONFIANZA_ALTA:
+        return "alta"
+    if acierto >= UMBRAL_MODERADO:
+        return "moderada"
+    return "baja"
+
+
+# 🔹 Cubos compartidos por proceso, uno por artefacto (comparativa del DXY o de cada par);
+#   si la comparativa solo crece, se actualiza incrementalmente
+_cubos = {}  # nombre de artefacto -> (Tabla, CuboPrecision)
+_lock = threading.Lock()
+
+
+def cubo_para(nombre, tabla):
+    with _lock:
+        entrada = _cubos.get(nombre)
+        tiempos.acierto("cubo", entrada is not None and entrada[0] is tabla)
+        if entrada is not None and entrada[0] is tabla:
+            return entrada[1]
+        cubo = entrada[1] if entrada is not None else None
+        n = len(cubo.fechas) if cubo is not None else 0
+        extiende = (cubo is not None and 0 < n < len(tabla)
+                    and np.array_equal(tabla.fechas_de(slice(0, n)).astype("datetime64[D]"), cubo.fechas)
+                    and np.allclose(tabla.columna("DXY real", slice(0, n)), cubo._real, equal_nan=True)
+                    and np.allclose(tabla.columna("DXY estimado", slice(0, n)), cubo._pred, equal_nan=True))
+        if extiende:
+            nuevas = slice(n, None)
+            cubo.añadir(tabla.fechas_de(nuevas), tabla.columna("DXY real", nuevas),
+                        tabla.columna("DXY estimado", nuevas), tabla.columna("Confianza", nuevas))
+        else:
+            cubo = CuboPrecision.desde_comparativa(tabla.filas(columnas=["DXY real", "DXY estimado", "Confianza"]))
+        _cubos[nombre] = (tabla, cubo)
+        return cubo
+
+
+# 🔹 Registro de decisiones por proceso; se relee solo si cambia el Excel. Solo existe para el DXY
+_registro = (None, RegistroDecisiones([], [], []))
+
+
+def registro_decisiones(par=None):
+    global _registro
+    if par is not None or not artefactos.disponible("julio"):
+        return RegistroDecisiones([], [], [])
+    ruta = artefactos.fuente("julio")
+    firma = (ruta, os.stat(ruta).st_mtime_ns)
+    with _lock:
+        if _registro[0] != firma:
+            _registro = (firma, RegistroDecisiones.desde_excel(artefactos.leer_original("julio")))
+        return _registro[1]
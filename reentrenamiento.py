@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import artefactos
+import backtest
+import divisas
+import escenarios
+import ingesta
+import tiempos
+from escenarios import REGRESORES
+
+try:
+    import fcntl
+except ImportError:  # sin fcntl (Windows) no se impide lanzar dos trabajadores a la vez
+    fcntl = None
+
+# 🔹 Reentrenamiento programado del DXY fuera de la app: publica versiones en versiones/<versión>/
+#   y cambia el puntero versiones/ACTUAL de forma atómica cuando la nueva versión pasa la validación
+CADA_HORAS = float(os.environ.get("REENTRENAMIENTO_CADA_HORAS", "24"))
+DIAS_TEMPLADO = 30  # con hasta tantos días nuevos se parte de los parámetros del ajuste anterior
+CONSERVAR = 5  # versiones que se guardan (la vigente nunca se borra)
+MAPE_MAXIMO = 10.0  # % en la comparativa
+TOLERANCIA_MAPE = 0.25  # se rechaza si el MAPE empeora más de un 25 % respecto a la versión vigente
+SALTO_MAXIMO = 0.2  # la primera predicción no puede alejarse más de un 20 % del último DXY observado
+MODELO = "prophet.json"
+METADATOS = "version.json"
+
+
+def directorio(version):
+    return os.path.join(artefactos.DIRECTORIO_VERSIONES, version)
+
+
+def metadatos(version):
+    if version is None:
+        return None
+    try:
+        with open(os.path.join(directorio(version), METADATOS), encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+def versiones():
+    """Versiones publicadas, de la más antigua a la más reciente."""
+    if not os.path.isdir(artefactos.DIRECTORIO_VERSIONES):
+        return []
+    return sorted(v for v in os.listdir(artefactos.DIRECTORIO_VERSIONES)
+                  if not v.startswith(".") and os.path.exists(os.path.join(directorio(v), METADATOS)))
+
+
+# 🔹 Arranque templado: los parámetros del ajuste anterior son el punto de partida del optimizador
+def parametros_iniciales(model):
+    return {
+        **{nombre: float(model.params[nombre][0][0]) for nombre in ("k", "m", "sigma_obs")},
+        **{nombre: model.params[nombre][0] for nombre in ("delta", "beta")},
+    }
+
+
+def cargar_modelo(version):
+    from prophet.serialize import model_from_json
+
+    with open(os.path.join(directorio(version), MODELO), encoding="utf-8") as f:
+        return model_from_json(f.read())
+
+
+def validar(tablas, df_reg, previa=None):
+    """Lista de motivos para no publicar (vacía si la versión es válida)."""
+    problemas = []
+    for nombre, df in tablas.items():
+        numericas = df.select_dtypes(include="number").to_numpy()
+        if len(df) == 0:
+            problemas.append(f"{nombre}: tabla vacía")
+        elif not np.isfinite(numericas).all():
+            problemas.append(f"{nombre}: valores no finitos")
+    predicciones = tablas["predicciones"]
+    if ((predicciones["yhat_lower"] > predicciones["DXY estimado"])
+            | (predicciones["DXY estimado"] > predicciones["yhat_upper"])).any():
+        problemas.append("predicciones: estimación fuera de su intervalo")
+    ultimo = float(df_reg["y"].iloc[-1])
+    salto = abs(float(predicciones["DXY estimado"].iloc[0]) / ultimo - 1)
+    if salto > SALTO_MAXIMO:
+        problemas.append(f"predicciones: salto del {salto:.0%} respecto al último DXY ({ultimo:.2f})")
+    mape = float(tablas["comparativa"]["Error porcentual"].mean())
+    if mape > MAPE_MAXIMO:
+        problemas.append(f"comparativa: MAPE {mape:.2f} % > {MAPE_MAXIMO} %")
+    if previa is not None and previa.get("mape") and mape > previa["mape"] * (1 + TOLERANCIA_MAPE):
+        problemas.append(f"comparativa: MAPE {mape:.2f} % frente a {previa['mape']:.2f} % de {previa['version']}")
+    return problemas
+
+
+# 🔹 Publicación: todo se escribe en un directorio temporal que se renombra entero y después se cambia
+#   el puntero; una instancia de la app nunca ve una versión a medio escribir
+def publicar(tablas, model, info):
+    from prophet.serialize import model_to_json
+
+    os.makedirs(artefactos.DIRECTORIO_VERSIONES, exist_ok=True)
+    version = info["version"]
+    temporal = directorio(f".{version}.tmp")
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+    for nombre, df in tablas.items():
+        df.to_csv(os.path.join(temporal, artefactos.ARTEFACTOS[nombre]), index=False)
+        if artefactos.feather is not None:
+            df = artefactos.compactar(df.set_index("Fecha"))
+            artefactos.feather.write_feather(df.reset_index(), os.path.join(temporal, f"{nombre}.feather"),
+                                             compression="uncompressed", chunksize=max(len(df), 1))
+    with open(os.path.join(temporal, MODELO), "w", encoding="utf-8") as f:
+        f.write(model_to_json(model))
+    with open(os.path.join(temporal, METADATOS), "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    os.rename(temporal, directorio(version))
+
+    puntero = os.path.join(artefactos.DIRECTORIO_VERSIONES, artefactos.PUNTERO)
+    with open(puntero + ".tmp", "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(puntero + ".tmp", puntero)
+    return version
+
+
+def podar(conservar=CONSERVAR):
+    vigente = artefactos.version_actual()
+    antiguas = [v for v in versiones() if v != vigente]
+    antiguas = antiguas[:max(len(antiguas) - (conservar - 1), 0)]
+    for version in antiguas:
+        # Los feather abiertos por la app siguen siendo válidos tras borrarlos (mapas de memoria en POSIX)
+        shutil.rmtree(directorio(version), ignore_errors=True)
+    return antiguas
+
+
+def reentrenar(df_economico=None, forzar=False, frio=False, comparativa="backtest", config=None, procesos=None):
+    """Un ciclo de reentrenamiento; devuelve los metadatos con "estado" publicada, sin_cambios o rechazada."""
+    start = time.perf_counter()
+    config = config or {}
+    if df_economico is None:
+        df_economico = artefactos.leer_original("dataset").reset_index()
+    try:
+        df_reg = backtest.preparar(df_economico)
+    except ValueError as e:  # faltan regresores o ningún día está completo: no hay nada que ajustar
+        tiempos.contar("reentrenamiento:rechazada")
+        return {"estado": "rechazada", "problemas": [str(e)]}
+    previa = metadatos(artefactos.version_actual())
+    hasta = pd.Timestamp(previa["hasta"]) if previa else None
+    nuevos = int((df_reg["ds"] > hasta).sum()) if hasta is not None else len(df_reg)
+    if previa and not nuevos and not forzar:
+        return {**previa, "estado": "sin_cambios"}
+
+    # 🔹 Pocos días nuevos y misma configuración: arranque templado desde el ajuste vigente
+    init = None
+    if previa and not frio and nuevos <= DIAS_TEMPLADO and previa.get("config") == config:
+        try:
+            init = parametros_iniciales(cargar_modelo(previa["version"]))
+        except (OSError, ValueError, KeyError):
+            init = None
+    try:
+        model = divisas.ajustar(df_reg, config, init)
+    except Exception:
+        if init is None:
+            raise
+        init, model = None, divisas.ajustar(df_reg, config)  # el arranque templado no convergió
+
+    fechas = escenarios.fechas_futuras(inicio=df_reg["ds"].iloc[-1] + pd.offsets.BDay())
+    tablas = divisas.tablas(model, df_reg, fechas)
+    if comparativa == "backtest":
+        # Predicciones fuera de muestra; solo se ajustan las particiones nuevas (caché de backtest.py)
+        resultado, _ = backtest.backtest(df_economico, config=config, procesos=procesos)
+        tablas["comparativa"] = backtest.comparativa(resultado)
+
+    info = {
+        "version": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+        "anterior": previa["version"] if previa else None,
+        "arranque": "templado" if init is not None else "frio",
+        "config": config,
+        "filas": len(df_reg),
+        "nuevos": nuevos,
+        "desde": df_reg["ds"].iloc[0].strftime("%Y-%m-%d"),
+        "hasta": df_reg["ds"].iloc[-1].strftime("%Y-%m-%d"),
+        "comparativa": comparativa,
+        "mape": round(float(tablas["comparativa"]["Error porcentual"].mean()), 4),
+    }
+    # Base de las predicciones (promedio de cada regresor) y coeficientes lineales: simulador.py
+    # resuelve cualquier combinación de regresores sumando su efecto a la tabla de predicciones
+    coef = escenarios.coeficientes(model)
+    info["regresores"] = {r: {"base": float(df_reg[r].mean()), "coef": None if coef is None else float(c)}
+                          for r, c in zip(REGRESORES, coef if coef is not None else [None] * len(REGRESORES))}
+    problemas = validar(tablas, df_reg, previa)
+    info["segundos"] = round(time.perf_counter() - start, 2)
+    tiempos.registrar("reentrenamiento:ciclo", info["segundos"] * 1000)
+    if problemas:
+        tiempos.contar("reentrenamiento:rechazada")
+        return {**info, "estado": "rechazada", "problemas": problemas}
+    publicar(tablas, model, info)
+    tiempos.contar("reentrenamiento:publicada")
+    return {**info, "estado": "publicada", "podadas": podar()}
+
+
+def _bloquear():
+    if fcntl is None:
+        return None
+    os.makedirs(artefactos.DIRECTORIO_VERSIONES, exist_ok=True)
+    cerrojo = open(os.path.join(artefactos.DIRECTORIO_VERSIONES, ".bloqueo"), "w")
+    try:
+        fcntl.flock(cerrojo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        cerrojo.close()
+        sys.exit("❌ Ya hay otro reentrenamiento en marcha")
+    return cerrojo
+
+
+def _ciclo(args):
+    if not args.sin_ingesta:
+        # Insumos macro al día en cada ciclo: VIX, IPC y FEDFUNDS se descargan (Actualizador) antes de recomponer el dataset
+        try:
+            ingesta.refrescar_fuentes()
+            ingesta.actualizar()
+        except (RuntimeError, FileNotFoundError) as e:
+            print(f"❌ Ciclo rechazado: {e}")
+            return {"estado": "rechazada", "problemas": [str(e)]}
+    r = reentrenar(forzar=args.forzar, frio=args.frio, comparativa="ajuste" if args.ajuste else "backtest",
+                   procesos=args.procesos)
+    if r["estado"] == "publicada":
+        print(f"✅ Versión {r['version']} publicada (arranque {r['arranque']}, {r['nuevos']} días nuevos, "
+              f"MAPE {r['mape']:.2f} %, {r['segundos']} s)")
+    elif r["estado"] == "sin_cambios":
+        print(f"⏸ Sin datos nuevos desde {r['hasta']}; sigue vigente {r['version']}")
+    else:
+        print(f"❌ Versión rechazada: {'; '.join(r['problemas'])}")
+    return r
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reentrena el modelo del DXY y publica versiones de sus artefactos")
+    parser.add_argument("--cada", type=float, metavar="HORAS", nargs="?", const=CADA_HORAS,
+                        help=f"repetir el ciclo cada HORAS horas (por defecto {CADA_HORAS:g}); sin él, un solo ciclo")
+    parser.add_argument("--forzar", action="store_true", help="reentrenar aunque no haya días nuevos")
+    parser.add_argument("--frio", action="store_true", help="ajuste completo, sin partir del modelo vigente")
+    parser.add_argument("--ajuste", action="store_true",
+                        help="comparativa dentro de muestra en vez del backtest walk-forward")
+    parser.add_argument("--sin-ingesta", action="store_true", help="no actualizar antes el dataset económico")
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+    cerrojo = _bloquear()
+    if args.cada is None:
+        sys.exit(0 if _ciclo(args)["estado"] != "rechazada" else 1)
+    while True:
+        try:
+            _ciclo(args)
+        except Exception as e:  # un ciclo fallido no detiene al trabajador
+            print(f"❌ {type(e).__name__}: {e}")
+        time.sleep(args.cada * 3600)
@@ -0,0 +1,251 @@
+import argparse
+import json
+import sys
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+import artefactos
+import datos
+import divisas
+import escenarios
+import modelos
+import tiempos
+
+# 🔹 Servicio por lotes sin interfaz: solo lee los artefactos locales (predicciones, escenarios, abanico)
+HOST = "127.0.0.1"
+PUERTO = 8502
+BLOQUE = 1_000  # filas por fragmento de la respuesta JSON-lines
+COLUMNAS_PREDICCION = ["DXY estimado", "yhat_lower", "yhat_upper", "Dispersión", "Confianza"]
+CIFRAS_FLOAT32 = 7  # cifras significativas que conserva una columna guardada en float32
+
+
+def _lista(valor):
+    # Acepta listas JSON o cadenas separadas por comas (query string / CLI)
+    if valor is None:
+        return []
+    if isinstance(valor, str):
+        return [v.strip() for v in valor.split(",") if v.strip()]
+    # Cualquier otro tipo (número, objeto, lista de objetos) es un error de la petición: 400, no un 500
+    if isinstance(valor, list) and all(isinstance(v, (str, int, float)) for v in valor):
+        return valor
+    raise ValueError(f"Se esperaba una lista o una cadena separada por comas, no {json.dumps(valor)}")
+
+
+def _fechas(peticion, tabla):
+    fechas = _lista(peticion.get("fechas"))
+    if fechas:
+        try:
+            return pd.to_datetime(fechas).values.astype("datetime64[ns]")
+        except (ValueError, TypeError):
+            raise ValueError("Alguna de las fechas no es válida (formato AAAA-MM-DD)") from None
+    if peticion.get("inicio") or peticion.get("fin"):
+        i, j = tabla.limites(peticion.get("inicio") or tabla.inicio, peticion.get("fin") or tabla.fin)
+        return tabla.fechas_de(slice(i, j))
+    raise ValueError("Indica 'fechas' o un rango 'inicio'/'fin'")
+
+
+def _redondear(valores, cifras=CIFRAS_FLOAT32):
+    # Redondeo vectorizado a ``cifras`` significativas (los NaN y ceros se mantienen)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitud = np.floor(np.log10(np.abs(valores)))
+    escala = 10.0 ** (cifras - 1 - np.nan_to_num(magnitud, nan=0.0, neginf=0.0))
+    return np.round(valores * escala) / escala
+
+
+def _columnas(tabla, fechas, columnas, nombres=None):
+    # Una búsqueda binaria vectorizada por tabla; las fechas sin dato quedan a NaN
+    posiciones = tabla.posiciones(fechas)
+    valores = tabla.matriz(columnas, np.maximum(posiciones, 0))
+    valores[posiciones < 0] = np.nan
+    # Las columnas float32 se pasan a double al leerlas: sin redondear, el JSON arrastraría cifras espurias
+    #   (118.635383606 en lugar de 118.6354)
+    simples = [tabla.columna(c, slice(0, 1)).dtype == np.float32 for c in columnas]
+    valores[:, simples] = _redondear(valores[:, simples])
+    return pd.DataFrame(valores, columns=nombres or columnas), posiciones >= 0
+
+
+def consultar(peticion):
+    """Resuelve una petición por lotes y devuelve un DataFrame con una fila por fecha solicitada."""
+    par = peticion.get("par") or None
+    if par is not None and not datos.disponible("predicciones", par):
+        raise ValueError(f"Par sin artefactos publicados: {par} (disponibles: {', '.join(divisas.entrenados()) or 'ninguno'})")
+    tabla = datos.obtener("predicciones", par)
+    fechas = _fechas(peticion, tabla)
+    resultado, disponible = _columnas(tabla, fechas, COLUMNAS_PREDICCION)
+
+    nombres = _lista(peticion.get("escenarios"))
+    if nombres:
+        tabla_esc = datos.obtener("escenarios", par)
+        desconocidos = sorted(set(nombres) - set(escenarios.nombres(tabla_esc.columnas)))
+        if desconocidos:
+            raise ValueError(f"Escenarios desconocidos: {', '.join(desconocidos)}")
+        extra, _ = _columnas(tabla_esc, fechas, [f"DXY_{n}" for n in nombres])
+        resultado = pd.concat([resultado, extra], axis=1)
+
+    cuantiles = _lista(peticion.get("cuantiles"))
+    if cuantiles:
+        if not datos.disponible("abanico", par):
+            raise ValueError("El abanico de cuantiles no está generado (montecarlo.py)")
+        tabla_ab = datos.obtener("abanico", par)
+        columnas = [f"P{int(float(c))}" for c in cuantiles]
+        desconocidos = sorted(set(columnas) - set(tabla_ab.columnas))
+        if desconocidos:
+            raise ValueError(f"Cuantiles no disponibles: {', '.join(desconocidos)}")
+        extra, _ = _columnas(tabla_ab, fechas, columnas)
+        resultado = pd.concat([resultado, extra], axis=1)
+
+    if str(peticion.get("recomendacion", "")).lower() in ("1", "true", "si", "sí"):
+        if par is not None:
+            raise ValueError("El clasificador de decisiones solo está entrenado para el DXY")
+        if not modelos.disponible():
+            raise ValueError(f"Clasificador no disponible: faltan {', '.join(modelos.faltantes())}")
+        extra = modelos.recomendaciones(fechas)[["Probabilidad cambio", "Acción"]].reset_index(drop=True)
+        resultado = pd.concat([resultado, extra], axis=1)
+
+    resultado.insert(0, "Fecha", pd.DatetimeIndex(fechas).strftime("%Y-%m-%d"))
+    resultado.insert(1, "Disponible", disponible)
+    return resultado
+
+
+def jsonl_por_bloques(df, bloque=BLOQUE):
+    for inicio in range(0, len(df), bloque):
+        trozo = df.iloc[inicio:inicio + bloque].to_json(orient="records", lines=True, force_ascii=False)
+        yield (trozo if trozo.endswith("\n") else trozo + "\n").encode("utf-8")
+
+
+def _gzip(trozos):
+    compresor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> formato gzip
+    for trozo in trozos:
+        comprimido = compresor.compress(trozo)
+        if comprimido:
+            yield comprimido
+    yield compresor.flush()
+
+
+class Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # conexiones keep-alive
+    server_version = "DXYServicio/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/salud":
+            estado = {n: datos.disponible(n) for n in ("predicciones", "escenarios", "abanico")}
+            return self._json(200, {"estado": "ok", "artefactos": estado, "pares": divisas.entrenados(),
+                                    "version": artefactos.version_actual()})
+        if url.path == "/metricas":
+            tiempos.memoria()
+            return self._texto(200, tiempos.prometheus(), "text/plain; version=0.0.4; charset=utf-8")
+        peticion = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        self._consulta(url.path, peticion)
+
+    def do_POST(self):
+        longitud = int(self.headers.get("Content-Length") or 0)
+        cuerpo = self.rfile.read(longitud) if longitud else b"{}"
+        try:
+            peticion = json.loads(cuerpo)
+        except ValueError:
+            peticion = None
+        if not isinstance(peticion, dict):
+            return self._json(400, {"error": "El cuerpo debe ser un objeto JSON"})
+        self._consulta(urlparse(self.path).path, peticion)
+
+    def _consulta(self, ruta, peticion):
+        if ruta != "/predicciones":
+            return self._json(404, {"error": f"Ruta desconocida: {ruta}"})
+        t0 = time.perf_counter()
+        try:
+            resultado = consultar(peticion)
+        except (ValueError, KeyError) as e:
+            return self._json(400, {"error": str(e)})
+        latencia_ms = (time.perf_counter() - t0) * 1000
+        tiempos.registrar("servicio:consulta", latencia_ms)
+
+        trozos = jsonl_por_bloques(resultado)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Filas", str(len(resultado)))
+        self.send_header("X-Latencia-Consulta-ms", f"{latencia_ms:.2f}")
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            self.send_header("Content-Encoding", "gzip")
+            trozos = _gzip(trozos)
+        self.end_headers()
+        for trozo in trozos:
+            if trozo:
+                self.wfile.write(f"{len(trozo):X}\r\n".encode() + trozo + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+        total_ms = (time.perf_counter() - t0) * 1000
+        tiempos.registrar("servicio:respuesta", total_ms)
+        self.log_message('"%s" %d filas, consulta %.2f ms, total %.2f ms', self.requestline, len(resultado),
+                         latencia_ms, total_ms)
+
+    def send_response(self, code, message=None):
+        tiempos.contar(f"servicio:http_{code}")
+        super().send_response(code, message)
+
+    def _json(self, codigo, contenido):
+        self._texto(codigo, json.dumps(contenido, ensure_ascii=False), "application/json; charset=utf-8")
+
+    def _texto(self, codigo, texto, tipo):
+        cuerpo = texto.encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+def servir(host=HOST, puerto=PUERTO):
+    # Precarga de las tablas para que la primera petición no pague la lectura
+    for nombre in ("predicciones", "escenarios", "abanico"):
+        if datos.disponible(nombre):
+            datos.obtener(nombre)
+    if modelos.disponible():
+        modelos.cargar()
+    servidor = ThreadingHTTPServer((host, puerto), Manejador)
+    servidor.daemon_threads = True
+    print(f"✅ Servicio de predicción en http://{host}:{puerto} (rutas /predicciones, /salud y /metricas)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Predicciones del DXY por lotes desde los artefactos locales")
+    sub = parser.add_subparsers(dest="orden", required=True)
+    p_servir = sub.add_parser("servir", help="Arranca el servicio HTTP")
+    p_servir.add_argument("--host", default=HOST)
+    p_servir.add_argument("--puerto", type=int, default=PUERTO)
+    p_consultar = sub.add_parser("consultar", help="Consulta por lotes y escribe JSON-lines en la salida estándar")
+    p_consultar.add_argument("--fechas", help="Fechas separadas por comas, o '-' para leerlas de la entrada estándar")
+    p_consultar.add_argument("--inicio")
+    p_consultar.add_argument("--fin")
+    p_consultar.add_argument("--escenarios", help="Nombres separados por comas (neutro, positivo, ...)")
+    p_consultar.add_argument("--cuantiles", help="Percentiles separados por comas (5, 50, 95, ...)")
+    p_consultar.add_argument("--recomendacion", action="store_true", help="Añade la acción del clasificador")
+    p_consultar.add_argument("--par", help="Serie de FRED de un par entrenado (DEXUSUK, ...); por defecto el DXY")
+    args = parser.parse_args()
+
+    if args.orden == "servir":
+        servir(args.host, args.puerto)
+    else:
+        fechas = sys.stdin.read().split() if args.fechas == "-" else args.fechas
+        t0 = time.perf_counter()
+        try:
+            resultado = consultar({"fechas": fechas, "inicio": args.inicio, "fin": args.fin,
+                                   "escenarios": args.escenarios, "cuantiles": args.cuantiles,
+                                   "recomendacion": args.recomendacion, "par": args.par})
+        except ValueError as e:
+            # Mismos errores de petición que el servicio HTTP devuelve como 400
+            sys.exit(f"❌ {e}")
+        for trozo in jsonl_por_bloques(resultado):
+            sys.stdout.buffer.write(trozo)
+        print(f"{len(resultado)} filas en {(time.perf_counter() - t0) * 1000:.2f} ms", file=sys.stderr)
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+import artefactos
+import datos
+import reentrenamiento
+import tiempos
+from escenarios import REGRESORES
+
+# 🔹 Simulador "¿qué pasaría si…?": DXY previsto para valores de VIX, inflación y tasa FED elegidos por el
+#   usuario. Solo se calculan las filas futuras pedidas y el resultado se memoriza para todas las sesiones
+PASOS = {"VIX": 0.5, "Inflacion_USA": 0.5, "Tasa_FED": 0.05}  # cuantización de cada regresor
+CAPACIDAD = 512  # consultas distintas que se memorizan (LRU)
+
+
+class CacheLRU:
+    """Diccionario acotado que descarta la entrada usada hace más tiempo; seguro entre hilos."""
+
+    def __init__(self, capacidad=CAPACIDAD):
+        self.capacidad = capacidad
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obtener(self, clave):
+        with self._lock:
+            valor = self._entradas.get(clave)
+            if valor is not None:
+                self._entradas.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave, valor):
+        with self._lock:
+            self._entradas[clave] = valor
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.capacidad:
+                self._entradas.popitem(last=False)
+
+
+_cache = CacheLRU()
+_modelos = {}  # versión -> modelo Prophet deserializado (solo para el cálculo exacto)
+_lock = threading.Lock()
+
+
+def cuantizar(valores):
+    """Tupla de regresores redondeados a su paso: consultas casi iguales comparten resultado."""
+    return tuple(round(round(float(valores[r]) / PASOS[r]) * PASOS[r], 6) for r in REGRESORES)
+
+
+def disponible():
+    """El simulador necesita un modelo publicado por reentrenamiento.py (versiones/ACTUAL)."""
+    return reentrenamiento.metadatos(artefactos.version_actual()) is not None
+
+
+def base():
+    """Valores de referencia de la versión vigente (promedio de cada regresor en el entrenamiento)."""
+    info = reentrenamiento.metadatos(artefactos.version_actual()) or {}
+    return {r: v["base"] for r, v in info.get("regresores", {}).items()}
+
+
+def _modelo(version):
+    with _lock:
+        if version not in _modelos:
+            with tiempos.medir("carga:prophet"):
+                _modelos.clear()
+                _modelos[version] = reentrenamiento.cargar_modelo(version)
+        return _modelos[version]
+
+
+def _calcular(version, x, inicio, fin):
+    tabla = datos.obtener("predicciones")
+    referencia = tabla.rango(inicio, fin)
+    regresores = (reentrenamiento.metadatos(version) or {}).get("regresores", {})
+    if len(referencia) and all(regresores.get(r, {}).get("coef") is not None for r in REGRESORES):
+        # Regresores aditivos: la tabla publicada es la predicción con los valores base, así que basta
+        # con sumar (x - base) · coef a esas filas; el intervalo se desplaza igual
+        efecto = sum((v - regresores[r]["base"]) * regresores[r]["coef"] for r, v in zip(REGRESORES, x))
+        resultado = referencia[["DXY estimado", "yhat_lower", "yhat_upper"]].astype(float) + efecto
+    else:
+        # Cálculo exacto con Prophet, solo para los días laborables del rango pedido
+        fechas = pd.bdate_range(inicio, fin)
+        futuro = pd.DataFrame({"ds": fechas, **dict(zip(REGRESORES, x))})
+        with tiempos.medir("prophet:predict"):
+            forecast = _modelo(version).predict(futuro)
+        resultado = pd.DataFrame({"DXY estimado": forecast["yhat"].to_numpy(),
+                                  "yhat_lower": forecast["yhat_lower"].to_numpy(),
+                                  "yhat_upper": forecast["yhat_upper"].to_numpy()},
+                                 index=pd.DatetimeIndex(fechas, name="Fecha"))
+    resultado["Dispersión"] = resultado["yhat_upper"] - resultado["yhat_lower"]
+    resultado["Confianza"] = 1 / resultado["Dispersión"]
+    return resultado
+
+
+def predecir(valores, inicio, fin):
+    """DXY previsto entre ``inicio`` y ``fin`` con los regresores ``valores`` ({"VIX": ..., ...}).
+
+    Devuelve (DataFrame con índice Fecha, regresores cuantizados, acierto de caché, ms).
+    """
+    start = time.perf_counter()
+    version = artefactos.version_actual()
+    if version is None:
+        raise FileNotFoundError("No hay ningún modelo publicado: ejecuta reentrenamiento.py")
+    inicio, fin = pd.Timestamp(inicio).normalize(), pd.Timestamp(fin).normalize()
+    x = cuantizar(valores)
+    clave = (version, x, inicio, fin)
+    resultado = _cache.obtener(clave)
+    acierto = resultado is not None
+    tiempos.acierto("simulador", acierto)
+    if not acierto:
+        resultado = _calcular(version, x, inicio, fin)
+        _cache.guardar(clave, resultado)
+    ms = (time.perf_counter() - start) * 1000
+    tiempos.registrar("simulador:consulta", ms)
+    return resultado, dict(zip(REGRESORES, x)), acierto, ms
@@ -0,0 +1,75 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+# Los módulos de la app viven en la raíz del repositorio
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+
+class EstadoFRED:
+    """Series que sirve el stub, fallo forzado (código HTTP), retardo, ETag y registro de peticiones."""
+
+    def __init__(self):
+        self.series = {}  # series_id -> [(fecha AAAA-MM-DD, valor)]
+        self.ficheros = {}  # ruta -> texto CSV servido tal cual (p. ej. el histórico del VIX de CBOE)
+        self.fallo = None
+        self.retardo = 0.0
+        self.etag = None  # si se fija, responde 304 a If-None-Match con el mismo valor
+        self.peticiones = []
+        self.lock = threading.Lock()
+
+
+def _manejador(estado):
+    class Manejador(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+            with estado.lock:
+                estado.peticiones.append(dict(params, **{k.lower(): v for k, v in self.headers.items()
+                                                         if k.lower().startswith("if-")}))
+            time.sleep(estado.retardo)
+            if estado.fallo:
+                self.send_response(estado.fallo)
+                self.end_headers()
+                return
+            if estado.etag and self.headers.get("If-None-Match") == estado.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            ruta = urlparse(self.path).path
+            if ruta in estado.ficheros:
+                cuerpo, tipo = estado.ficheros[ruta].encode(), "text/csv"
+            else:
+                desde = params.get("observation_start", "")
+                observaciones = [{"date": f, "value": str(v)}
+                                 for f, v in estado.series.get(params["series_id"], []) if f >= desde]
+                cuerpo, tipo = json.dumps({"observations": observaciones}).encode(), "application/json"
+            self.send_response(200)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(cuerpo)))
+            if estado.etag:
+                self.send_header("ETag", estado.etag)
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+    return Manejador
+
+
+@pytest.fixture
+def servidor_fred():
+    """Stub local de la API de FRED (/series/observations); devuelve (url base, estado)."""
+    estado = EstadoFRED()
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _manejador(estado))
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}/fred", estado
+    servidor.shutdown()
+    servidor.server_close()
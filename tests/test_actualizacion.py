@@ -0,0 +1,63 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from actualizacion import Actualizador
+
+
+def actualizador(url, directorio, **kwargs):
+    fuentes = {"DEXUSEU": {"tipo": "fred", "timeout": 5}, "FEDFUNDS": {"tipo": "fred", "timeout": 5}}
+    return Actualizador(fuentes=fuentes, api_key="x", base_url=url, directorio=str(directorio),
+                        espera_base=0.01, **kwargs)
+
+
+def test_ultimo_valor_solo_refresca_su_fuente(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    estado.series["DEXUSEU"] = [("2025-07-01", 1.17)]
+    info = actualizador(url, tmp_path).ultimo_valor("DEXUSEU")
+    assert (info["valor"], info["origen"]) == (1.17, "red")
+    assert [p["series_id"] for p in estado.peticiones] == ["DEXUSEU"]
+
+
+def test_refrescos_simultaneos_comparten_la_descarga(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    estado.series["FEDFUNDS"] = [("2025-06-01", 4.33), ("2025-07-01", 4.33)]
+    estado.retardo = 0.3
+    act = actualizador(url, tmp_path)
+    with ThreadPoolExecutor(4) as pool:
+        resultados = list(pool.map(lambda _: act.refrescar_sync(["FEDFUNDS"])["FEDFUNDS"], range(4)))
+    assert len(estado.peticiones) == 1
+    assert {(r["valor"], r["fecha"]) for r in resultados} == {(4.33, "2025-07-01")}
+    assert sorted(os.listdir(tmp_path)) == ["FEDFUNDS.csv", "validadores.json"]
+
+
+def test_sin_almacen_no_se_envian_validadores(servidor_fred, tmp_path):
+    # Validadores guardados de una descarga anterior cuyo almacén ya no existe
+    url, estado = servidor_fred
+    estado.series["FEDFUNDS"] = [("2025-07-01", 4.33)]
+    estado.etag = '"v1"'
+    act = actualizador(url, tmp_path)
+    act.refrescar_sync(["FEDFUNDS"])
+    os.remove(tmp_path / "FEDFUNDS.csv")
+    r = act.refrescar_sync(["FEDFUNDS"], forzar=True)["FEDFUNDS"]
+    assert "if-none-match" not in estado.peticiones[-1]
+    assert (r["origen"], r["valor"]) == ("red", 4.33)
+
+
+def test_refrescos_sucesivos_reutilizan_el_cliente(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    estado.series["FEDFUNDS"] = [("2025-07-01", 4.33)]
+    act = actualizador(url, tmp_path)
+    act.refrescar_sync(["FEDFUNDS"])
+    cliente = act._cliente
+    act.refrescar_sync(["FEDFUNDS"], forzar=True)
+    assert act._cliente is cliente and not cliente.is_closed
+
+    async def desde_otro_bucle():
+        return await act.refrescar(["FEDFUNDS"], forzar=True)
+
+    # Un llamador con su propio bucle (asyncio.run) delega en el bucle del actualizador
+    assert asyncio.run(desde_otro_bucle())["FEDFUNDS"]["valor"] == 4.33
+    assert act._cliente is cliente and len(estado.peticiones) == 3
+    act.cerrar()
+    assert cliente.is_closed
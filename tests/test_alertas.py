@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+import alertas
+
+
+def test_dispersion_creciente_no_marca_todo_el_horizonte():
+    # Dispersión con tendencia al alza (como la del intervalo de Prophet) y ruido relativo pequeño
+    rng = np.random.default_rng(0)
+    n = 1000
+    df = pd.DataFrame({"DXY estimado": 100 + rng.normal(0, 0.1, n).cumsum(),
+                       "Dispersión": np.linspace(5, 200, n) * (1 + rng.normal(0, 0.01, n))})
+    for metodo in ("movil", "exponencial", "robusto"):
+        assert alertas.detectar(df, metodo).mean() < 0.5, metodo
+
+    # Un salto aislado de la dispersión sí se marca con los métodos de ventana
+    df.loc[600, "Dispersión"] *= 1.5
+    assert all(alertas.detectar(df, metodo)[600] for metodo in ("movil", "exponencial", "robusto"))
+
+
+def test_indice_por_par():
+    import datos
+
+    fechas = pd.date_range("2025-09-10", periods=50, freq="B", name="Fecha")
+    dispersion = np.full(50, 4.0)
+    tablas = {}
+    for nombre, salto in (("predicciones", 10), ("predicciones@DEXUSEU", 30)):
+        d = dispersion.copy()
+        d[salto] = 40.0
+        tablas[nombre] = datos.Tabla(pd.DataFrame({"DXY estimado": np.full(50, 100.0), "Dispersión": d},
+                                                  index=fechas))
+    indices = {nombre: alertas.indice_alertas(nombre, tabla) for nombre, tabla in tablas.items()}
+    assert list(indices["predicciones"]) == [10] and list(indices["predicciones@DEXUSEU"]) == [30]
+    assert alertas.indice_alertas("predicciones", tablas["predicciones"]) is indices["predicciones"]
+
+
+def test_detector_online_coincide_con_detectar():
+    # Dispersión constante: detectar solo marca variaciones abruptas, lo mismo que evalúa DetectorOnline
+    rng = np.random.default_rng(1)
+    n = 800
+    estimado = 100 + rng.standard_t(3, n).cumsum() * 0.1
+    df = pd.DataFrame({"DXY estimado": estimado, "Dispersión": np.full(n, 4.0)})
+    variacion = np.diff(estimado)
+    for metodo in ("movil", "exponencial"):
+        detector = alertas.DetectorOnline(metodo, ventana=60, k=alertas.K_VARIACION)
+        online = [False] + [detector.actualizar(v) for v in variacion]
+        lotes = alertas.detectar(df, metodo, ventana=60)
+        assert lotes.any() and list(lotes) == online, metodo
+
+
+def comparativa(n, rng):
+    fechas = pd.date_range("2020-01-01", periods=n, freq="B", name="Fecha")
+    real = 100 + rng.normal(0, 0.3, n).cumsum()
+    return pd.DataFrame({"DXY real": real, "DXY estimado": real + rng.standard_t(3, n) * 0.2}, index=fechas)
+
+
+def test_monitor_real_coincide_con_los_umbrales_por_lotes():
+    df = comparativa(600, np.random.default_rng(2))
+    resultado = alertas.MonitorReal().procesar(df.index, df["DXY real"], df["DXY estimado"])
+    error = df["DXY real"] - df["DXY estimado"]
+    centro, escala = alertas._centro_escala(error, "exponencial", 60)
+    assert resultado["Alerta error"].tolist() == ((error - centro).abs() > 2 * escala).tolist()
+
+
+def test_monitor_para_solo_procesa_las_filas_nuevas():
+    import datos
+
+    df = comparativa(700, np.random.default_rng(3))
+    df["DXY estimado"] = df["DXY estimado"].astype("float32")
+    df["DXY real"] = df["DXY real"].astype("float32")
+    inicial = alertas.monitor_para("comparativa@prueba", datos.Tabla(df.iloc[:500]))
+    monitor = alertas._monitores[("comparativa@prueba", "exponencial", 60)][1]
+    ampliada = datos.Tabla(df)
+    posiciones = alertas.monitor_para("comparativa@prueba", ampliada)
+    assert alertas._monitores[("comparativa@prueba", "exponencial", 60)][1] is monitor
+    assert list(posiciones[:len(inicial)]) == list(inicial)
+    # Mismo resultado que procesar la comparativa completa desde cero
+    completa = alertas.MonitorReal().procesar(ampliada.fechas_de(slice(None)), ampliada.columna("DXY real").tolist(),
+                                             ampliada.columna("DXY estimado").tolist())
+    assert list(posiciones) == list(np.flatnonzero(completa["Alerta"].to_numpy()))
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+import caracteristicas
+
+
+# 🔹 Reglas originales del notebook (fila a fila con apply), como referencia del etiquetado vectorizado
+def etiquetar_decision(row):
+    if row['yhat'] > row['yhat_upper'] - 0.01 and row['dispersión'] < 10:
+        return 'cambiar'
+    elif row['yhat'] < row['yhat_lower'] + 0.01 and row['dispersión'] < 10:
+        return 'no_cambiar'
+    else:
+        return 'evaluar'
+
+
+def etiquetar_por_variacion(row):
+    if row['variacion'] > 0.5:
+        return 'cambiar'
+    elif row['variacion'] < -0.5:
+        return 'no_cambiar'
+    else:
+        return 'evaluar'
+
+
+def etiquetar_binario(row):
+    if row['variacion'] > row['DXY'] * 0.003:
+        return 'cambiar'
+    elif row['variacion'] < -row['DXY'] * 0.003:
+        return 'no_cambiar'
+    else:
+        return None
+
+
+@pytest.fixture(scope="module")
+def comparativa():
+    comp = pd.read_csv("comparativa_dxy_modelo.csv").rename(columns={"DXY real": "DXY"})
+    comp["variacion"] = comp["DXY"] - comp["DXY"].shift(1)
+    return comp
+
+
+def test_regla_inicial_identica_a_apply():
+    # Predicciones reales exportadas por el notebook
+    pred = pd.read_csv("predicciones_2025_2029.csv").rename(
+        columns={"DXY estimado": "yhat", "Dispersión": "dispersión"})
+    esperado = pred.apply(etiquetar_decision, axis=1)
+    assert caracteristicas.etiquetar_decision(pred).equals(esperado.rename("decision"))
+
+
+def test_regla_inicial_en_los_limites():
+    # Las predicciones exportadas son todas "evaluar": se cubren también los límites de la banda y la dispersión
+    df = pd.DataFrame({
+        "yhat": [101.0, 99.0, 100.0, 101.0, 99.0, 100.995, 99.005],
+        "yhat_lower": [99.0, 99.0, 99.0, 95.0, 99.0, 99.0, 99.0],
+        "yhat_upper": [101.0, 101.0, 101.0, 106.0, 101.0, 101.0, 101.0],
+    })
+    df["dispersión"] = df["yhat_upper"] - df["yhat_lower"]
+    df.loc[4, "dispersión"] = 10
+    esperado = df.apply(etiquetar_decision, axis=1)
+    assert set(esperado) == {"cambiar", "no_cambiar", "evaluar"}
+    assert caracteristicas.etiquetar_decision(df).equals(esperado.rename("decision"))
+
+
+def test_variacion_absoluta_identica_a_apply(comparativa):
+    esperado = comparativa.apply(etiquetar_por_variacion, axis=1)
+    assert caracteristicas.etiquetar_por_variacion(comparativa).equals(esperado.rename("decision"))
+
+
+def test_variacion_relativa_identica_a_apply(comparativa):
+    esperado = comparativa.apply(etiquetar_binario, axis=1)
+    vectorizado = caracteristicas.etiquetar_por_variacion(comparativa, caracteristicas.UMBRAL_RELATIVO,
+                                                          relativo=True, neutra=None)
+    assert vectorizado.equals(esperado.rename("decision"))
+    # El día sin variación previa queda sin etiqueta, como con apply
+    assert pd.isna(vectorizado.iloc[0])
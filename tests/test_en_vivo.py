@@ -0,0 +1,104 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+import en_vivo
+
+
+class FuenteLista:
+    """Fuente falsa: devuelve los valores de la lista en orden y después falla (el productor no añade ticks)."""
+
+    intervalo = 0.01
+    etiqueta = "prueba"
+    unidad = "EUR"
+
+    def __init__(self, valores):
+        self.valores = list(valores)
+        self.lecturas = 0
+
+    def leer(self):
+        if self.lecturas >= len(self.valores):
+            raise RuntimeError("sin más valores")
+        valor = self.valores[self.lecturas]
+        self.lecturas += 1
+        return {"valor": valor, "fecha": f"2025-07-{self.lecturas:02d}", "origen": "prueba", "estado": "ok"}
+
+
+def esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "tiempo agotado"
+        time.sleep(0.01)
+
+
+def test_productor_marca_variaciones_abruptas():
+    valores = [1.10 + 0.001 * (i % 3) for i in range(30)] + [1.30]
+    fuente = FuenteLista(valores)
+    productor = en_vivo.Productor(fuente).iniciar()
+    try:
+        esperar(lambda: productor.anillo.total == len(valores))
+    finally:
+        productor.detener()
+    ultimo, _, registrados = productor.consultar()
+    assert ultimo["valor"] == 1.30 and ultimo["alerta"]
+    assert list(registrados) == valores
+
+
+def test_anillo_conserva_los_ultimos_en_orden_al_dar_la_vuelta():
+    anillo = en_vivo.Anillo(capacidad=4)
+    for i in range(1, 7):
+        anillo.añadir(float(i), i * 10.0)
+    instantes, valores = anillo.ultimos()
+    assert (len(anillo), anillo.total) == (4, 6)
+    assert list(instantes) == [3.0, 4.0, 5.0, 6.0] and list(valores) == [30.0, 40.0, 50.0, 60.0]
+    assert list(anillo.ultimos(2)[1]) == [50.0, 60.0]
+    assert list(anillo.ultimos(10)[1]) == [30.0, 40.0, 50.0, 60.0]
+
+
+def test_replay_vuelve_a_empezar_al_final():
+    fuente = en_vivo.FuenteReplay(["2025-07-01", "2025-07-02", "2025-07-03"], [1.1, 1.2, 1.3], "prueba")
+    ticks = [fuente.leer() for _ in range(7)]
+    assert [t["valor"] for t in ticks] == [1.1, 1.2, 1.3, 1.1, 1.2, 1.3, 1.1]
+    assert ticks[3]["fecha"] == "2025-07-01"
+
+
+def test_sin_lectores_el_productor_deja_de_consultar(monkeypatch):
+    monkeypatch.setattr(en_vivo, "INACTIVIDAD", 0.2)
+    fuente = en_vivo.FuenteReplay(pd.bdate_range("2025-01-01", periods=50), np.linspace(1, 2, 50), "prueba")
+    productor = en_vivo.Productor(fuente, intervalo=0.01).iniciar()
+    try:
+        esperar(lambda: time.monotonic() - productor._lectura > 0.2 + 0.05)
+        pausado = productor.anillo.total
+        time.sleep(0.1)
+        assert pausado > 0 and productor.anillo.total == pausado
+        # Una sesión vuelve a leer: el productor reanuda las consultas
+        productor.consultar()
+        esperar(lambda: productor.anillo.total > pausado)
+    finally:
+        productor.detener()
+
+
+class ActualizadorFijo:
+    """Actualizador falso: devuelve las publicaciones de la lista y después repite la última."""
+
+    def __init__(self, publicaciones):
+        self.publicaciones = list(publicaciones)
+        self.llamadas = 0
+
+    def ultimo_valor(self, serie):
+        valor, fecha = self.publicaciones[min(self.llamadas, len(self.publicaciones) - 1)]
+        self.llamadas += 1
+        return {"valor": valor, "fecha": fecha, "latencia": 0.0, "origen": "caché", "estado": "✅ FRED OK (caché)"}
+
+
+def test_fred_sin_publicacion_nueva_no_anade_ticks():
+    actualizador = ActualizadorFijo([(1.17, "2025-07-01"), (1.17, "2025-07-01"), (1.18, "2025-07-02")])
+    productor = en_vivo.Productor(en_vivo.FuenteFRED(actualizador), intervalo=0.01).iniciar()
+    try:
+        esperar(lambda: actualizador.llamadas >= 6)
+    finally:
+        productor.detener()
+    ultimo, _, valores = productor.consultar()
+    assert list(valores) == [1.17, 1.18] and ultimo["fecha"] == "2025-07-02"
+    assert productor.detector.n == 1  # una sola variación real
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from fred_client import ClienteFRED
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def cliente(url, directorio, **kwargs):
+    return ClienteFRED(api_key="x", base_url=url, directorio=str(directorio), **kwargs)
+
+
+def test_descarga_incremental_desde_la_ultima_fecha(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    estado.series["DEXUSEU"] = [("2025-07-01", 1.17), ("2025-07-02", 1.18)]
+    c = cliente(url, tmp_path, ttl=0)
+    df, origen, _, _ = c.observaciones("DEXUSEU")
+    assert origen == "red" and len(df) == 2
+    assert "observation_start" not in estado.peticiones[0]
+
+    estado.series["DEXUSEU"].append(("2025-07-03", 1.19))
+    df, origen, _, _ = c.observaciones("DEXUSEU")
+    assert estado.peticiones[1]["observation_start"] == "2025-07-02"
+    assert origen == "red" and df["value"].tolist() == [1.17, 1.18, 1.19]
+    assert len(cliente(url, tmp_path)._leer_almacen("DEXUSEU")) == 3
+
+
+def test_dentro_del_ttl_no_se_repite_la_peticion(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    estado.series["DEXUSEU"] = [("2025-07-01", 1.17)]
+    c = cliente(url, tmp_path, ttl=3600)
+    assert c.observaciones("DEXUSEU")[1] == "red"
+    assert c.ultimo_valor("DEXUSEU")["origen"] == "caché"
+    assert len(estado.peticiones) == 1
+
+
+def test_error_del_servidor_sirve_el_ultimo_valor_conocido(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    estado.series["DEXUSEU"] = [("2025-07-01", 1.17)]
+    c = cliente(url, tmp_path, ttl=0, reintento=3600)
+    c.observaciones("DEXUSEU")
+    estado.fallo = 500
+    df, origen, _, error = c.observaciones("DEXUSEU")
+    assert origen == "stale" and df["value"].tolist() == [1.17]
+    assert isinstance(error, requests.HTTPError)
+    # Hasta el próximo reintento se sigue sirviendo sin volver a llamar a la API
+    assert c.observaciones("DEXUSEU")[1] == "stale" and len(estado.peticiones) == 2
+
+    # Un cliente nuevo (sin memoria) recurre al almacén local
+    info = cliente(url, tmp_path).ultimo_valor("DEXUSEU")
+    assert (info["origen"], info["valor"]) == ("stale", 1.17)
+
+
+def test_sin_observaciones_no_hay_valor(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    info = cliente(url, tmp_path).ultimo_valor("DEXUSEU")
+    assert (info["valor"], info["fecha"], info["origen"]) == (None, None, "red")
+    assert "DEXUSEU" in info["estado"]
+
+
+def test_llamadas_concurrentes_comparten_una_peticion(servidor_fred, tmp_path):
+    url, estado = servidor_fred
+    estado.series["DEXUSEU"] = [("2025-07-01", 1.17)]
+    estado.retardo = 0.3
+    c = cliente(url, tmp_path)
+    with ThreadPoolExecutor(8) as pool:
+        valores = list(pool.map(lambda _: c.ultimo_valor("DEXUSEU")["valor"], range(8)))
+    assert valores == [1.17] * 8
+    assert len(estado.peticiones) == 1
+
+
+def test_fred_base_url_apunta_al_servidor(servidor_fred, tmp_path):
+    # La URL por defecto se toma de FRED_BASE_URL al importar el módulo: se comprueba en un proceso aparte
+    url, estado = servidor_fred
+    estado.series["DEXUSEU"] = [("2025-07-01", 1.17)]
+    codigo = "from fred_client import ClienteFRED; print(ClienteFRED().ultimo_valor('DEXUSEU')['valor'])"
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, cwd=RAIZ, check=True,
+                            env=dict(os.environ, FRED_BASE_URL=url, FRED_CACHE_DIR=str(tmp_path)))
+    assert salida.stdout.strip() == "1.17" and len(estado.peticiones) == 1
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+import datos
+import informe
+
+
+def tabla(n=25):
+    fechas = pd.date_range("2025-09-10", periods=n, freq="B", name="Fecha")
+    return datos.Tabla(pd.DataFrame({"DXY estimado": np.linspace(100, 101, n), "Confianza": np.full(n, 0.2)},
+                                    index=fechas))
+
+
+def test_csv_por_bloques_igual_al_rango_completo():
+    t = tabla()
+    esperado = t.filas(slice(3, 21)).to_csv(date_format="%Y-%m-%d").encode("utf-8")
+    assert b"".join(informe.csv_por_bloques(t, 3, 21, bloque=4)) == esperado
+    assert informe.csv_a_fichero(t, 3, 21, bloque=4).read() == esperado
+
+
+def test_xlsx_por_bloques_escribe_todas_las_filas():
+    from openpyxl import load_workbook
+
+    t = tabla()
+    hoja = load_workbook(informe.xlsx_a_fichero(t, 3, 21, bloque=4)).active
+    assert [c.value for c in hoja[1]] == ["Fecha", "DXY estimado", "Confianza"]
+    assert hoja.max_row == 1 + 18
+    assert hoja.cell(2, 1).value == pd.Timestamp("2025-09-15")
+
+
+def test_pdf_resumen_sin_estado_global_de_pyplot():
+    import matplotlib.pyplot as plt
+
+    figuras = plt.get_fignums()
+    pdf = informe.pdf_a_fichero({"filas": 18, "DXY estimado": 100.5}, "2025-09-10", "2025-09-18").read()
+    assert pdf.startswith(b"%PDF-")
+    assert plt.get_fignums() == figuras
+
+
+def test_descargas_admitidas_por_streamlit():
+    # Mismo conversor que aplica st.download_button al resultado del callable
+    from streamlit.elements.widgets.button import convert_data_to_bytes_and_infer_mime
+
+    t = tabla()
+    esperado_csv = t.filas(slice(3, 21)).to_csv(date_format="%Y-%m-%d").encode("utf-8")
+    for fichero, inicio in ((informe.csv_a_fichero(t, 3, 21), esperado_csv[:20]),
+                            (informe.xlsx_a_fichero(t, 3, 21), b"PK"),
+                            (informe.pdf_a_fichero({"filas": 18}, "2025-09-10", "2025-09-18"), b"%PDF-")):
+        contenido, _ = convert_data_to_bytes_and_infer_mime(fichero, TypeError("tipo no admitido"))
+        assert contenido.startswith(inicio)
+    assert convert_data_to_bytes_and_infer_mime(informe.csv_a_fichero(t, 3, 21), TypeError())[0] == esperado_csv
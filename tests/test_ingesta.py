@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ingesta
+
+DIAS = pd.bdate_range("2023-01-02", "2024-06-28")
+
+
+def _escribir(directorio, nombre, cabecera, lineas):
+    ruta = os.path.join(directorio, ingesta.FUENTES[nombre])
+    os.makedirs(os.path.dirname(ruta) or directorio, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(cabecera)
+        f.writelines(lineas)
+
+
+def fuentes(directorio, hasta=DIAS[-1], fedfunds=True):
+    """Fuentes con su formato original, publicadas hasta ``hasta`` (los datos mensuales, al cerrar el mes)."""
+    rng = np.random.default_rng(0)
+    dxy = 100 + np.cumsum(rng.normal(0, 0.4, len(DIAS)))
+    vix = 15 + np.abs(np.cumsum(rng.normal(0, 0.8, len(DIAS))))
+    cotiza = rng.uniform(size=len(DIAS)) > 0.1  # el VIX falta algunos días del DXY
+    meses = pd.date_range("2023-01-01", DIAS[-1], freq="MS")
+    publicados = meses[meses < hasta - pd.offsets.MonthBegin(1)]
+    dias = DIAS[DIAS <= hasta]
+    _escribir(directorio, "DXY", "Price,DXY\nTicker,DX-Y.NYB\nFecha,\n",
+              [f"{d:%Y-%m-%d},{v!r}\n" for d, v in zip(dias, dxy.tolist())])
+    vix_hasta = DIAS <= hasta + pd.Timedelta(days=7)  # el VIX puede llegar antes que el DXY
+    _escribir(directorio, "VIX", "DATE,OPEN,HIGH,LOW,CLOSE\n",
+              [f"{d:%m/%d/%Y},{v:.2f},{v:.2f},{v:.2f},{v:.2f}\n"
+               for d, v in zip(DIAS[cotiza & vix_hasta], vix[cotiza & vix_hasta])])
+    _escribir(directorio, "Inflacion_USA", "date,value\n",
+              [f"{m:%Y-%m-%d},{300 + i * 0.3:.3f}\n" for i, m in enumerate(publicados)])
+    if fedfunds:
+        _escribir(directorio, "Tasa_FED", "date,value\n",
+                  [f"{m:%Y-%m-%d},{4 + i * 0.05:.2f}\n" for i, m in enumerate(publicados)])
+
+
+def _dataset(directorio):
+    with open(os.path.join(directorio, ingesta.DATASET), "rb") as f:
+        return f.read()
+
+
+def test_incremental_igual_a_reconstruccion(tmp_path):
+    incremental, completo = tmp_path / "incremental", tmp_path / "completo"
+    for corte in pd.to_datetime(["2023-05-15", "2023-11-30", "2024-02-07", "2024-04-19", DIAS[-1]]):
+        fuentes(incremental, corte)
+        ingesta.actualizar(incremental)
+    fuentes(completo)
+    ingesta.reconstruir(completo)
+    assert _dataset(incremental) == _dataset(completo)
+    df = pd.read_csv(completo / ingesta.DATASET)
+    assert len(df) == len(DIAS) and df["Tasa_FED"].notna().any()
+
+
+def test_tasa_fed_se_incorpora(tmp_path):
+    fuentes(tmp_path)
+    ingesta.actualizar(tmp_path)
+    df = pd.read_csv(tmp_path / ingesta.DATASET)
+    assert list(df.columns) == ingesta.COLUMNAS
+    assert df["Tasa_FED"].notna().mean() > 0.9
+    assert df["Tasa_FED"].iloc[-1] == pytest.approx(4 + 16 * 0.05)  # último mes publicado (abril)
+
+
+def test_sin_fedfunds_no_toca_el_dataset(tmp_path):
+    fuentes(tmp_path, fedfunds=False)
+    (tmp_path / ingesta.DATASET).write_text("Fecha,DXY\n", encoding="utf-8")
+    with pytest.raises(FileNotFoundError, match="Tasa_FED"):
+        ingesta.actualizar(tmp_path)
+    assert (tmp_path / ingesta.DATASET).read_text(encoding="utf-8") == "Fecha,DXY\n"
+
+
+def test_refrescar_fuentes_descarga_vix_ipc_y_fedfunds(tmp_path, servidor_fred):
+    import actualizacion
+
+    url, estado = servidor_fred
+    estado.series["FEDFUNDS"] = [("2024-01-01", 5.33), ("2024-02-01", 5.33)]
+    estado.series["CPIAUCSL"] = [("2023-12-01", 309.7), ("2024-01-01", 310.3), ("2024-02-01", 311.0)]
+    estado.ficheros["/VIX_History.csv"] = "DATE,OPEN,HIGH,LOW,CLOSE\n02/01/2024,13.9,14.1,13.2,13.4\n"
+    fuentes_remotas = dict(actualizacion.FUENTES, VIX=dict(actualizacion.FUENTES["VIX"],
+                                                         url=url.removesuffix("/fred") + "/VIX_History.csv"))
+
+    def actualizador(directorio):
+        return actualizacion.Actualizador(fuentes=fuentes_remotas, base_url=url, espera_base=0.01,
+                                          directorio=str(directorio / ingesta.DIRECTORIO_CACHE))
+
+    # El IPC parte del histórico del repo: FRED solo envía lo posterior a su último mes
+    (tmp_path / "Inflacion_USA.csv").write_text("Fecha,Inflación USA\n2023-11-01,308.0\n2023-12-01,309.7\n",
+                                                encoding="utf-8")
+    resultados = ingesta.refrescar_fuentes(tmp_path, actualizador(tmp_path))
+    assert {f: r["valor"] for f, r in resultados.items()} == {"VIX": 13.4, "CPIAUCSL": 311.0, "FEDFUNDS": 5.33}
+    assert [p["observation_start"] for p in estado.peticiones if p.get("series_id") == "CPIAUCSL"] == ["2023-12-01"]
+    ipc = pd.read_csv(tmp_path / ingesta.FUENTES["Inflacion_USA"])
+    assert list(ipc.columns) == ["date", "value"] and ipc["value"].tolist() == [308.0, 309.7, 310.3, 311.0]
+    assert all((tmp_path / ingesta.FUENTES[nombre]).exists() for nombre in ingesta.REMOTAS)
+
+    estado.fallo = 500  # sin copia local, un FRED caído es un error claro y no una columna vacía
+    vacio = tmp_path / "vacio"
+    with pytest.raises(RuntimeError, match="FEDFUNDS"):
+        ingesta.refrescar_fuentes(vacio, actualizador(vacio))
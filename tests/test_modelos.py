@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import modelos
+
+
+@pytest.fixture
+def registro(tmp_path, monkeypatch):
+    monkeypatch.setattr(modelos, "DIRECTORIO_REGISTRO", str(tmp_path / "registro_modelos"))
+    return tmp_path / "registro_modelos"
+
+
+def _entrenar(signo):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.impute import SimpleImputer
+
+    # 'cambiar' (1) cuando VIX está por encima de 20 (signo 1) o por debajo (signo -1)
+    X = pd.DataFrame({"VIX": np.linspace(10, 30, 40), "dispersión": np.full(40, 4.0)})
+    y = (signo * (X["VIX"] - 20) > 0).astype(int)
+    imputador = SimpleImputer(strategy="mean").fit(X)
+    imputado = pd.DataFrame(imputador.transform(X), columns=X.columns)
+    modelo = RandomForestClassifier(n_estimators=5, random_state=0).fit(imputado, y)
+    return modelo, imputador, list(X.columns), X
+
+
+def test_registrar_activa_la_version_y_predice(registro):
+    X = pd.DataFrame({"VIX": [12.0, 28.0, np.nan], "dispersión": [4.0, 4.0, 12.0]})
+    modelo, imputador, features, df = _entrenar(1)
+    modelos.registrar(modelo, imputador, features, version="v1", df_entrenamiento=df)
+    assert modelos.version_actual() == "v1"
+    assert (registro / "ACTUAL").read_text(encoding="utf-8") == "v1"
+    assert modelos.cargar().recomendar(X)["Acción"].tolist() == ["no_cambiar", "cambiar", "evaluar"]
+
+    # Una versión nueva sustituye el puntero sin tocar la anterior ni dejar temporales
+    modelo, imputador, features, df = _entrenar(-1)
+    info = modelos.registrar(modelo, imputador, features, version="v2", df_entrenamiento=df)
+    assert info["datos"] == modelos.hash_datos(df)
+    assert modelos.version_actual() == "v2"
+    assert modelos.cargar().recomendar(X)["Acción"].tolist() == ["cambiar", "no_cambiar", "evaluar"]
+    assert sorted(p.name for p in registro.iterdir()) == ["ACTUAL", "v1", "v2"]
+
+    modelos.activar("v1")
+    assert modelos.cargar().version == "v1"
+    with pytest.raises(FileExistsError):
+        modelos.registrar(modelo, imputador, features, version="v1")
@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+import precision
+
+
+def test_julio_conserva_el_acierto_de_decision():
+    # Diagnóstico original: 17 de 22 decisiones acertadas (77 %) -> fiabilidad moderada
+    registro = precision.registro_decisiones()
+    metricas = registro.consultar_mes("2025-07")
+    assert (metricas["aciertos_decision"], metricas["decisiones"]) == (17, 22)
+    assert precision.fiabilidad({"dias": 0, **metricas}) == "moderada"
+
+
+def test_sin_decisiones_se_usa_el_acierto_de_direccion():
+    fechas = pd.date_range("2024-01-01", periods=5, freq="B")
+    cubo = precision.CuboPrecision(fechas, [1, 2, 3, 2, 3], [1, 2, 3, 4, 5], [0.2] * 5)
+    metricas = {**cubo.consultar(), **precision.RegistroDecisiones([], [], []).consultar()}
+    assert (metricas["aciertos"], metricas["errores"]) == (3, 1)
+    assert precision.fiabilidad(metricas) == "moderada"
+    assert cubo.consultar_mes("2030-01") == {"dias": 0}
+
+
+def test_un_cubo_por_par():
+    import datos
+
+    fechas = pd.date_range("2024-01-01", periods=5, freq="B", name="Fecha")
+    comparativas = {nombre: datos.Tabla(pd.DataFrame({"DXY real": [1.0, 2, 3, 2, 3], "DXY estimado": [1.0, 2, 3, 4, 5],
+                                                      "Confianza": [escala] * 5}, index=fechas))
+                    for nombre, escala in (("comparativa", 0.2), ("comparativa@DEXUSEU", 0.1))}
+    cubos = {nombre: precision.cubo_para(nombre, tabla) for nombre, tabla in comparativas.items()}
+    # Alternar de par no reconstruye ni mezcla los cubos
+    for nombre, tabla in comparativas.items():
+        assert precision.cubo_para(nombre, tabla) is cubos[nombre]
+    assert cubos["comparativa@DEXUSEU"].consultar()["confianza_media"] == pytest.approx(0.1)
+
+
+def test_periodo_sin_pares_de_dias_no_tiene_fiabilidad():
+    # Un solo día (sin el anterior) no permite medir el acierto de dirección: "sin datos", no "baja"
+    fechas = pd.date_range("2024-01-01", periods=5, freq="B")
+    cubo = precision.CuboPrecision(fechas, [1, 2, 3, 2, 3], [1, 2, 3, 4, 5], [0.2] * 5)
+    metricas = {**cubo.consultar(fechas[0], fechas[0]), **precision.RegistroDecisiones([], [], []).consultar()}
+    assert metricas["dias"] == 1 and metricas["porcentaje_acierto"] is None
+    assert precision.fiabilidad(metricas) is None
+    assert precision.fiabilidad({"dias": 0, "decisiones": 0}) is None
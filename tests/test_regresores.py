@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+import backtest
+import divisas
+import escenarios
+
+
+def economico(**columnas):
+    return pd.DataFrame({"Fecha": pd.date_range("2024-01-01", periods=3), "DXY": [100.0, 101.0, 102.0],
+                         "VIX": [15.0, 16.0, 17.0], "Inflacion_USA": [3.0, 3.0, 3.1], **columnas})
+
+
+def test_falta_tasa_fed_da_un_error_accionable():
+    with pytest.raises(ValueError, match="Tasa_FED.*python ingesta.py"):
+        backtest.preparar(economico())
+    with pytest.raises(ValueError, match="Tasa_FED"):
+        divisas.preparar(pd.DataFrame({"date": [], "value": []}), economico(Tasa_FED=[None] * 3))
+    # Antes de tocar el modelo ni escribir el almacén de escenarios
+    with pytest.raises(ValueError, match="Tasa_FED"):
+        escenarios.generar(None, economico(), salida=None)
+
+
+def test_con_todos_los_regresores_prepara_el_entrenamiento():
+    df_reg = backtest.preparar(economico(Tasa_FED=[5.25, 5.25, 5.5]))
+    assert list(df_reg.columns[:2]) == ["ds", "y"] and len(df_reg) == 3
@@ -0,0 +1,72 @@
+import gzip
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def test_cli_peticion_invalida_sale_con_error():
+    salida = subprocess.run([sys.executable, "servicio.py", "consultar", "--fechas", "2025-13-45"],
+                            capture_output=True, text=True, cwd=RAIZ)
+    assert salida.returncode != 0
+    assert "fechas no es válida" in salida.stderr and "Traceback" not in salida.stderr
+    assert salida.stdout == ""
+
+
+def test_lista_rechaza_tipos_no_admitidos():
+    import servicio
+
+    assert servicio._lista("neutro, positivo") == ["neutro", "positivo"]
+    assert servicio._lista([5, "95"]) == [5, "95"]
+    for valor in (5, {"a": 1}, [{"a": 1}]):
+        with pytest.raises(ValueError):
+            servicio._lista(valor)
+    with pytest.raises(ValueError):
+        servicio.consultar({"fechas": 5})
+
+
+@pytest.fixture
+def servicio_http():
+    import servicio
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), servicio.Manejador)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    conexion = http.client.HTTPConnection("127.0.0.1", servidor.server_address[1], timeout=30)
+    yield conexion
+    conexion.close()
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def test_lote_comprimido_por_bloques_y_metricas(servicio_http):
+    import servicio
+
+    peticion = {"inicio": "2025-01-01", "fin": "2029-12-31", "escenarios": ["neutro"]}
+    servicio_http.request("POST", "/predicciones", body=json.dumps(peticion),
+                          headers={"Content-Type": "application/json", "Accept-Encoding": "gzip"})
+    respuesta = servicio_http.getresponse()
+    assert respuesta.status == 200
+    assert respuesta.getheader("Transfer-Encoding") == "chunked"
+    assert respuesta.getheader("Content-Encoding") == "gzip"
+    filas = [json.loads(linea) for linea in gzip.decompress(respuesta.read()).decode("utf-8").splitlines()]
+    # Más de un bloque de JSON-lines, sin filas perdidas entre fragmentos
+    assert len(filas) == int(respuesta.getheader("X-Filas")) > servicio.BLOQUE
+    assert filas[0]["Fecha"] == "2025-09-10" and filas[0]["Disponible"]
+    # Valores con la precisión guardada (float32), sin cifras espurias de la conversión a double
+    assert (filas[0]["DXY estimado"], filas[0]["DXY_neutro"], filas[0]["Confianza"]) == (118.6354, 118.6354, 0.2247285)
+
+    # La misma conexión keep-alive sirve las métricas de la consulta anterior
+    servicio_http.request("GET", "/metricas")
+    metricas = servicio_http.getresponse()
+    texto = metricas.read().decode("utf-8")
+    assert metricas.status == 200 and metricas.getheader("Content-Type").startswith("text/plain")
+    assert 'dxy_tramo_ms_count{tramo="servicio:consulta"}' in texto
+    assert 'dxy_eventos_total{evento="servicio:http_200"}' in texto
@@ -0,0 +1,185 @@
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+# 🔹 Instrumentación compartida por proceso: tramos cronometrados, contadores de caché y memoria
+#   INSTRUMENTACION=0 la desactiva: medir() devuelve un contexto nulo y los decoradores no envuelven nada
+ACTIVO = os.environ.get("INSTRUMENTACION", "1") != "0"
+REGISTRO = os.environ.get("TIEMPOS_LOG")  # opcional: fichero JSON-lines con cada medición
+PROMETHEUS = os.environ.get("TIEMPOS_PROM")  # opcional: fichero en formato texto de Prometheus
+MUESTRAS = 500  # mediciones recientes que se conservan por nombre (para los percentiles)
+
+_muestras = defaultdict(lambda: deque(maxlen=MUESTRAS))
+_totales = defaultdict(lambda: [0, 0.0])  # nombre -> [veces, ms acumulados] desde el arranque
+_contadores = defaultdict(int)
+_indicadores = {}
+_arranque = None
+_lock = threading.Lock()
+_NULO = nullcontext()
+
+
+def _escribir_registro(linea):
+    with open(REGISTRO, "a", encoding="utf-8") as f:
+        f.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+
+def registrar(nombre, ms):
+    if not ACTIVO:
+        return
+    with _lock:
+        _muestras[nombre].append(ms)
+        total = _totales[nombre]
+        total[0] += 1
+        total[1] += ms
+        if REGISTRO:
+            _escribir_registro({"ts": time.time(), "nombre": nombre, "ms": round(ms, 3)})
+
+
+def contar(nombre, n=1):
+    """Contador de eventos (aciertos y fallos de caché, origen de los datos de FRED...)."""
+    if not ACTIVO:
+        return
+    with _lock:
+        _contadores[nombre] += n
+
+
+def acierto(cache, hit):
+    contar(f"cache_{'hit' if hit else 'miss'}:{cache}")
+
+
+def fijar(nombre, valor):
+    if not ACTIVO:
+        return
+    with _lock:
+        _indicadores[nombre] = valor
+
+
+def memoria():
+    """Instantánea de la memoria residente del proceso (bytes) como indicador."""
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    fijar("memoria_rss_bytes", rss)
+    return rss
+
+
+def marcar_ejecucion(nombre, t0):
+    """Registra una ejecución completa del script; la primera del proceso cuenta como arranque en frío."""
+    global _arranque
+    if not ACTIVO:
+        return
+    ms = (time.perf_counter() - t0) * 1000
+    with _lock:
+        primera = _arranque is None
+        if primera:
+            _arranque = ms
+    registrar("arranque" if primera else nombre, ms)
+    memoria()
+    if PROMETHEUS:
+        exportar(PROMETHEUS)
+
+
+@contextmanager
+def _tramo(nombre):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nombre, (time.perf_counter() - t0) * 1000)
+
+
+def medir(nombre):
+    return _tramo(nombre) if ACTIVO else _NULO
+
+
+def cronometrar(nombre):
+    """Decorador para fragmentos y funciones: cada llamada queda registrada con su propio nombre."""
+    def decorador(funcion):
+        if not ACTIVO:
+            return funcion
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _tramo(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def _percentil(ordenados, q):
+    return ordenados[min(int(q * len(ordenados)), len(ordenados) - 1)]
+
+
+def instantanea():
+    with _lock:
+        muestras = {n: sorted(m) for n, m in _muestras.items() if m}
+        totales = {n: tuple(t) for n, t in _totales.items()}
+        return muestras, totales, dict(_contadores), dict(_indicadores)
+
+
+def resumen():
+    import pandas as pd
+
+    with _lock:
+        copia = {n: list(m) for n, m in _muestras.items()}
+    filas = [{
+        "Medición": nombre,
+        "Veces": _totales[nombre][0],
+        "Última (ms)": ms[-1],
+        "p50 (ms)": _percentil(sorted(ms), 0.5),
+        "p95 (ms)": _percentil(sorted(ms), 0.95),
+        "Máx. (ms)": max(ms),
+    } for nombre, ms in sorted(copia.items()) if ms]
+    return pd.DataFrame(filas)
+
+
+def eventos():
+    import pandas as pd
+
+    with _lock:
+        copia = dict(_contadores)
+    return pd.DataFrame(sorted(copia.items()), columns=["Evento", "Veces"])
+
+
+# 🔹 Exportación en formato texto de Prometheus (endpoint del servicio o fichero)
+def _etiqueta(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus():
+    muestras, totales, contadores, indicadores = instantanea()
+    lineas = ["# HELP dxy_tramo_ms Duración de cada tramo instrumentado (ms).", "# TYPE dxy_tramo_ms summary"]
+    for nombre, ordenados in sorted(muestras.items()):
+        etiqueta = _etiqueta(nombre)
+        for q in (0.5, 0.95, 0.99):
+            lineas.append(f'dxy_tramo_ms{{tramo="{etiqueta}",quantile="{q}"}} {_percentil(ordenados, q):.3f}')
+        veces, suma = totales[nombre]
+        lineas.append(f'dxy_tramo_ms_sum{{tramo="{etiqueta}"}} {suma:.3f}')
+        lineas.append(f'dxy_tramo_ms_count{{tramo="{etiqueta}"}} {veces}')
+    lineas += ["# HELP dxy_eventos_total Eventos contados (aciertos/fallos de caché, origen de datos).",
+               "# TYPE dxy_eventos_total counter"]
+    lineas += [f'dxy_eventos_total{{evento="{_etiqueta(n)}"}} {v}' for n, v in sorted(contadores.items())]
+    for nombre, valor in sorted(indicadores.items()):
+        lineas += [f"# TYPE dxy_{nombre} gauge", f"dxy_{nombre} {valor}"]
+    return "\n".join(lineas) + "\n"
+
+
+def exportar(ruta):
+    fd, temporal = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)),
+                                    prefix=os.path.basename(ruta) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(prometheus())
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+    return ruta